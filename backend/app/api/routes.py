@@ -1,5 +1,8 @@
 import os
-from fastapi import APIRouter, HTTPException, Depends, Body, File, UploadFile
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Body, File, UploadFile, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
@@ -7,9 +10,62 @@ from app.models.response_models import ScreeningResponse, HRDecisionRequest
 from app.services.pipeline_service import pipeline_service
 from app.services.interview_service import interview_service
 from app.db.database import get_db
+from app.db.candidate_index import candidate_alias_index
+from app.services.response_cache import response_cache
+from app.services.pipeline_runs import pipeline_runner
+from app.services.stream_flights import StreamBusy, StreamSubscription, stream_flights
+from core.utils.fast_json import safe_json_load
 
 router = APIRouter()
 
+DISCONNECT_POLL_S = 0.5
+
+def _etag_matches(if_none_match: Optional[str], version: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/").strip('"') == version for tag in tags)
+
+async def _versioned_json(request: Request, build) -> Response:
+    """
+    Serve `await build()` as JSON through the versioned response cache: 304 when If-None-Match
+    already names the current data version, the cached bytes when this URL was rendered at
+    that version, otherwise build, render and cache.
+    """
+    version = await pipeline_service.get_data_version()
+    headers = {"ETag": f'W/"{version}"', "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), version):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+
+    key = f"{request.url.path}?{request.url.query}"
+    body = response_cache.get(key, version)
+    if body is None:
+        body = JSONResponse(content=jsonable_encoder(await build())).body
+        response_cache.put(key, version, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _close_on_disconnect(request: Request, subscription: StreamSubscription):
+    """
+    Relay a shared stream while watching the client. On disconnect the subscription detaches;
+    when it was the run's last subscriber the run's token is cancelled, so the run winds down
+    (checkpoint, persister flush) at its next batch instead of spending LLM/GitHub quota for nobody.
+    """
+    async def watch():
+        while not subscription.closed:
+            if await request.is_disconnected():
+                subscription.close()
+                return
+            await asyncio.sleep(DISCONNECT_POLL_S)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        async for chunk in subscription:
+            yield chunk
+    finally:
+        watcher.cancel()
+        subscription.close()
+
 @router.get("/health")
 async def health_check():
     return {"status": "running"}
@@ -17,25 +73,153 @@ async def health_check():
 class ScreeningRequest(BaseModel):
     evaluation_weights: Optional[Dict[str, float]] = None
 
-@router.post("/screen", response_model=ScreeningResponse)
-async def run_screening(req: ScreeningRequest = Body(default=None)):
+async def _submit_run(kind: str, work, params: Dict[str, Any], wait: bool, dedupe_key: Optional[str] = None, on_attached=None):
+    """
+    Queue `work` as a background run: 202 with the run (follow /runs/{run_id}/events), or with
+    wait=true the legacy behaviour — the finished run's result, or a 500 if it failed.
+    A live run with the same dedupe_key is returned instead (attached=true); `work` never runs
+    and on_attached() releases whatever it would have owned.
+    """
+    run = await asyncio.to_thread(pipeline_runner.submit, kind, work, params, dedupe_key)
+    if run["attached"] and on_attached:
+        on_attached()
+    if not wait:
+        return JSONResponse(status_code=202, content=jsonable_encoder(run))
+    finished = await pipeline_runner.wait(run["run_id"])
+    if finished.status != "COMPLETED":
+        raise HTTPException(status_code=500, detail=finished.error_message or f"Run {finished.status.lower()}")
+    return safe_json_load(finished.result_json)
+
+@router.post("/screen")
+async def run_screening(req: ScreeningRequest = Body(default=None), wait: bool = Query(False)):
+    """Screen the whole cohort in the background; ?wait=true blocks and returns the ScreeningResponse."""
+    weights = req.evaluation_weights if req else None
+
+    async def work(progress, cancel_token):
+        return await pipeline_service.run_screening(evaluation_weights=weights, progress=progress, cancel_token=cancel_token)
+
     try:
-        weights = req.evaluation_weights if req else None
-        results = await pipeline_service.run_screening(evaluation_weights=weights)
-        return results
+        dedupe_key = await pipeline_service.run_key("screening", evaluation_weights=weights)
+        return await _submit_run("screening", work, {"evaluation_weights": weights}, wait, dedupe_key)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Pipeline screening failed: {str(e)}")
 
-@router.get("/results", response_model=ScreeningResponse)
-async def get_results():
+@router.get("/runs/stats")
+async def get_run_stats():
+    """Single-flight counters: runs started vs. requests attached to an identical live run."""
+    return {"background_runs": pipeline_runner.stats(), "streams": stream_flights.stats()}
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: int):
+    run = await asyncio.to_thread(pipeline_runner.get, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return run
+
+@router.get("/runs/{run_id}/events")
+async def get_run_events(run_id: int, offset: int = Query(0, ge=0), follow: bool = Query(True)):
+    """
+    NDJSON event log from seq `offset` ({seq, event, data, at} per line). With follow=true the
+    stream stays open until the run finishes; after a reconnect pass offset = last seq + 1.
+    """
+    from fastapi.responses import StreamingResponse
+    import json
+
+    if await asyncio.to_thread(pipeline_runner.get, run_id) is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+
+    async def stream():
+        async for event in pipeline_runner.events(run_id, offset=offset, follow=follow):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.get("/runs/{run_id}/result")
+async def get_run_result(run_id: int):
+    run = await asyncio.to_thread(pipeline_runner.result, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    if run.status != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"Run {run_id} is {run.status}")
+    return safe_json_load(run.result_json)
+
+@router.post("/runs/{run_id}/cancel")
+async def cancel_run(run_id: int):
+    """Idempotent; 409 once the run has completed or failed."""
+    run = await asyncio.to_thread(pipeline_runner.cancel, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    if run["status"] in ("COMPLETED", "FAILED"):
+        raise HTTPException(status_code=409, detail=f"Run {run_id} already {run['status']}")
+    return run
+
+@router.get("/results")
+async def get_results(
+    request: Request,
+    fields: Optional[str] = Query(None, pattern="^(summary|detail)$"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    stage: Optional[str] = Query(None, pattern="^(stage1|stage2)$"),
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    risk_level: Optional[str] = None,
+):
+    """
+    Without query parameters: every evaluation in full (legacy shape).
+    With any of them: one cursor-paginated page in ranking order, summary fields unless
+    fields=detail, plus `total` and `next_cursor` (null on the last page).
+    """
+    paged = any(p is not None for p in (fields, cursor, limit, stage, min_score, max_score, risk_level))
+
+    async def build():
+        if not paged:
+            return ScreeningResponse(**await pipeline_service.get_stored_results())
+        return await pipeline_service.get_results_page(
+            fields=fields or "summary", cursor=cursor, limit=limit or 50, stage=stage,
+            min_score=min_score, max_score=max_score, risk_level=risk_level,
+        )
+
     try:
-        results = await pipeline_service.get_stored_results()
-        return results
+        return await _versioned_json(request, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to fetch results: {str(e)}")
 
+@router.get("/results/{candidate_id}")
+async def get_candidate_result(request: Request, candidate_id: str):
+    """Full evaluation for one candidate (evidence, analysis, resume), loaded on demand."""
+    async def build():
+        result = await pipeline_service.get_candidate_result(candidate_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"No result for candidate {candidate_id}")
+        return result
+
+    try:
+        return await _versioned_json(request, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch result: {str(e)}")
+
+@router.get("/ranking")
+async def get_ranking(
+    sort: str = Query("rank", pattern="^(rank|score|name|candidate_id|updated_at)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    stage: Optional[str] = Query(None, pattern="^(stage1|stage2)$"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Paginated, sortable ranking for the active JD, read from the materialized leaderboard."""
+    try:
+        return await pipeline_service.get_ranking(sort=sort, descending=order == "desc", stage=stage, offset=offset, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch ranking: {str(e)}")
+
 @router.post("/re-evaluate/{candidate_id}")
 async def re_evaluate_candidate(candidate_id: str):
     try:
@@ -58,34 +242,80 @@ class ForceEvaluateRequest(BaseModel):
     evaluation_weights: Optional[Dict[str, float]] = None
 
 @router.post("/force-evaluate/{candidate_id}")
-async def force_evaluate_candidate(candidate_id: str, req: ForceEvaluateRequest = Body(default=None)):
+async def force_evaluate_candidate(candidate_id: str, req: ForceEvaluateRequest = Body(default=None), wait: bool = Query(False)):
+    """Background run like /screen; ?wait=true blocks and returns the results."""
+    weights = req.evaluation_weights if req else None
+
+    async def work(progress, cancel_token):
+        return await pipeline_service.force_evaluate(candidate_id, evaluation_weights=weights, progress=progress, cancel_token=cancel_token)
+
     try:
-        weights = req.evaluation_weights if req else None
-        results = await pipeline_service.force_evaluate(candidate_id, evaluation_weights=weights)
-        return results
+        # Keyed by the resolved candidate: concurrent force-evaluations of one candidate share a run
+        candidate_key = await asyncio.to_thread(pipeline_service.resolve_candidate_key, candidate_id)
+        dedupe_key = await pipeline_service.run_key("force_evaluate", candidate_set=candidate_key, evaluation_weights=weights)
+        return await _submit_run("force_evaluate", work, {"candidate_id": candidate_id, "evaluation_weights": weights}, wait, dedupe_key)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Force evaluation failed: {str(e)}")
 
 @router.post("/screen-stream")
-async def run_screening_stream(req: ScreeningRequest = Body(default=None)):
+async def run_screening_stream(
+    request: Request,
+    req: ScreeningRequest = Body(default=None),
+    format: str = Query("delta", pattern="^(delta|full)$"),
+    resume: bool = Query(True),
+):
+    """
+    NDJSON progress: snapshot/delta frames by default, legacy full partial_results with ?format=full.
+    An identical run already in progress (same JD, cohort, weights, format and resume flag) is
+    joined instead of started again (X-Run-Attached: true); any other live Stage 1 stream for
+    the same JD and cohort is a 409. When the last viewer disconnects the run is cancelled; the
+    next run waits for it to wind down, then resumes from its checkpoint unless ?resume=false.
+    """
     from fastapi.responses import StreamingResponse
     try:
         weights = req.evaluation_weights if req else None
+        # A resumed run and a fresh one produce different streams: never share a flight between them
+        mode = f"stage1_stream:{format}:{'resume' if resume else 'fresh'}"
+        key = await pipeline_service.run_key(mode, evaluation_weights=weights)
+        subscription = stream_flights.join(
+            key,
+            lambda token: pipeline_service.run_screening_stream(evaluation_weights=weights, stream_format=format, cancel_token=token, resume=resume),
+            lane=await pipeline_service.run_key("stage1_stream"),
+        )
         return StreamingResponse(
-            pipeline_service.run_screening_stream(evaluation_weights=weights),
-            media_type="application/x-ndjson"
+            _close_on_disconnect(request, subscription),
+            media_type="application/x-ndjson",
+            headers={"X-Run-Attached": str(subscription.attached).lower()},
         )
+    except StreamBusy as e:
+        raise HTTPException(status_code=409, detail=f"Another Stage 1 run is in progress for this JD ({e})")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Streaming Pipeline failed: {str(e)}")
 
 @router.post("/run-stage-2-stream")
-async def run_stage_2_stream():
+async def run_stage_2_stream(
+    request: Request,
+    format: str = Query("delta", pattern="^(delta|full)$"),
+    resume: bool = Query(True),
+):
+    """Same streaming, single-flight, cancellation and resume behaviour as /screen-stream."""
     from fastapi.responses import StreamingResponse
     try:
+        key = await pipeline_service.run_key(f"stage2_stream:{format}:{'resume' if resume else 'fresh'}")
+        subscription = stream_flights.join(
+            key,
+            lambda token: pipeline_service.run_stage_2_stream(stream_format=format, cancel_token=token, resume=resume),
+            lane=await pipeline_service.run_key("stage2_stream"),
+        )
         return StreamingResponse(
-            pipeline_service.run_stage_2_stream(),
-            media_type="application/x-ndjson"
+            _close_on_disconnect(request, subscription),
+            media_type="application/x-ndjson",
+            headers={"X-Run-Attached": str(subscription.attached).lower()},
         )
+    except StreamBusy as e:
+        raise HTTPException(status_code=409, detail=f"Another Stage 2 run is in progress for this JD ({e})")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Stage 2 Pipeline failed: {str(e)}")
 
@@ -97,9 +327,9 @@ async def submit_hr_decision(request: HRDecisionRequest):
         raise HTTPException(status_code=500, detail=f"Failed to submit HR decision: {str(e)}")
 
 @router.get("/rag/metrics/{candidate_id}")
-async def get_rag_metrics(candidate_id: str):
+async def get_rag_metrics(request: Request, candidate_id: str):
     try:
-        return await pipeline_service.get_candidate_rag_metrics(candidate_id)
+        return await _versioned_json(request, lambda: pipeline_service.get_candidate_rag_metrics(candidate_id))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -112,21 +342,39 @@ async def toggle_rag_override(candidate_id: str, payload: Dict[str, bool] = Body
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/rag/evaluation/{candidate_id}")
-async def get_rag_evaluation(candidate_id: str):
+async def get_rag_evaluation(request: Request, candidate_id: str):
     """Returns the full RAGAS evaluation result for a candidate."""
     try:
-        return await pipeline_service.get_candidate_rag_metrics(candidate_id)
+        return await _versioned_json(request, lambda: pipeline_service.get_candidate_rag_metrics(candidate_id))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/rag/summary")
-async def get_rag_summary():
+async def get_rag_summary(request: Request):
     """Returns a system-wide summary of RAG health for the latest screening run."""
     try:
-        return await pipeline_service.get_rag_run_summary()
+        return await _versioned_json(request, pipeline_service.get_rag_run_summary)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/github/cache-status")
+async def get_github_cache_status():
+    """Returns per-candidate freshness of the GitHub cache used by Stage 2."""
+    try:
+        return await pipeline_service.get_github_cache_status()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/cache/stats")
+async def get_response_cache_stats():
+    """Hit / miss / 304 counters of the versioned read cache."""
+    return response_cache.stats()
+
+@router.get("/candidates/alias-index/stats")
+async def get_candidate_alias_index_stats():
+    """Lookup counts, resolution latency and ambiguity counters for candidate ID resolution."""
+    return candidate_alias_index.stats()
+
 @router.get("/rag/evaluation-status/{candidate_id}")
 async def get_rag_evaluation_status(candidate_id: str, db: Session = Depends(get_db)):
     """
@@ -161,21 +409,21 @@ async def get_rag_evaluation_status(candidate_id: str, db: Session = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/rag/retrieval-metrics/{candidate_id}")
-async def get_rag_retrieval_metrics_api(candidate_id: str, db: Session = Depends(get_db)):
+async def get_rag_retrieval_metrics_api(request: Request, candidate_id: str, db: Session = Depends(get_db)):
     """
     Returns deterministic zero-LLM retrieval quality metrics.
     """
-    try:
+    async def build():
         from app.db import repository
-        
+
         db_cand = repository.get_candidate_by_fuzzy_id(db, candidate_id)
         if not db_cand:
             raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
-            
+        
         metrics = repository.get_rag_retrieval_metrics(db, db_cand.id)
         if not metrics:
             return None
-            
+        
         return {
             "precision": metrics.precision,
             "recall": metrics.recall,
@@ -187,6 +435,11 @@ async def get_rag_retrieval_metrics_api(candidate_id: str, db: Session = Depends
             "rag_health_status": metrics.rag_health_status,
             "evaluated_at": metrics.evaluated_at
         }
+
+    try:
+        return await _versioned_json(request, build)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -238,21 +491,21 @@ async def get_llm_evaluation_status(candidate_id: str, db: Session = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/rag/llm-metrics/{candidate_id}")
-async def get_llm_rag_metrics_api(candidate_id: str, db: Session = Depends(get_db)):
+async def get_llm_rag_metrics_api(request: Request, candidate_id: str, db: Session = Depends(get_db)):
     """
     Returns the Post-LLM RAG Evaluation metrics.
     """
-    try:
+    async def build():
         from app.db import repository
-        
+
         db_cand = repository.get_candidate_by_fuzzy_id(db, candidate_id)
         if not db_cand:
             raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
-            
+        
         metrics = repository.get_rag_llm_metrics(db, db_cand.id)
         if not metrics:
             return None
-            
+        
         return {
             "precision": metrics.precision if hasattr(metrics, 'precision') else 0.0,
             "recall": metrics.recall if hasattr(metrics, 'recall') else 0.0,
@@ -265,6 +518,11 @@ async def get_llm_rag_metrics_api(candidate_id: str, db: Session = Depends(get_d
             "explanation": metrics.explanation,
             "evaluated_at": metrics.evaluated_at
         }
+
+    try:
+        return await _versioned_json(request, build)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -318,24 +576,44 @@ async def upload_candidates(file: UploadFile = File(...)):
             os.remove(tmp_path)
 
 @router.post("/candidates/upload-screen")
-async def upload_and_screen(file: UploadFile = File(...), req: Optional[Dict[str, Any]] = Body(None)):
+async def upload_and_screen(file: UploadFile = File(...), req: Optional[Dict[str, Any]] = Body(None), wait: bool = Query(False)):
     """
-    Uploads a file and immediately runs the screening pipeline.
+    Uploads a file and screens its candidates in a background run (see /screen).
     """
-    import shutil
+    import hashlib
     import tempfile
     
     suffix = os.path.splitext(file.filename)[1]
+    digest = hashlib.sha256()
     with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        shutil.copyfileobj(file.file, tmp)
+        for chunk in iter(lambda: file.file.read(1 << 20), b""):
+            digest.update(chunk)
+            tmp.write(chunk)
         tmp_path = tmp.name
-        
+    upload_digest = digest.hexdigest()
+
+    weights = req.get("evaluation_weights") if req else None
+
+    def discard_upload():
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    async def work(progress, cancel_token):
+        # The run owns the upload from here on
+        try:
+            return await pipeline_service.run_bulk_screening(tmp_path, evaluation_weights=weights, progress=progress, cancel_token=cancel_token)
+        finally:
+            discard_upload()
+
     try:
-        weights = req.get("evaluation_weights") if req else None
-        results = await pipeline_service.run_bulk_screening(tmp_path, evaluation_weights=weights)
-        return results
+        # The same file uploaded twice while the first run is live joins that run
+        dedupe_key = await pipeline_service.run_key("bulk_screening", candidate_set=upload_digest, evaluation_weights=weights)
+        return await _submit_run(
+            "bulk_screening", work, {"filename": file.filename, "evaluation_weights": weights}, wait,
+            dedupe_key, on_attached=discard_upload,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
+        discard_upload()
         raise HTTPException(status_code=500, detail=f"Bulk screening failed: {str(e)}")
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
@@ -0,0 +1,219 @@
+"""
+In-memory alias index for candidate ID resolution.
+
+API routes receive whatever identifier the frontend has at hand: DB id, email, roll number
+(usually the email prefix) or GitHub username. Resolving that with a chain of queries, one of
+them an unindexed LIKE scan, costs several round trips per request. This index maps every
+alias to candidate ids once per process, so a lookup is a dict probe plus a primary-key get.
+
+Kept current by the repository write paths (create/ensure candidates) and rebuilt
+periodically to pick up rows written by other processes (import scripts, workers).
+"""
+import re
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from .models import Candidate, WoxsenCandidate
+
+# Plain stdlib logger: the db package is also imported by standalone scripts without the project root on sys.path
+logger = logging.getLogger(__name__)
+
+# Precedence when an identifier matches aliases of several kinds (mirrors the old lookup order)
+ALIAS_KINDS = ("id", "email", "prefix", "roll", "github")
+# Other processes write candidates too; a periodic rebuild bounds how stale the index can get
+REBUILD_INTERVAL = 300
+GITHUB_USER_RE = re.compile(r"github\.com/([a-zA-Z0-9_-]+)")
+
+
+def _github_username(url: Optional[str]) -> Optional[str]:
+    match = GITHUB_USER_RE.search(url or "")
+    return match.group(1).lower() if match else None
+
+
+class CandidateAliasIndex:
+    def __init__(self, rebuild_interval: float = REBUILD_INTERVAL):
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.RLock()
+        self._aliases: Dict[str, Dict[str, Set[int]]] = {kind: {} for kind in ALIAS_KINDS}
+        self._by_candidate: Dict[int, Dict[str, str]] = {}
+        self._linked: Set[int] = set()
+        self._built_at: Optional[float] = None
+        self._stats = {
+            "lookups": 0, "fallback_hits": 0, "misses": 0, "ambiguous": 0, "stale": 0,
+            "builds": 0, "build_ms": 0.0, "resolve_ms": 0.0, "fallback_ms": 0.0,
+        }
+        self._hits_by_kind = {kind: 0 for kind in ALIAS_KINDS}
+
+    # ──────────────────────────────────────────────
+    # Maintenance
+    # ──────────────────────────────────────────────
+
+    def build(self, db: Session):
+        start = time.time()
+        rows = (
+            db.query(Candidate.id, Candidate.email, Candidate.github_url, WoxsenCandidate.roll_number, WoxsenCandidate.github_url)
+            .outerjoin(WoxsenCandidate, Candidate.woxsen_candidate_id == WoxsenCandidate.id)
+            .all()
+        )
+        with self._lock:
+            self._aliases = {kind: {} for kind in ALIAS_KINDS}
+            self._by_candidate = {}
+            self._linked = set()
+            for cid, email, github_url, roll_number, woxsen_github in rows:
+                self._index(cid, email, github_url or woxsen_github, roll_number)
+            self._built_at = time.time()
+            elapsed_ms = (self._built_at - start) * 1000
+            self._stats["builds"] += 1
+            self._stats["build_ms"] = round(elapsed_ms, 1)
+        logger.info(f"[ALIAS INDEX] Built for {len(rows)} candidates in {elapsed_ms:.1f}ms")
+
+    def add(self, candidate: Candidate, woxsen: Optional[WoxsenCandidate] = None):
+        """(Re-)index one candidate after a write; `woxsen` defaults to its linked record."""
+        if candidate.id is None:
+            return
+        if woxsen is None and candidate.woxsen_candidate_id:
+            woxsen = candidate.woxsen
+        self.add_aliases(
+            candidate.id,
+            candidate.email,
+            candidate.github_url or (woxsen.github_url if woxsen else None),
+            woxsen.roll_number if woxsen else None,
+        )
+
+    def add_aliases(self, cid: int, email: Optional[str], github_url: Optional[str], roll_number: Optional[str]):
+        """Index one candidate from plain values (for callers holding no live ORM row)."""
+        with self._lock:
+            if self._built_at is None:
+                return  # built lazily on first lookup, which will include this row
+            self._index(cid, email, github_url, roll_number)
+
+    def discard(self, candidate_id: int):
+        with self._lock:
+            for kind, alias in self._by_candidate.pop(candidate_id, {}).items():
+                ids = self._aliases[kind].get(alias)
+                if ids:
+                    ids.discard(candidate_id)
+                    if not ids:
+                        del self._aliases[kind][alias]
+            self._linked.discard(candidate_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def _index(self, cid: int, email: Optional[str], github_url: Optional[str], roll_number: Optional[str]):
+        self.discard(cid)
+        email = (email or "").strip().lower()
+        aliases = {
+            "id": str(cid),
+            "email": email,
+            "prefix": email.split("@")[0],
+            "roll": (roll_number or "").strip().lower(),
+            "github": _github_username(github_url),
+        }
+        aliases = {kind: alias for kind, alias in aliases.items() if alias}
+        for kind, alias in aliases.items():
+            self._aliases[kind].setdefault(alias, set()).add(cid)
+        self._by_candidate[cid] = aliases
+        if roll_number:
+            self._linked.add(cid)
+
+    # ──────────────────────────────────────────────
+    # Lookup
+    # ──────────────────────────────────────────────
+
+    def _ensure_built(self, db: Session):
+        if self._built_at is None or time.time() - self._built_at > self.rebuild_interval:
+            self.build(db)
+
+    def _match(self, key: str) -> Tuple[Optional[int], Optional[str]]:
+        """(candidate id, alias kind) of the best match for `key`, or (None, None)."""
+        with self._lock:
+            for kind in ALIAS_KINDS:
+                ids = self._aliases[kind].get(key)
+                if not ids:
+                    continue
+                self._hits_by_kind[kind] += 1
+                if len(ids) == 1:
+                    return next(iter(ids)), kind
+                # Same alias on several candidates (e.g. roll@woxsen.edu and roll@example.com):
+                # prefer the one linked to a Woxsen record, then the oldest row
+                self._stats["ambiguous"] += 1
+                logger.debug(f"[ALIAS INDEX] Ambiguous {kind} alias {key!r} -> {sorted(ids)}")
+                return min(ids, key=lambda cid: (cid not in self._linked, cid)), kind
+        return None, None
+
+    @staticmethod
+    def _has_alias(cand: Candidate, kind: str, key: str) -> bool:
+        """Whether the row as stored now still carries the alias it was found by."""
+        if kind == "id":
+            return True
+        email = (cand.email or "").strip().lower()
+        if kind == "email":
+            return email == key
+        if kind == "prefix":
+            return email.split("@")[0] == key
+        woxsen = cand.woxsen if cand.woxsen_candidate_id else None
+        if kind == "roll":
+            return woxsen is not None and (woxsen.roll_number or "").strip().lower() == key
+        return _github_username(cand.github_url or (woxsen.github_url if woxsen else None)) == key
+
+    def resolve(self, db: Session, identifier: str, fallback: Optional[Callable[[Session, str], Optional[Candidate]]] = None) -> Optional[Candidate]:
+        """Candidate for any known alias; `fallback` handles partial/name matches the index can't."""
+        start = time.time()
+        self._ensure_built(db)
+        key = identifier.strip().lower()
+
+        cand = None
+        cid, kind = self._match(key)
+        if cid is not None:
+            cand = db.get(Candidate, cid)
+            if cand is None:
+                self.discard(cid)  # deleted by another process since the last build
+            elif not self._has_alias(cand, kind, key):
+                # The id was reused (rows deleted and re-imported by another process): it is a
+                # different person now. Re-index the row as it is and let the fallback find `key`.
+                with self._lock:
+                    self._stats["stale"] += 1
+                self.discard(cid)
+                self.add(cand)
+                cand = None
+        with self._lock:
+            self._stats["lookups"] += 1
+            self._stats["resolve_ms"] += (time.time() - start) * 1000
+        if cand is not None or fallback is None:
+            return cand
+
+        fallback_start = time.time()
+        cand = fallback(db, identifier)
+        with self._lock:
+            self._stats["fallback_ms"] += (time.time() - fallback_start) * 1000
+            self._stats["fallback_hits" if cand else "misses"] += 1
+        if cand is not None:
+            self.add(cand)
+        return cand
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["lookups"] or 1
+            fallbacks = (stats["fallback_hits"] + stats["misses"]) or 1
+            stats.update({
+                "hits_by_kind": dict(self._hits_by_kind),
+                "avg_resolve_ms": round(stats.pop("resolve_ms") / lookups, 3),
+                "avg_fallback_ms": round(stats.pop("fallback_ms") / fallbacks, 3),
+                "candidates": len(self._by_candidate),
+                "ambiguous_aliases": {
+                    kind: sum(1 for ids in self._aliases[kind].values() if len(ids) > 1) for kind in ALIAS_KINDS
+                },
+                "age_s": round(time.time() - self._built_at) if self._built_at else None,
+            })
+        return stats
+
+
+# Shared per process; the repository keeps it current on candidate writes
+candidate_alias_index = CandidateAliasIndex()
@@ -1,7 +1,11 @@
 from .database import engine, Base
 from . import models
+from .migrations import run_migrations
 
 def init_db():
     print("--- [DB] Initializing Database Schema... ---")
     Base.metadata.create_all(bind=engine)
+    applied = run_migrations(engine)
+    if applied:
+        print(f"--- [DB] Applied migrations: {', '.join(applied)} ---")
     print("--- [DB] Database Schema Synchronized. ---")
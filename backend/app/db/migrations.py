@@ -0,0 +1,252 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+`Base.metadata.create_all` only creates missing tables; it never adds columns, indexes or
+constraints to tables that already exist. Those changes live here as numbered migrations,
+applied in order by `run_migrations()` (called from init_db) and recorded in the
+`schema_migrations` table so each runs once per database.
+
+Every migration is written to be idempotent (column checks, IF NOT EXISTS), so a run that
+stops halfway can simply be repeated.
+
+Run by hand from the backend directory:
+    python -m app.db.migrations            # apply pending migrations
+    python -m app.db.migrations --status   # list applied / pending
+"""
+import sys
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from . import models  # noqa: F401 - registers the tables and indexes on Base.metadata
+from .database import Base, engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────
+
+def _tables(conn: Connection) -> set:
+    return {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+def _columns(conn: Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+def _add_columns(conn: Connection, table: str, columns: List[Tuple[str, str]]):
+    if table not in _tables(conn):
+        return  # created with every column by create_all
+    existing = _columns(conn, table)
+    for name, ddl_type in columns:
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl_type}"))
+            logger.info(f"[MIGRATIONS] Added {table}.{name}")
+
+def _has_unique_index(conn: Connection, table: str, columns: List[str]) -> bool:
+    for row in conn.execute(text(f"PRAGMA index_list({table})")):
+        name, unique = row[1], row[2]
+        if unique and [r[2] for r in conn.execute(text(f"PRAGMA index_info('{name}')"))] == columns:
+            return True
+    return False
+
+def _create_model_indexes(conn: Connection, names: List[str]):
+    """Create the named indexes exactly as declared on the models."""
+    indexes = {ix.name: ix for table in Base.metadata.sorted_tables for ix in table.indexes}
+    existing_tables = _tables(conn)
+    for name in names:
+        index = indexes[name]
+        if index.table.name in existing_tables:
+            index.create(bind=conn, checkfirst=True)
+
+
+# ──────────────────────────────────────────────
+# Migrations (never edit one that has shipped; add a new one)
+# ──────────────────────────────────────────────
+
+def m0001_screening_result_columns(conn: Connection):
+    """Deep persistence, HITL and RAG gating columns (formerly migrate_db.py)."""
+    _add_columns(conn, "screening_results", [
+        ("repo_count", "INTEGER"),
+        ("ai_projects", "INTEGER"),
+        ("skill_gaps_json", "TEXT"),
+        ("interview_focus_json", "TEXT"),
+        ("github_features_json", "TEXT"),
+        ("repos_json", "TEXT"),
+        ("interview_readiness_json", "TEXT"),
+        ("skeptic_analysis_json", "TEXT"),
+        ("final_synthesized_decision_json", "TEXT"),
+        ("ai_evidence_json", "TEXT"),
+        ("justification_json", "TEXT"),
+        ("judge_audit_json", "TEXT"),
+        ("rubric_scores_json", "TEXT"),
+        ("rank_position", "INTEGER"),
+        ("retrieval_mode", "VARCHAR"),
+        ("retrieval_version", "VARCHAR"),
+        ("rag_enabled", "BOOLEAN DEFAULT 1"),
+        ("rag_status", "VARCHAR DEFAULT 'healthy'"),
+        ("rag_override", "BOOLEAN DEFAULT 0"),
+        ("hr_decision", "TEXT"),
+        ("hr_notes", "TEXT"),
+        ("interview_status", "TEXT DEFAULT 'PENDING'"),
+        ("evaluation_locked", "BOOLEAN DEFAULT 0"),
+        ("interview_session_id", "TEXT"),
+        ("interview_invite_sent", "BOOLEAN DEFAULT 0"),
+    ])
+
+def m0002_interview_session_columns(conn: Connection):
+    """Interview state columns (formerly migrate_db.py and fix_db_schema.py)."""
+    _add_columns(conn, "interview_sessions", [
+        ("job_id", "INTEGER"),
+        ("questions_json", "TEXT"),
+        ("answers_json", "TEXT"),
+        ("followups_json", "TEXT"),
+        ("transcript_summary", "TEXT"),
+        ("final_scores_json", "TEXT"),
+        ("interview_score", "FLOAT"),
+        ("expires_at", "DATETIME"),
+    ])
+
+def m0003_rag_metric_columns(conn: Connection):
+    """RAGAS recall/relevancy and retrieval diversity/density (formerly migrate_rag.py, fix_missing_columns.py)."""
+    _add_columns(conn, "rag_metrics", [
+        ("recall_score", "FLOAT DEFAULT 0.0"),
+        ("relevancy_score", "FLOAT DEFAULT 0.0"),
+    ])
+    _add_columns(conn, "rag_retrieval_metrics", [
+        ("diversity", "FLOAT DEFAULT 0.0"),
+        ("density", "FLOAT DEFAULT 0.0"),
+    ])
+
+def m0004_candidate_woxsen_link(conn: Connection):
+    """candidates.woxsen_candidate_id FK, backfilled by email (formerly migrate_candidate_woxsen_link.py)."""
+    _add_columns(conn, "candidates", [("woxsen_candidate_id", "INTEGER REFERENCES woxsen_candidates(id)")])
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_candidates_woxsen_candidate_id ON candidates (woxsen_candidate_id)"))
+    result = conn.execute(text("""
+        UPDATE candidates
+        SET woxsen_candidate_id = (
+            SELECT w.id FROM woxsen_candidates w WHERE lower(w.email) = lower(candidates.email)
+        )
+        WHERE woxsen_candidate_id IS NULL
+          AND EXISTS (SELECT 1 FROM woxsen_candidates w WHERE lower(w.email) = lower(candidates.email))
+    """))
+    logger.info(f"[MIGRATIONS] Backfilled woxsen link for {result.rowcount} candidates")
+
+# Columns written by HR / interview flows; carried over from duplicates onto the surviving row
+_PRESERVED_SCREENING_COLUMNS = ["hr_decision", "hr_notes", "interview_status", "evaluation_locked", "interview_session_id", "interview_invite_sent"]
+
+def m0005_screening_result_unique(conn: Connection):
+    """Dedupe (candidate_id, jd_id) and enforce uniqueness (formerly migrate_screening_unique.py)."""
+    if "screening_results" not in _tables(conn) or _has_unique_index(conn, "screening_results", ["candidate_id", "jd_id"]):
+        return  # fresh databases get the constraint from create_all
+    duplicates = conn.execute(text("""
+        SELECT candidate_id, jd_id, MAX(id) FROM screening_results
+        GROUP BY candidate_id, jd_id HAVING COUNT(*) > 1
+    """)).fetchall()
+
+    removed = 0
+    for candidate_id, jd_id, keep_id in duplicates:
+        params = {"cid": candidate_id, "jd": jd_id, "keep": keep_id}
+        # Keep the newest row; fill its empty HR/interview fields from the newest older row that has them
+        for column in _PRESERVED_SCREENING_COLUMNS:
+            conn.execute(text(f"""
+                UPDATE screening_results SET {column} = (
+                    SELECT {column} FROM screening_results
+                    WHERE candidate_id IS :cid AND jd_id IS :jd AND id != :keep AND {column} IS NOT NULL
+                    ORDER BY id DESC LIMIT 1
+                )
+                WHERE id = :keep AND {column} IS NULL
+            """), params)
+        removed += conn.execute(text(
+            "DELETE FROM screening_results WHERE candidate_id IS :cid AND jd_id IS :jd AND id != :keep"
+        ), params).rowcount
+
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_screening_results_candidate_jd ON screening_results (candidate_id, jd_id)"
+    ))
+    logger.info(f"[MIGRATIONS] Removed {removed} duplicate screening results")
+
+def m0006_hot_path_indexes(conn: Connection):
+    """Indexes behind the ORDER BY ... DESC lookups, job polling and the ranking query."""
+    _create_model_indexes(conn, [
+        "ix_screening_results_evaluated_at",
+        "ix_screening_results_overall_score",
+        "ix_screening_results_jd_score",
+        "ix_screening_results_candidate_evaluated",
+        "ix_job_descriptions_active_created",
+        "ix_rag_metrics_candidate_timestamp",
+        "ix_rag_retrieval_metrics_candidate_evaluated",
+        "ix_rag_evaluation_results_candidate_timestamp",
+        "ix_rag_evaluation_jobs_status_created",
+        "ix_rag_evaluation_jobs_candidate_created",
+        "ix_rag_llm_eval_jobs_status_created",
+        "ix_rag_llm_eval_jobs_candidate_created",
+        "ix_interview_sessions_candidate_created",
+    ])
+    conn.execute(text("ANALYZE"))
+
+def m0007_leaderboard_backfill(conn: Connection):
+    """Materialize leaderboard_entries (created by create_all) for every JD with results."""
+    from .repository import refresh_leaderboard
+    if "screening_results" not in _tables(conn):
+        return
+    for (jd_id,) in conn.execute(text("SELECT DISTINCT jd_id FROM screening_results WHERE jd_id IS NOT NULL")).fetchall():
+        refresh_leaderboard(conn, jd_id)
+
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_screening_result_columns", m0001_screening_result_columns),
+    ("0002_interview_session_columns", m0002_interview_session_columns),
+    ("0003_rag_metric_columns", m0003_rag_metric_columns),
+    ("0004_candidate_woxsen_link", m0004_candidate_woxsen_link),
+    ("0005_screening_result_unique", m0005_screening_result_unique),
+    ("0006_hot_path_indexes", m0006_hot_path_indexes),
+    ("0007_leaderboard_backfill", m0007_leaderboard_backfill),
+]
+
+
+# ──────────────────────────────────────────────
+# Runner
+# ──────────────────────────────────────────────
+
+def _ensure_version_table(conn: Connection):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations (version VARCHAR PRIMARY KEY, applied_at DATETIME NOT NULL)"
+    ))
+
+def applied_migrations(engine: Engine = default_engine) -> set:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def run_migrations(engine: Engine = default_engine) -> List[str]:
+    """Apply pending migrations in order; returns the versions applied by this call."""
+    done = applied_migrations(engine)
+    applied = []
+    for version, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, applied_at) VALUES (:v, :t)"),
+                {"v": version, "t": datetime.utcnow().isoformat()},
+            )
+        logger.info(f"[MIGRATIONS] Applied {version}")
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if "--status" in sys.argv:
+        done = applied_migrations()
+        for version, _ in MIGRATIONS:
+            print(f"{'applied' if version in done else 'pending':8} {version}")
+    else:
+        Base.metadata.create_all(bind=default_engine)
+        applied = run_migrations()
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none pending'}")
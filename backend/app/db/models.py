@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Boolean, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from .database import Base
 import json
@@ -13,8 +13,11 @@ class Candidate(Base):
     email = Column(String, unique=True, index=True)
     github_url = Column(String)
     linkedin_url = Column(String, nullable=True)
+    woxsen_candidate_id = Column(Integer, ForeignKey("woxsen_candidates.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    woxsen = relationship("WoxsenCandidate", backref="candidates")
+
 class WoxsenCandidate(Base):
     __tablename__ = "woxsen_candidates"
 
@@ -25,11 +28,14 @@ class WoxsenCandidate(Base):
     github_url = Column(String, nullable=True)
     linkedin_url = Column(String, nullable=True)
     resume_file_path = Column(String, nullable=True)
-    raw_resume_text = Column(Text, nullable=True)
+    # Full extracted resume; only pipeline inputs and detail views load it
+    raw_resume_text = deferred(Column(Text, nullable=True), group="resume")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    # get_active_jd: is_active filter + newest first
+    __table_args__ = (Index("ix_job_descriptions_active_created", "is_active", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     jd_text = Column(Text)
@@ -43,6 +49,13 @@ class JobDescription(Base):
 
 class ScreeningResult(Base):
     __tablename__ = "screening_results"
+    # One result per candidate per JD; required by the ON CONFLICT upsert in repository.
+    # Existing databases get these through app.db.migrations.
+    __table_args__ = (
+        UniqueConstraint("candidate_id", "jd_id", name="uq_screening_results_candidate_jd"),
+        Index("ix_screening_results_jd_score", "jd_id", "overall_score"),
+        Index("ix_screening_results_candidate_evaluated", "candidate_id", "evaluated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
@@ -53,7 +66,7 @@ class ScreeningResult(Base):
 
     resume_score = Column(Float)
     github_score = Column(Float)
-    overall_score = Column(Float)
+    overall_score = Column(Float, index=True)
 
     risk_level = Column(String)
     readiness_level = Column(String)
@@ -64,17 +77,18 @@ class ScreeningResult(Base):
     ai_projects = Column(Integer, default=0)
     
     # JSON fields stored as TEXT
-    skill_gaps_json = Column(Text)
-    interview_focus_json = Column(Text)
-    github_features_json = Column(Text)
-    repos_json = Column(Text) # List[RepoItem]
-    interview_readiness_json = Column(Text) # InterviewReadinessReport
-    skeptic_analysis_json = Column(Text) # SkepticAnalysis
-    final_synthesized_decision_json = Column(Text) # FinalSynthesizedDecision
-    ai_evidence_json = Column(Text) # Transparency layer
+    # Bulky ones are deferred in two groups ("analysis", "evidence"); detail queries undefer them
+    skill_gaps_json = deferred(Column(Text), group="analysis")
+    interview_focus_json = deferred(Column(Text), group="analysis")
+    github_features_json = deferred(Column(Text), group="evidence")
+    repos_json = deferred(Column(Text), group="evidence") # List[RepoItem]
+    interview_readiness_json = deferred(Column(Text), group="analysis") # InterviewReadinessReport
+    skeptic_analysis_json = deferred(Column(Text), group="analysis") # SkepticAnalysis
+    final_synthesized_decision_json = deferred(Column(Text), group="analysis") # FinalSynthesizedDecision
+    ai_evidence_json = deferred(Column(Text), group="evidence") # Transparency layer
     justification_json = Column(Text) # Bullet points
-    judge_audit_json = Column(Text) # Judge audit details
-    rubric_scores_json = Column(Text) # Detailed rubric breakdown
+    judge_audit_json = deferred(Column(Text), group="evidence") # Judge audit details
+    rubric_scores_json = deferred(Column(Text), group="evidence") # Detailed rubric breakdown
 
     rank_position = Column(Integer, nullable=True)
     
@@ -94,10 +108,105 @@ class ScreeningResult(Base):
     interview_session_id = Column(String, nullable=True)
     interview_invite_sent = Column(Boolean, default=False)
     
-    evaluated_at = Column(DateTime(timezone=True), server_default=func.now())
+    evaluated_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class LeaderboardEntry(Base):
+    """
+    Materialized per-JD ranking, one row per screening result.
+    Maintained by the repository whenever screening results are written; never edit directly.
+    """
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        UniqueConstraint("jd_id", "candidate_id", name="uq_leaderboard_entries_jd_candidate"),
+        Index("ix_leaderboard_entries_jd_rank", "jd_id", "rank"),
+        Index("ix_leaderboard_entries_jd_score", "jd_id", "score"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    jd_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+
+    score = Column(Float, default=0.0)
+    rank = Column(Integer, nullable=True)
+    stage = Column(String, default="stage1") # stage1, stage2
+
+    # Display fields copied from the candidate / result so the ranking needs no joins
+    display_id = Column(String) # Woxsen roll number, else upper-cased email prefix
+    name = Column(String)
+    github_url = Column(String, nullable=True)
+    risk_level = Column(String, nullable=True)
+    recommendation = Column(Text, nullable=True)
+    hr_decision = Column(String, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class PipelineCheckpoint(Base):
+    """
+    Progress of one streaming stage run for a JD: which candidates have durable results.
+    A cancelled (or crashed, still RUNNING) run is resumed by the next run of the same stage.
+    """
+    __tablename__ = "pipeline_checkpoints"
+    __table_args__ = (Index("ix_pipeline_checkpoints_jd_stage_created", "jd_id", "stage", "created_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    jd_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
+    stage = Column(String, nullable=False) # stage1, stage2
+    status = Column(String, default="RUNNING") # RUNNING, CANCELLED, FAILED, COMPLETED, SUPERSEDED
+    total = Column(Integer, default=0)
+    completed_ids_json = Column(Text, default="[]") # pipeline candidate ids (roll numbers)
+    cancel_reason = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class PipelineRun(Base):
+    """
+    A screening job (/screen, bulk upload-and-screen, force-evaluate) executed by the background
+    run pool. Progress is appended to pipeline_run_events; the return value lands in result_json.
+    """
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (Index("ix_pipeline_runs_status_created", "status", "created_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False) # screening, bulk_screening, force_evaluate
+    status = Column(String, default="PENDING") # PENDING, RUNNING, COMPLETED, FAILED, CANCELLED
+    params_json = Column(Text, nullable=True)
+    result_json = Column(Text, nullable=True)
+    error_message = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, default=False)
+    event_count = Column(Integer, default=0) # next event seq
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+class PipelineRunEvent(Base):
+    """Append-only progress log of a run; seq numbers from 0 let clients resume with an offset."""
+    __tablename__ = "pipeline_run_events"
+    __table_args__ = (UniqueConstraint("run_id", "seq", name="uq_pipeline_run_events_run_seq"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("pipeline_runs.id"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    event = Column(String, nullable=False) # queued, started, progress, completed, failed, cancelled, ...
+    payload_json = Column(Text, default="{}")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class DataVersion(Base):
+    """
+    Monotonic change counter per JD, bumped by the repository in every write transaction that
+    changes data served by the read endpoints. scope = jd_id; scope 0 covers candidate-level
+    data that is not tied to a JD (RAG metrics and evaluations).
+    """
+    __tablename__ = "data_versions"
+
+    scope = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class RAGMetric(Base):
     __tablename__ = "rag_metrics"
+    __table_args__ = (Index("ix_rag_metrics_candidate_timestamp", "candidate_id", "evaluation_timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
@@ -122,6 +231,7 @@ class RAGRetrievalMetric(Base):
     Deterministic Zero-LLM Retrieval Quality Evaluation metrics.
     """
     __tablename__ = "rag_retrieval_metrics"
+    __table_args__ = (Index("ix_rag_retrieval_metrics_candidate_evaluated", "candidate_id", "evaluated_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), index=True)
@@ -145,6 +255,7 @@ class RAGEvaluationResult(Base):
     Full RAGAS evaluation result for a candidate in a given screening run.
     """
     __tablename__ = "rag_evaluation_results"
+    __table_args__ = (Index("ix_rag_evaluation_results_candidate_timestamp", "candidate_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
@@ -176,6 +287,11 @@ class RAGEvaluationJob(Base):
     Queue for RAGAS evaluation background processing.
     """
     __tablename__ = "rag_evaluation_jobs"
+    # Worker polling (status, oldest first) and per-candidate latest-job lookups
+    __table_args__ = (
+        Index("ix_rag_evaluation_jobs_status_created", "status", "created_at"),
+        Index("ix_rag_evaluation_jobs_candidate_created", "candidate_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), index=True)
@@ -216,6 +332,10 @@ class RAGLLMEvalJob(Base):
     Queue for Post-LLM RAG evaluation background processing.
     """
     __tablename__ = "rag_llm_eval_jobs"
+    __table_args__ = (
+        Index("ix_rag_llm_eval_jobs_status_created", "status", "created_at"),
+        Index("ix_rag_llm_eval_jobs_candidate_created", "candidate_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), index=True)
@@ -231,6 +351,7 @@ class RAGLLMEvalJob(Base):
 
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    __table_args__ = (Index("ix_interview_sessions_candidate_created", "candidate_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
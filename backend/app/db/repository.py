@@ -1,37 +1,120 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func, text, bindparam, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Load, Session, contains_eager, load_only, undefer
 from . import models
-from .models import Candidate, JobDescription, ScreeningResult, InterviewSession, RAGMetric, RAGEvaluationResult, RAGEvaluationJob
+from .candidate_index import candidate_alias_index
+from .models import Candidate, JobDescription, ScreeningResult, LeaderboardEntry, InterviewSession, RAGMetric, RAGEvaluationResult, RAGEvaluationJob
 import json
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 # --- Candidate Repositories ---
-def create_candidate(db: Session, name: str, email: str, github_url: str, linkedin_url: Optional[str] = None):
+def create_candidate(db: Session, name: str, email: str, github_url: str, linkedin_url: Optional[str] = None, woxsen_candidate_id: Optional[int] = None):
+    if woxsen_candidate_id is None and email:
+        wc = db.query(models.WoxsenCandidate.id).filter(func.lower(models.WoxsenCandidate.email) == email.lower()).first()
+        woxsen_candidate_id = wc.id if wc else None
     db_candidate = Candidate(
         name=name,
         email=email,
         github_url=github_url,
-        linkedin_url=linkedin_url
+        linkedin_url=linkedin_url,
+        woxsen_candidate_id=woxsen_candidate_id
     )
     db.add(db_candidate)
     db.commit()
     db.refresh(db_candidate)
+    candidate_alias_index.add(db_candidate)
     return db_candidate
 
+def update_candidate_links(db: Session, candidate: Candidate, github_url: Optional[str], linkedin_url: Optional[str]):
+    """Refresh a candidate's profile links; bumps the candidate-level data version in the same commit."""
+    candidate.github_url = github_url
+    candidate.linkedin_url = linkedin_url
+    bump_data_version(db)
+    db.commit()
+    candidate_alias_index.add(candidate)
+    return candidate
+
 def get_candidate(db: Session, candidate_id: int):
     return db.query(Candidate).filter(Candidate.id == candidate_id).first()
 
 def get_candidate_by_email(db: Session, email: str):
     return db.query(Candidate).filter(Candidate.email == email).first()
 
+def _index_on_commit(db: Session, entries: List[Tuple[int, str, Optional[str], Optional[str]]]):
+    """
+    Queue alias-index entries (id, email, github_url, roll_number) until the session commits.
+    A rollback drops them: SQLite hands rolled-back ids to the next inserted rows, so indexing
+    them early would point the aliases at the wrong candidate.
+    """
+    pending = db.info.get("alias_index_pending")
+    if pending is None:
+        pending = db.info["alias_index_pending"] = []
+
+        def on_commit(session):
+            for entry in session.info["alias_index_pending"]:
+                candidate_alias_index.add_aliases(*entry)
+            session.info["alias_index_pending"].clear()
+
+        def on_rollback(session):
+            session.info["alias_index_pending"].clear()
+
+        event.listen(db, "after_commit", on_commit)
+        event.listen(db, "after_rollback", on_rollback)
+    pending.extend(entries)
+
+def ensure_candidates(db: Session, specs: List[Dict]) -> Dict[str, int]:
+    """
+    {email: candidate id} for candidate specs (email, name, github_url, linkedin_url),
+    creating the missing ones linked to their Woxsen record. Flushes but does not commit,
+    so callers can fold it into a larger transaction; new rows join the alias index on commit.
+    """
+    by_email = {s["email"]: s for s in specs if s.get("email")}
+    ids = get_candidate_ids_by_email(db, list(by_email))
+    missing = [s for email, s in by_email.items() if email not in ids]
+    if missing:
+        woxsen = get_woxsen_candidates_by_email(db, [s["email"] for s in missing])
+        new_rows = []
+        for s in missing:
+            wc = woxsen.get(s["email"].lower())
+            new_rows.append(Candidate(
+                name=s.get("name"),
+                email=s["email"],
+                github_url=s.get("github_url", ""),
+                linkedin_url=s.get("linkedin_url"),
+                woxsen_candidate_id=wc.id if wc else None,
+            ))
+        db.add_all(new_rows)
+        db.flush()
+        ids.update({c.email: c.id for c in new_rows})
+        entries = []
+        for c in new_rows:
+            wc = woxsen.get(c.email.lower())
+            entries.append((c.id, c.email, c.github_url or (wc.github_url if wc else None), wc.roll_number if wc else None))
+        _index_on_commit(db, entries)
+    return ids
+
+def get_candidate_ids_by_email(db: Session, emails: List[str], chunk_size: int = 500) -> Dict[str, int]:
+    """{email: candidate id} for the given emails, one query per chunk."""
+    found = {}
+    emails = list(set(e for e in emails if e))
+    for i in range(0, len(emails), chunk_size):
+        for cid, email in db.query(Candidate.id, Candidate.email).filter(Candidate.email.in_(emails[i:i + chunk_size])).all():
+            found[email] = cid
+    return found
+
 def get_candidate_by_fuzzy_id(db: Session, identifier: str):
     """
-    Robustly finds a candidate by ID, full email, or roll number/email prefix.
+    Robustly finds a candidate by ID, full email, roll number/email prefix or GitHub username.
+    Exact aliases come from the in-memory alias index; partial matches fall back to SQL.
     """
     if not identifier:
         return None
-        
+
     identifier_str = str(identifier).strip()
-    
+    return candidate_alias_index.resolve(db, identifier_str, fallback=_scan_candidate_by_fuzzy_id)
+
+def _scan_candidate_by_fuzzy_id(db: Session, identifier_str: str):
+    """Query-based lookup for identifiers the alias index has no exact entry for."""
     # 1. Try by Integer ID
     if identifier_str.isdigit():
         cand = get_candidate(db, int(identifier_str))
@@ -67,8 +150,49 @@ def list_candidates(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Candidate).offset(skip).limit(limit).all()
 
 def list_woxsen_candidates(db: Session):
+    """Woxsen candidates without the deferred resume text (links, names, roll numbers)."""
     return db.query(models.WoxsenCandidate).all()
 
+def list_woxsen_pipeline_inputs(db: Session):
+    """Pipeline-input projection: Woxsen candidates with raw_resume_text loaded in the same query."""
+    return db.query(models.WoxsenCandidate).options(undefer(models.WoxsenCandidate.raw_resume_text)).all()
+
+def get_woxsen_candidate_by_alias(db: Session, alias: str, include_resume: bool = False) -> Optional["models.WoxsenCandidate"]:
+    """Woxsen candidate by roll number or email, case-insensitively."""
+    key = alias.strip().lower()
+    query = db.query(models.WoxsenCandidate)
+    if include_resume:
+        query = query.options(undefer(models.WoxsenCandidate.raw_resume_text))
+    return query.filter(
+        (func.lower(models.WoxsenCandidate.roll_number) == key) | (func.lower(models.WoxsenCandidate.email) == key)
+    ).first()
+
+def woxsen_cohort_fingerprint(db: Session) -> str:
+    """Digest of the Woxsen cohort (who, which links, how much resume text) without loading resumes."""
+    import hashlib
+    digest = hashlib.sha256()
+    rows = db.query(
+        models.WoxsenCandidate.roll_number,
+        models.WoxsenCandidate.email,
+        models.WoxsenCandidate.github_url,
+        func.length(models.WoxsenCandidate.raw_resume_text),
+    ).order_by(models.WoxsenCandidate.roll_number)
+    for row in rows:
+        digest.update(json.dumps(list(row)).encode())
+    return digest.hexdigest()
+
+def get_woxsen_candidates_by_email(db: Session, emails: List[str], chunk_size: int = 500, include_resume: bool = False) -> Dict[str, "models.WoxsenCandidate"]:
+    """{lower-cased email: WoxsenCandidate} in one query per chunk (fallback for unlinked candidates)."""
+    found = {}
+    emails = list({e.lower() for e in emails if e})
+    query = db.query(models.WoxsenCandidate)
+    if include_resume:
+        query = query.options(undefer(models.WoxsenCandidate.raw_resume_text))
+    for i in range(0, len(emails), chunk_size):
+        for wc in query.filter(func.lower(models.WoxsenCandidate.email).in_(emails[i:i + chunk_size])).all():
+            found[wc.email.lower()] = wc
+    return found
+
 # --- JD Repositories ---
 def create_job_description(db: Session, jd_text: str):
     jd_hash = JobDescription.generate_hash(jd_text)
@@ -104,62 +228,218 @@ def get_screening_result(db: Session, candidate_id: int, jd_id: int):
         ScreeningResult.jd_id == jd_id
     ).first()
 
+def get_cached_screening_results(db: Session, candidates: List[Dict], jd_id: int, chunk_size: int = 500) -> Dict[str, Tuple[Candidate, ScreeningResult]]:
+    """
+    Set-based cache lookup for a screening cohort against one JD.
+
+    `candidates` are pipeline input dicts ("candidate_id", optional "email"). Matches by exact
+    email first, then by email prefix == candidate_id (roll number), mirroring the common
+    paths of get_candidate_by_fuzzy_id without per-candidate queries.
+    Returns {candidate_id: (Candidate, ScreeningResult)} for candidates with a stored result.
+    """
+    found: Dict[str, Tuple[Candidate, ScreeningResult]] = {}
+    by_email = {c["email"].lower(): c["candidate_id"] for c in candidates if c.get("email")}
+
+    def joined():
+        # Cache hits are served as full evaluations, so load the deferred JSON groups up front
+        return db.query(Candidate, ScreeningResult).join(
+            ScreeningResult, ScreeningResult.candidate_id == Candidate.id
+        ).filter(ScreeningResult.jd_id == jd_id).options(*_screening_detail_options())
+
+    emails = list(by_email)
+    for i in range(0, len(emails), chunk_size):
+        for cand, result in joined().filter(func.lower(Candidate.email).in_(emails[i:i + chunk_size])).all():
+            found.setdefault(by_email[cand.email.lower()], (cand, result))
+
+    remaining = {str(c["candidate_id"]).lower(): c["candidate_id"] for c in candidates if c["candidate_id"] not in found}
+    if remaining:
+        prefix = func.lower(func.substr(Candidate.email, 1, func.instr(Candidate.email, "@") - 1))
+        ids = list(remaining)
+        for i in range(0, len(ids), chunk_size):
+            for cand, result in joined().filter(prefix.in_(ids[i:i + chunk_size])).all():
+                found.setdefault(remaining[cand.email.split("@")[0].lower()], (cand, result))
+    return found
+
 def get_latest_screening_result(db: Session, candidate_id: int):
-    return db.query(ScreeningResult).filter(ScreeningResult.candidate_id == candidate_id).order_by(ScreeningResult.evaluated_at.desc()).first()
+    return (
+        db.query(ScreeningResult)
+        .options(*_screening_detail_options())
+        .filter(ScreeningResult.candidate_id == candidate_id)
+        .order_by(ScreeningResult.evaluated_at.desc())
+        .first()
+    )
+
+# --- Screening result projections ---
+# ScreeningResult's JSON blobs and WoxsenCandidate.raw_resume_text are deferred (see models);
+# each projection below loads exactly what its callers read, in one query.
+SCREENING_DETAIL_GROUPS = ("analysis", "evidence")
+SCREENING_RANKING_COLUMNS = (
+    ScreeningResult.id,
+    ScreeningResult.candidate_id,
+    ScreeningResult.jd_id,
+    ScreeningResult.resume_score,
+    ScreeningResult.github_score,
+    ScreeningResult.overall_score,
+    ScreeningResult.recommendation,
+    ScreeningResult.rank_position,
+    ScreeningResult.justification_json,
+)
+# Ranking columns plus the small status fields the results summary shows per card
+SCREENING_SUMMARY_COLUMNS = SCREENING_RANKING_COLUMNS + (
+    ScreeningResult.risk_level,
+    ScreeningResult.repo_count,
+    ScreeningResult.ai_projects,
+    ScreeningResult.hr_decision,
+    ScreeningResult.hr_notes,
+    ScreeningResult.rag_status,
+    ScreeningResult.rag_override,
+)
+
+def _screening_detail_options():
+    # Bound to ScreeningResult so they also apply to multi-entity (Candidate, ScreeningResult) queries
+    return [Load(ScreeningResult).undefer_group(group) for group in SCREENING_DETAIL_GROUPS]
 
 def list_screening_results(db: Session, jd_id: int):
+    """Screening results for a JD; deferred JSON groups load on first access."""
     return db.query(ScreeningResult).filter(ScreeningResult.jd_id == jd_id).all()
 
-def save_screening_result(db: Session, candidate_id: int, jd_id: int, result_data: dict):
-    # Check if exists to update or create
-    existing = get_screening_result(db, candidate_id, jd_id)
-    
-    # Preserve HR decisions if they exist
-    hr_decision = None
-    hr_notes = None
-    if existing:
-        hr_decision = existing.hr_decision
-        hr_notes = existing.hr_notes
-        db.delete(existing)
-        db.commit()
+def list_screening_ranking(db: Session, jd_id: int, limit: Optional[int] = None, include_resume: bool = False):
+    """
+    Ranking projection: scores, rank and justification plus the candidate and Woxsen record,
+    best first. No evidence JSON; resume text only when `include_resume` (Stage 2 input).
+    """
+    woxsen = contains_eager(ScreeningResult.candidate).joinedload(Candidate.woxsen)
+    if include_resume:
+        woxsen = woxsen.undefer(models.WoxsenCandidate.raw_resume_text)
+    query = (
+        db.query(ScreeningResult)
+        .join(Candidate, ScreeningResult.candidate_id == Candidate.id)
+        .options(load_only(*SCREENING_RANKING_COLUMNS), woxsen)
+        .filter(ScreeningResult.jd_id == jd_id)
+        # id DESC as the tie-breaker keeps the ORDER BY fully served by ix_screening_results_jd_score
+        .order_by(ScreeningResult.overall_score.desc(), ScreeningResult.id.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
-    db_result = ScreeningResult(
-        candidate_id=candidate_id,
-        jd_id=jd_id,
-        resume_score=result_data.get("resume_score"),
-        github_score=result_data.get("github_score"),
-        overall_score=result_data.get("overall_score"),
-        risk_level=result_data.get("risk_level"),
-        readiness_level=result_data.get("readiness_level"),
-        recommendation=result_data.get("recommendation"),
-        repo_count=result_data.get("repo_count", 0),
-        ai_projects=result_data.get("ai_projects", 0),
-        skill_gaps_json=json.dumps(result_data.get("skill_gaps", [])),
-        interview_focus_json=json.dumps(result_data.get("interview_focus", [])),
-        github_features_json=json.dumps(result_data.get("github_features", [])),
-        repos_json=json.dumps(result_data.get("repos", [])),
-        interview_readiness_json=json.dumps(result_data.get("interview_readiness", {})),
-        skeptic_analysis_json=json.dumps(result_data.get("skeptic_analysis", {})),
-        final_synthesized_decision_json=json.dumps(result_data.get("final_synthesized_decision", {})),
-        ai_evidence_json=json.dumps(result_data.get("ai_evidence", [])),
-        justification_json=json.dumps(result_data.get("justification", [])),
-        judge_audit_json=json.dumps(result_data.get("judge_audit", {})),
-        rubric_scores_json=json.dumps(result_data.get("rubric_scores", {})),
-        rank_position=result_data.get("rank_position"),
-        
-        # New RAG Metadata
-        retrieval_mode=result_data.get("retrieval_mode", "llama_index"),
-        retrieval_version=result_data.get("retrieval_version"),
-        rag_enabled=result_data.get("rag_enabled", True),
-        rag_status=result_data.get("rag_status", "healthy"),
-
-        hr_decision=hr_decision,
-        hr_notes=hr_notes
+def list_screening_results_with_candidates(db: Session, jd_id: int):
+    """
+    Detail projection: every result column for a JD with Candidate and linked WoxsenCandidate
+    (including resume text) loaded in the same query.
+    """
+    return (
+        db.query(ScreeningResult)
+        .join(Candidate, ScreeningResult.candidate_id == Candidate.id)
+        .options(
+            contains_eager(ScreeningResult.candidate).joinedload(Candidate.woxsen).undefer(models.WoxsenCandidate.raw_resume_text),
+            *_screening_detail_options(),
+        )
+        .filter(ScreeningResult.jd_id == jd_id)
+        .all()
     )
-    db.add(db_result)
-    db.commit()
-    db.refresh(db_result)
-    return db_result
+
+def get_screening_results_for_candidates(db: Session, jd_id: int, candidate_ids: List[int], detail: bool = False) -> Dict[int, ScreeningResult]:
+    """
+    {candidate_id: result} for one page of candidates. Summary loads SCREENING_SUMMARY_COLUMNS only;
+    detail loads every column plus the candidate's Woxsen record with resume text.
+    """
+    if not candidate_ids:
+        return {}
+    query = db.query(ScreeningResult).filter(ScreeningResult.jd_id == jd_id, ScreeningResult.candidate_id.in_(candidate_ids))
+    if detail:
+        query = query.join(Candidate, ScreeningResult.candidate_id == Candidate.id).options(
+            contains_eager(ScreeningResult.candidate).joinedload(Candidate.woxsen).undefer(models.WoxsenCandidate.raw_resume_text),
+            *_screening_detail_options(),
+        )
+    else:
+        query = query.options(load_only(*SCREENING_SUMMARY_COLUMNS))
+    return {r.candidate_id: r for r in query.all()}
+
+# result_data key -> (column, default) for plain columns and JSON-encoded TEXT columns
+SCREENING_SCALAR_FIELDS = {
+    "resume_score": ("resume_score", None),
+    "github_score": ("github_score", None),
+    "overall_score": ("overall_score", None),
+    "risk_level": ("risk_level", None),
+    "readiness_level": ("readiness_level", None),
+    "recommendation": ("recommendation", None),
+    "repo_count": ("repo_count", 0),
+    "ai_projects": ("ai_projects", 0),
+    "rank_position": ("rank_position", None),
+    "retrieval_mode": ("retrieval_mode", "llama_index"),
+    "retrieval_version": ("retrieval_version", None),
+    "rag_enabled": ("rag_enabled", True),
+    "rag_status": ("rag_status", "healthy"),
+}
+SCREENING_JSON_FIELDS = {
+    "skill_gaps": ("skill_gaps_json", []),
+    "interview_focus": ("interview_focus_json", []),
+    "github_features": ("github_features_json", []),
+    "repos": ("repos_json", []),
+    "interview_readiness": ("interview_readiness_json", {}),
+    "skeptic_analysis": ("skeptic_analysis_json", {}),
+    "final_synthesized_decision": ("final_synthesized_decision_json", {}),
+    "ai_evidence": ("ai_evidence_json", []),
+    "justification": ("justification_json", []),
+    "judge_audit": ("judge_audit_json", {}),
+    "rubric_scores": ("rubric_scores_json", {}),
+}
+# Columns owned by HR / interview flows: set on insert by defaults, never overwritten by a re-score
+SCREENING_PRESERVED_COLUMNS = {
+    "hr_decision", "hr_notes", "interview_status", "evaluation_locked",
+    "interview_session_id", "interview_invite_sent", "rag_override",
+}
+
+def _screening_columns(result_data: dict, partial: bool = False) -> dict:
+    """Map a pipeline result dict to screening_results columns (only keys present when partial)."""
+    values = {}
+    for key, (column, default) in SCREENING_SCALAR_FIELDS.items():
+        if not partial or key in result_data:
+            values[column] = result_data.get(key, default)
+    for key, (column, default) in SCREENING_JSON_FIELDS.items():
+        if not partial or key in result_data:
+            values[column] = json.dumps(result_data.get(key, default))
+    return values
+
+def bulk_upsert_screening_results(db: Session, jd_id: int, rows: List[Tuple[int, dict]], partial: bool = False, chunk_size: int = 200, commit: bool = True) -> int:
+    """
+    Insert or update many screening results for one JD in a single transaction.
+
+    `rows` are (candidate_id, result_data). Uses INSERT ... ON CONFLICT(candidate_id, jd_id)
+    DO UPDATE, so existing row ids are kept and HR/interview columns are left untouched.
+    With partial=True only the keys present in each result_data are written (e.g. Stage 2
+    GitHub fields on top of a Stage 1 row).
+    """
+    if not rows:
+        return 0
+
+    # A multi-row VALUES statement needs identical columns per row: group by column set
+    groups: Dict[tuple, List[dict]] = {}
+    for candidate_id, result_data in rows:
+        values = _screening_columns(result_data, partial=partial)
+        values.update(candidate_id=candidate_id, jd_id=jd_id)
+        groups.setdefault(tuple(sorted(values)), []).append(values)
+
+    try:
+        for columns, group in groups.items():
+            update_columns = [c for c in columns if c not in ("candidate_id", "jd_id") and c not in SCREENING_PRESERVED_COLUMNS]
+            for i in range(0, len(group), chunk_size):
+                stmt = sqlite_insert(ScreeningResult).values(group[i:i + chunk_size])
+                set_ = {c: stmt.excluded[c] for c in update_columns}
+                set_["evaluated_at"] = func.now()
+                db.execute(stmt.on_conflict_do_update(index_elements=["candidate_id", "jd_id"], set_=set_))
+        refresh_leaderboard(db, jd_id, [candidate_id for candidate_id, _ in rows])
+        if commit:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(rows)
+
+def save_screening_result(db: Session, candidate_id: int, jd_id: int, result_data: dict):
+    bulk_upsert_screening_results(db, jd_id, [(candidate_id, result_data)])
+    return get_screening_result(db, candidate_id, jd_id)
 
 def clear_stale_results(db: Session, current_version: str):
     """Deletes all screening results that don't match the current retrieval version."""
@@ -167,6 +447,8 @@ def clear_stale_results(db: Session, current_version: str):
     if stale:
         for result in stale:
             db.delete(result)
+        for jd_id in {result.jd_id for result in stale}:
+            remove_from_leaderboard(db, jd_id, [result.candidate_id for result in stale if result.jd_id == jd_id])
         db.commit()
         return len(stale)
     return 0
@@ -177,18 +459,316 @@ def update_screening_hr_decision(db: Session, candidate_id: int, jd_id: int, dec
         db_result.hr_decision = decision
         if notes is not None:
             db_result.hr_notes = notes
+        db.flush()
+        refresh_leaderboard(db, jd_id, [candidate_id], rerank=False)
         db.commit()
         db.refresh(db_result)
     return db_result
 
+def update_screening_interview_state(db: Session, result: ScreeningResult, **values):
+    """
+    Set interview/lock columns (interview_status, evaluation_locked, interview_session_id, ...)
+    on a screening result and bump its JD's data version; commits pending work in the session.
+    """
+    for column, value in values.items():
+        setattr(result, column, value)
+    bump_data_version(db, result.jd_id)
+    db.commit()
+    db.refresh(result)
+    return result
+
 def delete_screening_result(db: Session, candidate_id: int, jd_id: int):
     result = get_screening_result(db, candidate_id, jd_id)
     if result:
         db.delete(result)
+        remove_from_leaderboard(db, jd_id, [candidate_id])
         db.commit()
         return True
     return False
 
+# --- Pipeline checkpoints (resumable streaming runs) ---
+RESUMABLE_CHECKPOINT_STATUSES = ("RUNNING", "CANCELLED", "FAILED")
+
+def get_resumable_checkpoint(db: Session, jd_id: int, stage: str) -> Optional["models.PipelineCheckpoint"]:
+    """Latest checkpoint of a stage for a JD if that run never completed, else None."""
+    latest = (
+        db.query(models.PipelineCheckpoint)
+        .filter(models.PipelineCheckpoint.jd_id == jd_id, models.PipelineCheckpoint.stage == stage)
+        .order_by(models.PipelineCheckpoint.created_at.desc(), models.PipelineCheckpoint.id.desc())
+        .first()
+    )
+    return latest if latest and latest.status in RESUMABLE_CHECKPOINT_STATUSES else None
+
+def create_pipeline_checkpoint(db: Session, jd_id: int, stage: str, total: int) -> "models.PipelineCheckpoint":
+    checkpoint = models.PipelineCheckpoint(jd_id=jd_id, stage=stage, total=total, status="RUNNING", completed_ids_json="[]")
+    db.add(checkpoint)
+    db.commit()
+    db.refresh(checkpoint)
+    return checkpoint
+
+def update_pipeline_checkpoint(
+    db: Session,
+    checkpoint_id: int,
+    completed_ids: Optional[List[str]] = None,
+    status: Optional[str] = None,
+    total: Optional[int] = None,
+    cancel_reason: Optional[str] = None,
+):
+    values = {}
+    if completed_ids is not None:
+        values["completed_ids_json"] = json.dumps(sorted(completed_ids))
+    if status is not None:
+        values["status"] = status
+    if total is not None:
+        values["total"] = total
+    if cancel_reason is not None:
+        values["cancel_reason"] = cancel_reason
+    if values:
+        db.query(models.PipelineCheckpoint).filter(models.PipelineCheckpoint.id == checkpoint_id).update(values, synchronize_session=False)
+        db.commit()
+
+def supersede_checkpoints(db: Session, jd_id: int, stage: str):
+    """Stop unfinished runs of `stage` from being resumed (e.g. Stage 2 after Stage 1 re-scored)."""
+    db.query(models.PipelineCheckpoint).filter(
+        models.PipelineCheckpoint.jd_id == jd_id,
+        models.PipelineCheckpoint.stage == stage,
+        models.PipelineCheckpoint.status.in_(RESUMABLE_CHECKPOINT_STATUSES),
+    ).update({"status": "SUPERSEDED"}, synchronize_session=False)
+    db.commit()
+
+# --- Pipeline runs (background screening jobs) ---
+TERMINAL_RUN_STATUSES = ("COMPLETED", "FAILED", "CANCELLED")
+
+def create_pipeline_run(db: Session, kind: str, params: Optional[Dict] = None) -> "models.PipelineRun":
+    run = models.PipelineRun(kind=kind, status="PENDING", params_json=json.dumps(params or {}), event_count=0)
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+def get_pipeline_run(db: Session, run_id: int) -> Optional["models.PipelineRun"]:
+    return db.query(models.PipelineRun).filter(models.PipelineRun.id == run_id).first()
+
+def update_pipeline_run(
+    db: Session,
+    run_id: int,
+    status: Optional[str] = None,
+    result: Optional[Dict] = None,
+    error_message: Optional[str] = None,
+    cancel_requested: Optional[bool] = None,
+    only_if_status: Optional[Tuple[str, ...]] = None,
+    commit: bool = True,
+) -> bool:
+    """
+    Update a run; RUNNING stamps started_at and terminal statuses stamp completed_at.
+    With only_if_status the update applies only while the run is in one of those statuses
+    (compare-and-set between the worker and the cancel route). Returns whether a row changed.
+    Terminal updates are committed together with the terminal event (commit=False on the first
+    write), so a reader that sees a finished run also sees its last event.
+    """
+    values = {}
+    if status is not None:
+        values["status"] = status
+        if status == "RUNNING":
+            values["started_at"] = func.now()
+        elif status in TERMINAL_RUN_STATUSES:
+            values["completed_at"] = func.now()
+    if result is not None:
+        values["result_json"] = json.dumps(result, default=str)
+    if error_message is not None:
+        values["error_message"] = error_message
+    if cancel_requested is not None:
+        values["cancel_requested"] = cancel_requested
+    if not values:
+        return False
+    query = db.query(models.PipelineRun).filter(models.PipelineRun.id == run_id)
+    if only_if_status:
+        query = query.filter(models.PipelineRun.status.in_(only_if_status))
+    changed = query.update(values, synchronize_session=False)
+    if commit:
+        db.commit()
+    return bool(changed)
+
+def append_pipeline_run_event(db: Session, run_id: int, event: str, payload: Optional[Dict] = None, commit: bool = True) -> int:
+    """Append an event to a run's log and return its seq (claimed from the run's counter in the same transaction)."""
+    run = models.PipelineRun.__table__
+    seq = db.execute(
+        run.update().where(run.c.id == run_id).values(event_count=run.c.event_count + 1).returning(run.c.event_count)
+    ).scalar_one() - 1
+    db.add(models.PipelineRunEvent(run_id=run_id, seq=seq, event=event, payload_json=json.dumps(payload or {}, default=str)))
+    if commit:
+        db.commit()
+    return seq
+
+def list_pipeline_run_events(db: Session, run_id: int, offset: int = 0, limit: int = 500) -> List["models.PipelineRunEvent"]:
+    """Events with seq >= offset, in order."""
+    return (
+        db.query(models.PipelineRunEvent)
+        .filter(models.PipelineRunEvent.run_id == run_id, models.PipelineRunEvent.seq >= offset)
+        .order_by(models.PipelineRunEvent.seq)
+        .limit(limit)
+        .all()
+    )
+
+def fail_orphaned_pipeline_runs(db: Session) -> int:
+    """Mark runs left PENDING/RUNNING by a previous process as FAILED (their worker is gone)."""
+    orphaned = [
+        run_id for (run_id,) in db.query(models.PipelineRun.id)
+        .filter(models.PipelineRun.status.in_(("PENDING", "RUNNING")))
+        .all()
+    ]
+    for run_id in orphaned:
+        update_pipeline_run(db, run_id, status="FAILED", error_message="Interrupted by a server restart", commit=False)
+        append_pipeline_run_event(db, run_id, "failed", {"error": "Interrupted by a server restart"})
+    return len(orphaned)
+
+# --- Data versions (read cache invalidation) ---
+# Bumped inside the writer's transaction so the new version becomes visible exactly when the data does
+GLOBAL_DATA_SCOPE = 0
+DATA_VERSION_BUMP_SQL = text("""
+    INSERT INTO data_versions (scope, version, updated_at) VALUES (:scope, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+""")
+
+def bump_data_version(db: Session, jd_id: Optional[int] = None):
+    """Mark a JD's data (or, with no jd_id, candidate-level data) as changed. Does not commit."""
+    db.execute(DATA_VERSION_BUMP_SQL, {"scope": GLOBAL_DATA_SCOPE if jd_id is None else jd_id})
+
+def get_data_versions(db: Session, jd_id: int) -> Tuple[int, int]:
+    """(JD version, candidate-level version); 0 for a scope that has never been written."""
+    versions = dict(db.query(models.DataVersion.scope, models.DataVersion.version).filter(
+        models.DataVersion.scope.in_([jd_id, GLOBAL_DATA_SCOPE])
+    ).all())
+    return versions.get(jd_id, 0), versions.get(GLOBAL_DATA_SCOPE, 0)
+
+# --- Leaderboard (materialized ranking) ---
+# One row per screening result, refreshed from screening_results inside the writer's transaction.
+# Display id mirrors get_stored_results: linked Woxsen roll number, else the upper-cased email prefix.
+LEADERBOARD_REFRESH_SQL = """
+    INSERT INTO leaderboard_entries
+        (jd_id, candidate_id, score, stage, display_id, name, github_url, risk_level, recommendation, hr_decision, updated_at)
+    SELECT sr.jd_id, sr.candidate_id, COALESCE(sr.overall_score, 0),
+           CASE WHEN sr.github_features_json IS NULL OR sr.github_features_json IN ('{{}}', '[]', 'null')
+                THEN 'stage1' ELSE 'stage2' END,
+           COALESCE(w.roll_number, upper(substr(c.email, 1, instr(c.email, '@') - 1))),
+           c.name, COALESCE(NULLIF(c.github_url, ''), w.github_url),
+           sr.risk_level, sr.recommendation, sr.hr_decision, CURRENT_TIMESTAMP
+    FROM screening_results sr
+    JOIN candidates c ON c.id = sr.candidate_id
+    LEFT JOIN woxsen_candidates w ON w.id = c.woxsen_candidate_id
+    WHERE sr.jd_id = :jd_id {candidate_filter}
+    ON CONFLICT (jd_id, candidate_id) DO UPDATE SET
+        score = excluded.score, stage = excluded.stage, display_id = excluded.display_id,
+        name = excluded.name, github_url = excluded.github_url, risk_level = excluded.risk_level,
+        recommendation = excluded.recommendation, hr_decision = excluded.hr_decision,
+        updated_at = excluded.updated_at
+"""
+# Dense 1..N by score (ties: newest entry first, matching ix_leaderboard_entries_jd_score order);
+# only rows whose rank actually moved are written
+LEADERBOARD_RERANK_SQL = text("""
+    UPDATE leaderboard_entries SET rank = ranked.new_rank
+    FROM (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY score DESC, id DESC) AS new_rank
+        FROM leaderboard_entries WHERE jd_id = :jd_id
+    ) AS ranked
+    WHERE leaderboard_entries.id = ranked.id AND leaderboard_entries.rank IS NOT ranked.new_rank
+""")
+LEADERBOARD_SORT_COLUMNS = {
+    "rank": LeaderboardEntry.rank,
+    "score": LeaderboardEntry.score,
+    "name": LeaderboardEntry.name,
+    "candidate_id": LeaderboardEntry.display_id,
+    "updated_at": LeaderboardEntry.updated_at,
+}
+
+def refresh_leaderboard(db: Session, jd_id: int, candidate_ids: Optional[List[int]] = None, rerank: bool = True, chunk_size: int = 500):
+    """
+    Re-materialize leaderboard rows for `candidate_ids` (all of the JD's results when None)
+    and re-number ranks. Does not commit: runs inside the caller's write transaction.
+    """
+    if candidate_ids is None:
+        db.execute(text(LEADERBOARD_REFRESH_SQL.format(candidate_filter="")), {"jd_id": jd_id})
+        # Full refresh also drops entries whose result was deleted outside the repository
+        db.execute(text("""
+            DELETE FROM leaderboard_entries WHERE jd_id = :jd_id AND NOT EXISTS (
+                SELECT 1 FROM screening_results sr
+                WHERE sr.jd_id = leaderboard_entries.jd_id AND sr.candidate_id = leaderboard_entries.candidate_id
+            )
+        """), {"jd_id": jd_id})
+    else:
+        stmt = text(LEADERBOARD_REFRESH_SQL.format(candidate_filter="AND sr.candidate_id IN :candidate_ids")).bindparams(
+            bindparam("candidate_ids", expanding=True)
+        )
+        ids = list(set(candidate_ids))
+        for i in range(0, len(ids), chunk_size):
+            db.execute(stmt, {"jd_id": jd_id, "candidate_ids": ids[i:i + chunk_size]})
+    if rerank:
+        db.execute(LEADERBOARD_RERANK_SQL, {"jd_id": jd_id})
+    bump_data_version(db, jd_id)
+
+def remove_from_leaderboard(db: Session, jd_id: int, candidate_ids: List[int]):
+    db.query(LeaderboardEntry).filter(
+        LeaderboardEntry.jd_id == jd_id, LeaderboardEntry.candidate_id.in_(candidate_ids)
+    ).delete(synchronize_session=False)
+    db.execute(LEADERBOARD_RERANK_SQL, {"jd_id": jd_id})
+    bump_data_version(db, jd_id)
+
+def get_leaderboard_page(
+    db: Session,
+    jd_id: int,
+    sort: str = "rank",
+    descending: bool = False,
+    stage: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+) -> Tuple[List[LeaderboardEntry], int]:
+    """One page of the materialized ranking plus the total row count (for the filter)."""
+    query = db.query(LeaderboardEntry).filter(LeaderboardEntry.jd_id == jd_id)
+    if stage:
+        query = query.filter(LeaderboardEntry.stage == stage)
+    total = query.count()
+    column = LEADERBOARD_SORT_COLUMNS[sort]
+    order = [column.desc() if descending else column.asc()]
+    if sort != "rank":
+        order.append(LeaderboardEntry.rank)
+    query = query.order_by(*order)
+    return query.offset(offset).limit(limit).all(), total
+
+def get_leaderboard_slice(
+    db: Session,
+    jd_id: int,
+    after: Optional[Tuple[float, int]] = None,
+    limit: int = 50,
+    stage: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    risk_level: Optional[str] = None,
+) -> Tuple[List[LeaderboardEntry], int]:
+    """
+    Keyset page in ranking order (score desc, id desc) starting after the (score, id) of the
+    previous page's last entry, plus the filtered total. Filters and paging run in SQL; the
+    row-value comparison lets SQLite seek straight to the cursor on ix_leaderboard_entries_jd_score.
+    """
+    query = db.query(LeaderboardEntry).filter(LeaderboardEntry.jd_id == jd_id)
+    if stage:
+        query = query.filter(LeaderboardEntry.stage == stage)
+    if min_score is not None:
+        query = query.filter(LeaderboardEntry.score >= min_score)
+    if max_score is not None:
+        query = query.filter(LeaderboardEntry.score <= max_score)
+    if risk_level:
+        query = query.filter(func.upper(LeaderboardEntry.risk_level) == risk_level.upper())
+    total = query.count()
+    if after is not None:
+        query = query.filter(tuple_(LeaderboardEntry.score, LeaderboardEntry.id) < tuple_(*after))
+    entries = query.order_by(LeaderboardEntry.score.desc(), LeaderboardEntry.id.desc()).limit(limit).all()
+    return entries, total
+
+def get_leaderboard_entry(db: Session, jd_id: int, candidate_id: int) -> Optional[LeaderboardEntry]:
+    return db.query(LeaderboardEntry).filter(
+        LeaderboardEntry.jd_id == jd_id, LeaderboardEntry.candidate_id == candidate_id
+    ).first()
+
 def update_screening_audit(db: Session, candidate_id: int, jd_id: int, agent_type: str, audit_data: dict):
     """
     Updates the audit results for a specific agent type in the ScreeningResult record.
@@ -209,6 +789,7 @@ def update_screening_audit(db: Session, candidate_id: int, jd_id: int, agent_typ
         data["judge_audit"] = audit_data
         result.skeptic_analysis_json = json.dumps(data)
         
+    bump_data_version(db, jd_id)
     db.commit()
     db.refresh(result)
     return result
@@ -289,6 +870,7 @@ def save_rag_metrics(db: Session, candidate_id: int, screening_result_id: int, m
         rag_health_status=metrics.get("rag_health_status", "CRITICAL")
     )
     db.add(db_metrics)
+    bump_data_version(db)
     db.commit()
     db.refresh(db_metrics)
     return db_metrics
@@ -303,6 +885,7 @@ def update_rag_override(db: Session, screening_result_id: int, override_status:
     result = db.query(ScreeningResult).filter(ScreeningResult.id == screening_result_id).first()
     if result:
         result.rag_override = override_status
+        bump_data_version(db, result.jd_id)
         db.commit()
         db.refresh(result)
         return result
@@ -322,10 +905,32 @@ def list_all_rag_retrieval_metrics(db: Session):
     return (
         db.query(RAGRetrievalMetric)
         .join(Candidate, RAGRetrievalMetric.candidate_id == Candidate.id)
+        .options(contains_eager(RAGRetrievalMetric.candidate).joinedload(Candidate.woxsen))
         .order_by(RAGRetrievalMetric.overall_score.desc())
         .all()
     )
 
+def get_latest_rag_retrieval_metrics_map(db: Session, candidate_ids: Optional[List[int]] = None) -> Dict[int, "models.RAGRetrievalMetric"]:
+    """{candidate_id: latest RAGRetrievalMetric} for every candidate (or just `candidate_ids`), in one windowed query."""
+    from .models import RAGRetrievalMetric
+    latest = db.query(
+        RAGRetrievalMetric.id.label("id"),
+        func.row_number().over(
+            partition_by=RAGRetrievalMetric.candidate_id,
+            order_by=(RAGRetrievalMetric.evaluated_at.desc(), RAGRetrievalMetric.id.desc()),
+        ).label("rn"),
+    )
+    if candidate_ids is not None:
+        latest = latest.filter(RAGRetrievalMetric.candidate_id.in_(candidate_ids))
+    latest = latest.subquery()
+    rows = (
+        db.query(RAGRetrievalMetric)
+        .join(latest, latest.c.id == RAGRetrievalMetric.id)
+        .filter(latest.c.rn == 1)
+        .all()
+    )
+    return {m.candidate_id: m for m in rows}
+
 def save_rag_retrieval_metrics(db: Session, candidate_id: int, metrics: dict):
     """Persists deterministic zero-LLM retrieval metrics."""
     from .models import RAGRetrievalMetric
@@ -349,6 +954,7 @@ def save_rag_retrieval_metrics(db: Session, candidate_id: int, metrics: dict):
     )
     
     db.add(db_metrics)
+    bump_data_version(db)
     db.commit()
     db.refresh(db_metrics)
     return db_metrics
@@ -413,6 +1019,7 @@ def save_rag_evaluation_result(db: Session, candidate_id: int, metrics_result):
         override_reason=override_reason,
     )
     db.add(db_result)
+    bump_data_version(db)
     db.commit()
     db.refresh(db_result)
     return db_result
@@ -432,6 +1039,7 @@ def log_rag_override(db: Session, candidate_id: int, override_reason: str) -> Op
         result.override_triggered = True
         result.override_reason = override_reason
         result.gate_decision = "ALLOW"
+        bump_data_version(db)
         db.commit()
         db.refresh(result)
     return result
@@ -472,7 +1080,7 @@ def get_pending_rag_evaluation_jobs(db: Session, limit: int = 1) -> List[RAGEval
     """Retrieves a list of PENDING evaluation jobs for the worker to pick up."""
     return db.query(RAGEvaluationJob).filter(
         RAGEvaluationJob.status == "PENDING"
-    ).limit(limit).all()
+    ).order_by(RAGEvaluationJob.created_at).limit(limit).all()
 
 def update_rag_evaluation_job_status(
     db: Session,
@@ -517,6 +1125,7 @@ def save_rag_llm_metrics(db: Session, candidate_id: int, metrics_data: dict) ->
         explanation=metrics_data.get("explanation", None)
     )
     db.add(db_metric)
+    bump_data_version(db)
     db.commit()
     db.refresh(db_metric)
     return db_metric
@@ -553,7 +1162,7 @@ def create_llm_eval_job(db: Session, candidate_id: int, evaluation_weights: Opti
 
 def get_pending_llm_job(db: Session) -> Optional['RAGLLMEvalJob']:
     from .models import RAGLLMEvalJob
-    return db.query(RAGLLMEvalJob).filter(RAGLLMEvalJob.status == "PENDING").first()
+    return db.query(RAGLLMEvalJob).filter(RAGLLMEvalJob.status == "PENDING").order_by(RAGLLMEvalJob.created_at).first()
 
 def get_llm_eval_job_by_candidate(db: Session, candidate_id: int) -> Optional['RAGLLMEvalJob']:
     from .models import RAGLLMEvalJob
@@ -99,11 +99,13 @@ async def get_token(room_id: str, identity: str):
     
     return {"token": token.to_jwt()}
 
+import json
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.db.models import InterviewSession, ScreeningResult
+from app.db import repository
 
 @router.get("/status")
 async def get_interview_status(room_id: str):
@@ -168,7 +170,7 @@ async def complete_session(session_id: str, request: SessionCompleteRequest, db:
     
     screening = db.query(ScreeningResult).filter(ScreeningResult.candidate_id == session.candidate_id).order_by(ScreeningResult.evaluated_at.desc()).first()
     if screening:
-        screening.interview_status = "INTERVIEW_COMPLETED"
-        
-    db.commit()
+        repository.update_screening_interview_state(db, screening, interview_status="INTERVIEW_COMPLETED")
+    else:
+        db.commit()
     return {"status": "success"}
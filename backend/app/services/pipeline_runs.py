@@ -0,0 +1,264 @@
+"""
+Background execution for long screening requests.
+
+/screen, bulk upload-and-screen and force-evaluate used to hold the HTTP request open for the
+whole pipeline, so a proxy or client timeout killed long bulk runs. They now submit a run:
+the work executes in a small worker pool (one thread and event loop per run), every progress
+callback is appended to the run's persistent event log (pipeline_run_events), and the final
+return value is stored on the run. Clients poll GET /runs/{id}, or follow the event log from
+an offset and resume from the last seq they saw after a reconnect.
+
+Cancelling a run cancels its CancelToken: a queued run never starts, a running one stops at
+the next graph node. The cancel flag is also persisted and re-read whenever the run logs an
+event. Runs still PENDING/RUNNING when the process starts belong to a dead worker and are
+marked FAILED; the pool assumes one API process.
+
+Identical submissions (same dedupe key: JD hash, candidate set hash, mode) are single-flighted:
+while a run with that key is queued or running, submit() returns it flagged attached=True
+instead of starting a second pipeline, and the caller follows the same event log.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from app.db import repository
+from app.db.database import SessionLocal
+from app.db.models import PipelineRun
+from core.cancellation import CancelToken, RunCancelled
+from core.settings import settings
+from core.utils.fast_json import safe_json_load
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RUN_KINDS = ("screening", "bulk_screening", "force_evaluate")
+
+# work(progress, cancel_token) -> result; progress(event, payload) appends to the run's event log
+RunWork = Callable[[Callable[[str, Dict[str, Any]], None], CancelToken], Awaitable[Any]]
+
+
+def describe_run(run: PipelineRun) -> Dict[str, Any]:
+    return {
+        "run_id": run.id,
+        "kind": run.kind,
+        "status": run.status,
+        "params": safe_json_load(run.params_json, {}),
+        "error": run.error_message,
+        "cancel_requested": bool(run.cancel_requested),
+        "events": run.event_count or 0,
+        "created_at": run.created_at,
+        "started_at": run.started_at,
+        "completed_at": run.completed_at,
+    }
+
+
+def summarize_result(result: Any) -> Dict[str, Any]:
+    """Small payload for the "completed" event; the full result is fetched from /runs/{id}/result."""
+    if isinstance(result, dict) and "ranking" in result:
+        ranking = result.get("ranking") or []
+        return {"candidates": len(ranking), "top": ranking[:5]}
+    return {}
+
+
+class PipelineRunner:
+    def __init__(self, max_workers: int = settings.PIPELINE_RUN_WORKERS, poll_interval: float = 0.5, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-run")
+        self._tokens: Dict[int, CancelToken] = {}
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._recovered = False
+        # dedupe key -> run id of the queued/running run holding it, and back
+        self._active_keys: Dict[str, int] = {}
+        self._run_keys: Dict[int, str] = {}
+        self._submit_lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def _recover(self, db):
+        with self._lock:
+            if self._recovered:
+                return
+            self._recovered = True
+        orphaned = repository.fail_orphaned_pipeline_runs(db)
+        if orphaned:
+            logger.warning(f"[RUNS] Marked {orphaned} runs from a previous process as FAILED")
+
+    # ──────────────────────────────────────────────
+    # Submit / execute
+    # ──────────────────────────────────────────────
+
+    def submit(self, kind: str, work: RunWork, params: Optional[Dict[str, Any]] = None, dedupe_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a run, queue `work` on the pool and return the run's description immediately
+        (attached=False), or return the live run already holding `dedupe_key` (attached=True).
+        """
+        if kind not in RUN_KINDS:
+            raise ValueError(f"Unknown run kind: {kind!r}")
+        db = self.session_factory()
+        try:
+            self._recover(db)
+            with self._submit_lock:
+                existing = self._attachable_run(db, dedupe_key)
+                if existing is not None:
+                    self.coalesced += 1
+                    logger.info(f"[RUNS] {kind} request attached to run #{existing.id} ({dedupe_key})")
+                    return {**describe_run(existing), "attached": True}
+
+                run = repository.create_pipeline_run(db, kind, {**(params or {}), "dedupe_key": dedupe_key} if dedupe_key else params)
+                repository.append_pipeline_run_event(db, run.id, "queued", {"kind": kind})
+                token = CancelToken()
+                with self._lock:
+                    self._tokens[run.id] = token
+                    if dedupe_key:
+                        self._active_keys[dedupe_key] = run.id
+                        self._run_keys[run.id] = dedupe_key
+                    self._futures[run.id] = self._executor.submit(self._execute, run.id, work, token)
+                self.executed += 1
+            logger.info(f"[RUNS] Queued {kind} run #{run.id}")
+            db.refresh(run)
+            return {**describe_run(run), "attached": False}
+        finally:
+            db.close()
+
+    def _attachable_run(self, db, dedupe_key: Optional[str]) -> Optional[PipelineRun]:
+        if not dedupe_key:
+            return None
+        with self._lock:
+            run_id = self._active_keys.get(dedupe_key)
+        if run_id is None:
+            return None
+        run = repository.get_pipeline_run(db, run_id)
+        if run is None or run.status in repository.TERMINAL_RUN_STATUSES or run.cancel_requested:
+            return None
+        return run
+
+    def _execute(self, run_id: int, work: RunWork, token: CancelToken):
+        db = self.session_factory()
+
+        def progress(event: str, payload: Optional[Dict[str, Any]] = None):
+            # Own session: progress may be reported from the run's helper threads
+            event_db = self.session_factory()
+            try:
+                repository.append_pipeline_run_event(event_db, run_id, event, payload)
+                run = repository.get_pipeline_run(event_db, run_id)
+                if run is not None and run.cancel_requested:
+                    token.cancel("cancelled by user")
+            finally:
+                event_db.close()
+
+        def finish(status: str, event: str, payload: Dict[str, Any], **values):
+            repository.update_pipeline_run(db, run_id, status=status, commit=False, **values)
+            repository.append_pipeline_run_event(db, run_id, event, payload)
+
+        try:
+            if not repository.update_pipeline_run(db, run_id, status="RUNNING", only_if_status=("PENDING",)):
+                return  # cancelled while queued
+            progress("started")
+            result = asyncio.run(work(progress, token))
+            finish("COMPLETED", "completed", summarize_result(result), result=result)
+            logger.info(f"[RUNS] Run #{run_id} completed")
+        except RunCancelled as e:
+            finish("CANCELLED", "cancelled", {"reason": e.reason, "skipped": token.skipped()}, error_message=e.reason)
+            logger.info(f"[RUNS] Run #{run_id} cancelled ({e.reason}); skipped {token.skipped() or 'nothing'}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[RUNS] Run #{run_id} failed: {e}")
+            finish("FAILED", "failed", {"error": str(e)}, error_message=str(e))
+        finally:
+            with self._lock:
+                self._tokens.pop(run_id, None)
+                self._futures.pop(run_id, None)
+                key = self._run_keys.pop(run_id, None)
+                if key is not None and self._active_keys.get(key) == run_id:
+                    del self._active_keys[key]
+            db.close()
+
+    # ──────────────────────────────────────────────
+    # Queries / control
+    # ──────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._futures)}
+
+    def get(self, run_id: int) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            self._recover(db)
+            run = repository.get_pipeline_run(db, run_id)
+            return describe_run(run) if run else None
+        finally:
+            db.close()
+
+    def result(self, run_id: int) -> Optional[PipelineRun]:
+        db = self.session_factory()
+        try:
+            return repository.get_pipeline_run(db, run_id)
+        finally:
+            db.close()
+
+    def cancel(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Request cancellation; a queued run is cancelled at once, a running one at its next checkpoint."""
+        db = self.session_factory()
+        try:
+            run = repository.get_pipeline_run(db, run_id)
+            if run is None or run.status in repository.TERMINAL_RUN_STATUSES:
+                return describe_run(run) if run else None
+            repository.update_pipeline_run(db, run_id, cancel_requested=True)
+            if repository.update_pipeline_run(db, run_id, status="CANCELLED", error_message="cancelled by user", only_if_status=("PENDING",), commit=False):
+                repository.append_pipeline_run_event(db, run_id, "cancelled", {"reason": "cancelled by user"})
+                logger.info(f"[RUNS] Run #{run_id} cancelled before it started")
+            else:
+                db.rollback()
+            with self._lock:
+                token = self._tokens.get(run_id)
+            if token is not None:
+                token.cancel("cancelled by user")
+            db.expire_all()
+            return describe_run(repository.get_pipeline_run(db, run_id))
+        finally:
+            db.close()
+
+    async def wait(self, run_id: int) -> Optional[PipelineRun]:
+        """Wait for a run submitted by this process to finish; returns the finished run."""
+        with self._lock:
+            future = self._futures.get(run_id)
+        if future is not None:
+            await asyncio.wrap_future(future)
+        return await asyncio.to_thread(self.result, run_id)
+
+    async def events(self, run_id: int, offset: int = 0, follow: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Events with seq >= offset. With follow=True keeps polling the log until the run has
+        finished and every event has been delivered.
+        """
+        while True:
+            batch, finished = await asyncio.to_thread(self._read_events, run_id, offset)
+            for event in batch:
+                offset = event["seq"] + 1
+                yield event
+            if batch:
+                continue
+            if finished or not follow:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def _read_events(self, run_id: int, offset: int):
+        db = self.session_factory()
+        try:
+            # Status first: a run seen as finished has already logged its final event
+            run = repository.get_pipeline_run(db, run_id)
+            finished = run is None or run.status in repository.TERMINAL_RUN_STATUSES
+            events = [
+                {"seq": ev.seq, "event": ev.event, "data": safe_json_load(ev.payload_json, {}), "at": ev.created_at.isoformat() if ev.created_at else None}
+                for ev in repository.list_pipeline_run_events(db, run_id, offset=offset)
+            ]
+            return events, finished
+        finally:
+            db.close()
+
+
+pipeline_runner = PipelineRunner()
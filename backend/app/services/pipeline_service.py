@@ -1,7 +1,8 @@
 import sys
 import os
+import base64
 import asyncio
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime
 
 # Ensure root directory is in path to import existing modules
@@ -17,9 +18,25 @@ from fastapi.responses import StreamingResponse
 from app.db.database import SessionLocal
 from app.db import repository
 from app.db.models import JobDescription, ScreeningResult
+from app.services.result_persister import ResultPersister
+from app.services.stream_ranking import StreamRanking
+from app.services.stream_delta import StreamDeltaEncoder
+from core.utils.fast_json import safe_json_load
+from core.cancellation import CancelToken, RunCancelled
 
 logger = get_logger(__name__)
 
+# Opaque /results cursor: the (score, entry id) of the last leaderboard row on the previous page
+def _encode_results_cursor(entry) -> str:
+    return base64.urlsafe_b64encode(json.dumps([entry.score, entry.id]).encode()).decode()
+
+def _decode_results_cursor(cursor: str):
+    try:
+        score, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(entry_id)
+    except Exception:
+        raise ValueError(f"Invalid results cursor: {cursor!r}")
+
 class PipelineService:
     def __init__(self):
         self.workflow = create_workflow()
@@ -39,9 +56,88 @@ class PipelineService:
             jd = repository.create_job_description(db, jd_text)
         return jd
 
-    async def run_screening(self, force_eval: bool = False, target_candidate_id: Optional[str] = None, evaluation_weights: Optional[Dict[str, float]] = None, candidates: Optional[List[Dict[str, Any]]] = None, skip_llm_eval: bool = False) -> Dict[str, Any]:
+    async def run_key(self, mode: str, candidate_set: Optional[str] = None, evaluation_weights: Optional[Dict[str, float]] = None) -> str:
+        """
+        Single-flight key (JD hash, candidate set hash, mode) for a run against the active JD.
+        candidate_set defaults to the Woxsen cohort; weights change the results, so they are part of the mode.
+        """
+        import hashlib
+        db = SessionLocal()
+        try:
+            active_jd = await self._get_or_create_active_jd(db)
+            if candidate_set:
+                cohort = hashlib.sha256(candidate_set.encode()).hexdigest()
+            else:
+                cohort = repository.woxsen_cohort_fingerprint(db)
+        finally:
+            db.close()
+        if evaluation_weights:
+            mode += ":" + hashlib.sha256(json.dumps(evaluation_weights, sort_keys=True).encode()).hexdigest()[:12]
+        return f"{(active_jd.jd_hash or '')[:16]}:{cohort[:16]}:{mode}"
+
+    def _resolve_roll_number(self, db, candidate_id: str) -> Optional[str]:
+        """Canonical pipeline id (Woxsen roll number) for a GitHub username, email, roll number or DB id."""
+        from app.db.models import WoxsenCandidate
+        cand = repository.get_candidate_by_fuzzy_id(db, candidate_id)
+        if cand:
+            wc = db.query(WoxsenCandidate).filter(WoxsenCandidate.email == cand.email).first()
+        else:
+            wc = repository.get_woxsen_candidate_by_alias(db, candidate_id)
+        return wc.roll_number if wc else None
+
+    def resolve_candidate_key(self, candidate_id: str) -> str:
+        """Candidate-set part of a force-evaluate key: aliases of one candidate share it."""
+        db = SessionLocal()
+        try:
+            return "candidate:" + (self._resolve_roll_number(db, candidate_id) or candidate_id.strip()).lower()
+        finally:
+            db.close()
+
+    def _pipeline_input(self, wc) -> Dict[str, Any]:
+        """Workflow resume dict for a Woxsen candidate (raw_resume_text must be loaded)."""
+        return {
+            "candidate_id": wc.roll_number,
+            "name": wc.name,
+            "email": wc.email,
+            "raw_resume_text": wc.raw_resume_text or "",
+            "links": {
+                "github": wc.github_url or "",
+                "linkedin": wc.linkedin_url or ""
+            }
+        }
+
+    def _run_workflow(self, inputs: Dict[str, Any], progress: Optional[Callable] = None, cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
+        """
+        Run the graph node by node; same final state as workflow.invoke (GraphState has no
+        reducers, so node updates simply overwrite), but a run can report each finished node.
+        `cancel_token` goes into the graph state, so the per-candidate loops of the Stage 1,
+        GitHub and Stage 3 nodes stop at the next candidate; it is also checked between nodes.
+        """
+        inputs = {**inputs, "cancel_token": cancel_token}
+        state = dict(inputs)
+        for update in self.workflow.stream(inputs, stream_mode="updates"):
+            for node, values in update.items():
+                state.update(values or {})
+                if progress:
+                    progress("node_completed", {"node": node})
+            if cancel_token is not None:
+                cancel_token.check("node")
+        return state
+
+    async def run_screening(
+        self,
+        force_eval: bool = False,
+        target_candidate_id: Optional[str] = None,
+        evaluation_weights: Optional[Dict[str, float]] = None,
+        candidates: Optional[List[Dict[str, Any]]] = None,
+        skip_llm_eval: bool = False,
+        progress: Optional[Callable] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Dict[str, Any]:
         """
         Runs the full AI recruitment screening pipeline with smart caching.
+        `progress(event, payload)` is called at each phase (background runs log it); a cancelled
+        `cancel_token` raises RunCancelled at the next candidate or graph node, before anything is saved.
         """
         db = SessionLocal()
         try:
@@ -50,48 +146,24 @@ class PipelineService:
             # Identify candidates (Default to Woxsen candidates from DB if none provided)
             candidates_to_screen = candidates
             if candidates_to_screen is None:
-                db_woxsen = repository.list_woxsen_candidates(db)
-                candidates_to_screen = []
-                for wc in db_woxsen:
-                    candidates_to_screen.append({
-                        "candidate_id": wc.roll_number,
-                        "name": wc.name,
-                        "email": wc.email,
-                        "raw_resume_text": wc.raw_resume_text or "",
-                        "links": {
-                            "github": wc.github_url or "",
-                            "linkedin": wc.linkedin_url or ""
-                        }
-                    })
+                candidates_to_screen = [self._pipeline_input(wc) for wc in repository.list_woxsen_pipeline_inputs(db)]
             
             if not candidates_to_screen:
                 raise ValueError("No candidates found in the woxsen_candidates database, and no external candidates were provided. Aborting screening.")
+            if progress:
+                progress("candidates_loaded", {"total": len(candidates_to_screen)})
             
             all_cached = True
             cached_ranking = []
             cached_evaluations = {}
-            
-            # Helper for robust JSON loading
-            def safe_json_load(val, default=None):
-                if not val or val == '{}' or val == '[]':
-                    return default
-                try:
-                    data = json.loads(val)
-                    return data if data else default
-                except:
-                    return default
 
-            # Check cache for partial updates (e.g force-evaluate 1 candidate)
+            # Check cache for partial updates (e.g force-evaluate 1 candidate): one joined lookup for the cohort
+            cached_rows = repository.get_cached_screening_results(db, candidates_to_screen, active_jd.id)
+            all_cached = len(cached_rows) == len(candidates_to_screen)
             for res in candidates_to_screen:
-                cand = repository.get_candidate_by_fuzzy_id(db, res['candidate_id'])
-                if not cand:
-                    all_cached = False
-                    break
-                    
-                result = repository.get_screening_result(db, cand.id, active_jd.id)
-                if not result:
-                    all_cached = False
-                    break
+                if res['candidate_id'] not in cached_rows:
+                    continue
+                cand, result = cached_rows[res['candidate_id']]
 
                 cached_evaluations[res['candidate_id']] = {
                     "overall_score": int(result.overall_score or 0),
@@ -122,6 +194,8 @@ class PipelineService:
 
             if all_cached and cached_ranking and not force_eval:
                 logger.info("[DB CACHE HIT] Returning results from database.")
+                if progress:
+                    progress("cache_hit", {"cached": len(cached_ranking)})
                 cached_ranking.sort(key=lambda x: x["score"], reverse=True)
                 for idx, item in enumerate(cached_ranking, 1):
                     item["rank"] = idx
@@ -133,30 +207,29 @@ class PipelineService:
 
 
             logger.info(f"[PIPELINE] Invoking AI Recruitment Pipeline (Force Eval: {force_eval})")
+            if progress:
+                progress("pipeline_started", {"cached": len(cached_rows), "force_eval": force_eval})
             # Invoke the pipeline
-            result = self.workflow.invoke({
+            result = self._run_workflow({
                 "message": "Starting 3-Stage Funnel screening...",
                 "force_evaluation": force_eval,
                 "target_candidate_id": target_candidate_id,
                 "job_description": active_jd.jd_text,
                 "resumes": candidates_to_screen,
-            })
+            }, progress=progress, cancel_token=cancel_token)
             
             # Extract and Format results — 3-Stage Funnel
             ranking_results = result.get("ranking_results", [])
-            stage_1_results = result.get("stage_1_results", {})
-            llm_evaluations = result.get("llm_evaluations", {})
-            github_raw_data = result.get("github_raw_data", {})
-            github_features = result.get("github_features", {})
-            github_code_files = result.get("github_code_files", {})
-            interview_readiness = result.get("interview_readiness", {})
-            skeptic_analysis = result.get("skeptic_analysis", {})
             
             # Save candidates and results to DB
             logger.info("[SAVING SCREENING RESULT] Persisting 3-Stage Funnel results to database.")
+            if progress:
+                progress("saving_results", {"total": len(ranking_results)})
 
             formatted_ranking = []
             formatted_evaluations = {}
+            cached_ranking_by_id = {r["candidate_id"]: r for r in cached_ranking}
+            resumes_by_id = {r["candidate_id"]: r for r in candidates_to_screen}
             
             for idx, item in enumerate(ranking_results, 1):
                 cand_id = item["candidate_id"]
@@ -166,145 +239,14 @@ class PipelineService:
                 if force_eval and target_candidate_id and cand_id.lower() != target_candidate_id.lower():
                     if cand_id in cached_evaluations:
                         formatted_evaluations[cand_id] = cached_evaluations[cand_id]
-                        cached_item = next((r for r in cached_ranking if r["candidate_id"] == cand_id), None)
+                        cached_item = cached_ranking_by_id.get(cand_id)
                         if cached_item:
                             formatted_ranking.append(cached_item)
                     continue
 
-                stage_1_data = stage_1_results.get(cand_id, {})
-                eval_data = llm_evaluations.get(cand_id, {})
-                gh_feat = github_features.get(cand_id, {})
-                readiness_data = interview_readiness.get(cand_id, {})
-                skeptic_data = skeptic_analysis.get(cand_id, {})
-                
-                # Stage 1 scores
-                s1_scores = stage_1_data.get("stage_1_scores", {})
-                base_score = s1_scores.get("base_score", 0.0)
-                coverage = s1_scores.get("coverage_score", 0.0)
-                similarity = s1_scores.get("similarity_score", 0.0)
-                
-                # Get resume for metadata
-                resume_obj = next((r for r in candidates_to_screen if r["candidate_id"] == cand_id), {})
-                email = resume_obj.get("email") or f"{cand_id.lower()}@example.com"
-                linkedin_url = resume_obj.get("links", {}).get("linkedin", "")
-                
-                # Create/Get Candidate
-                db_cand = repository.get_candidate_by_email(db, email)
-                if not db_cand:
-                    db_cand = repository.create_candidate(
-                        db, 
-                        name=resume_obj.get("name", cand_id),
-                        email=email,
-                        github_url=resume_obj.get("links", {}).get("github", ""),
-                        linkedin_url=linkedin_url
-                    )
-                else:
-                    db_cand.github_url = resume_obj.get("links", {}).get("github", "")
-                    db_cand.linkedin_url = linkedin_url
-                    db.commit()
-                
-                # Use Stage 3 overall_score if available, otherwise Stage 1 base_score
-                overall_score = eval_data.get("overall_score") if eval_data.get("overall_score") else int(base_score)
-                
-                # Combine hiring justification from Stage 1 and Stage 3
-                justification = eval_data.get("justification", [])
-                if not justification:
-                    justification = stage_1_data.get("hiring_justification", [])
-                
-                # Recommendation from skeptic or readiness data
-                recommendation = "PROCEED WITH CAUTION"
-                if readiness_data and readiness_data.get("readiness_level"):
-                    recommendation = readiness_data.get("readiness_level", "PROCEED WITH CAUTION")
-                
-                res_data = {
-                    "resume_score": eval_data.get("resume_score") or int(coverage),
-                    "github_score": eval_data.get("github_score", 0),
-                    "overall_score": overall_score,
-                    "risk_level": skeptic_data.get("risk_level", "LOW") if skeptic_data else "LOW",
-                    "readiness_level": readiness_data.get("readiness_level", "MEDIUM") if readiness_data else "MEDIUM",
-                    "recommendation": recommendation,
-                    "repo_count": github_raw_data.get(cand_id, {}).get("total_repos", 0),
-                    "ai_projects": len(github_raw_data.get(cand_id, {}).get("ai_relevant_repos", [])),
-                    "skill_gaps": readiness_data.get("skill_gaps", []) if readiness_data else [],
-                    "interview_focus": readiness_data.get("interview_focus", []) if readiness_data else [],
-                    "github_features": gh_feat,
-                    "repos": github_code_files.get(cand_id, {}).get("repos", []),
-                    "interview_readiness": readiness_data if readiness_data else None,
-                    "skeptic_analysis": skeptic_data if skeptic_data else None,
-                    "ai_evidence": eval_data.get("ai_evidence", []),
-                    "justification": justification,
-                    "rank_position": idx,
-                    "retrieval_mode": "flash_single_pass",
-                    "retrieval_version": "v3_funnel",
-                    "rag_enabled": True,
-                    "rag_status": "healthy",
-                    "rag_quality_status": "HEALTHY",
-                    "rag_quality_score": base_score / 100.0,
-                    "rag_override": False,
-                    "judge_audit": eval_data.get("judge_audit", {}),
-                    "rubric_scores": eval_data.get("rubric_scores", {}),
-                    # Stage 1 specific data
-                    "stage_1_coverage": coverage,
-                    "stage_1_similarity": similarity,
-                    "stage_1_base_score": base_score,
-                    "stage_1_justification": stage_1_data.get("stage_1_justification", ""),
-                }
-                
-                # Save to DB
-                saved_res = repository.save_screening_result(db, db_cand.id, active_jd.id, res_data)
-
-                # Save Stage 1 metrics as RAG metrics (for compatibility with existing frontend)
-                stage1_metrics = {
-                    "coverage": coverage / 100.0,
-                    "similarity": similarity / 100.0,
-                    "diversity": 0.0,  # Not applicable in new architecture
-                    "density": 0.0,    # Not applicable in new architecture
-                    "overall_rag_score": base_score / 100.0,
-                    "rag_health_status": "HEALTHY",
-                    "chunk_count": 0,
-                    "jd_coverage_pct": coverage / 100.0,
-                }
-                try:
-                    repository.save_rag_retrieval_metrics(db, db_cand.id, stage1_metrics)
-                except Exception as e:
-                    logger.error(f"Failed to save Stage 1 metrics for {cand_id}: {str(e)}")
-                
-                # Format for API
-                formatted_ranking.append({
-                    "candidate_id": cand_id,
-                    "name": db_cand.name,
-                    "score": overall_score,
-                    "github_url": db_cand.github_url
-                })
-                
-                formatted_evaluations[cand_id] = {
-                    "overall_score": overall_score,
-                    "resume_score": int(eval_data.get("resume_score", 0)) or int(coverage),
-                    "github_score": int(eval_data.get("github_score", 0)),
-                    "repo_count": github_raw_data.get(cand_id, {}).get("total_repos", 0),
-                    "ai_projects": len(github_raw_data.get(cand_id, {}).get("ai_relevant_repos", [])),
-                    "justification": justification,
-                    "repos": github_code_files.get(cand_id, {}).get("repos", []),
-                    "interview_readiness": readiness_data if readiness_data else None,
-                    "skeptic_analysis": skeptic_data if skeptic_data else None,
-                    "final_decision": recommendation,
-                    "hr_decision": {
-                        "decision": saved_res.hr_decision,
-                        "notes": saved_res.hr_notes
-                    },
-                    "ai_evidence": eval_data.get("ai_evidence", []),
-                    "evaluation_blocked": False,
-                    "judge_audit": eval_data.get("judge_audit"),
-                    "rubric_scores": eval_data.get("rubric_scores"),
-                    "interview_status": "PENDING",
-                    "evaluation_locked": False,
-                    "interview_session_id": None,
-                    "rag_override": False,
-                    # Stage 1 data for frontend
-                    "stage_1_scores": s1_scores,
-                    "stage_1_justification": stage_1_data.get("stage_1_justification", ""),
-                    "hiring_justification": stage_1_data.get("hiring_justification", []),
-                }
+                ranking_item, evaluation = self._save_candidate_result(db, active_jd.id, cand_id, resumes_by_id.get(cand_id, {}), result, rank_position=idx)
+                formatted_ranking.append(ranking_item)
+                formatted_evaluations[cand_id] = evaluation
             formatted_ranking.sort(key=lambda x: x["score"], reverse=True)
             for i, rank_item in enumerate(formatted_ranking, 1):
                 rank_item["rank"] = i
@@ -313,13 +255,205 @@ class PipelineService:
                 "ranking": formatted_ranking,
                 "evaluations": formatted_evaluations
             }
+        except RunCancelled:
+            raise
         except Exception as e:
             logger.error(f"Pipeline execution failed: {str(e)}")
             raise e
         finally:
             db.close()
 
-    async def run_bulk_screening(self, file_path: str, evaluation_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    def _save_candidate_result(self, db, jd_id: int, cand_id: str, resume_obj: Dict[str, Any], state: Dict[str, Any], rank_position: Optional[int] = None):
+        """
+        Persist one candidate's result from a finished workflow state (result row, leaderboard
+        entry, Stage 1 metrics) and return its (ranking item, evaluation) for the API.
+        """
+        stage_1_data = state.get("stage_1_results", {}).get(cand_id, {})
+        eval_data = state.get("llm_evaluations", {}).get(cand_id, {})
+        gh_feat = state.get("github_features", {}).get(cand_id, {})
+        readiness_data = state.get("interview_readiness", {}).get(cand_id, {})
+        skeptic_data = state.get("skeptic_analysis", {}).get(cand_id, {})
+        github_raw_data = state.get("github_raw_data", {})
+        github_code_files = state.get("github_code_files", {})
+        
+        # Stage 1 scores
+        s1_scores = stage_1_data.get("stage_1_scores", {})
+        base_score = s1_scores.get("base_score", 0.0)
+        coverage = s1_scores.get("coverage_score", 0.0)
+        similarity = s1_scores.get("similarity_score", 0.0)
+        
+        # Resume for metadata
+        email = resume_obj.get("email") or f"{cand_id.lower()}@example.com"
+        linkedin_url = resume_obj.get("links", {}).get("linkedin", "")
+        
+        # Create/Get Candidate
+        db_cand = repository.get_candidate_by_email(db, email)
+        if not db_cand:
+            db_cand = repository.create_candidate(
+                db, 
+                name=resume_obj.get("name", cand_id),
+                email=email,
+                github_url=resume_obj.get("links", {}).get("github", ""),
+                linkedin_url=linkedin_url
+            )
+        else:
+            repository.update_candidate_links(db, db_cand, resume_obj.get("links", {}).get("github", ""), linkedin_url)
+        
+        # Use Stage 3 overall_score if available, otherwise Stage 1 base_score
+        overall_score = eval_data.get("overall_score") if eval_data.get("overall_score") else int(base_score)
+        
+        # Combine hiring justification from Stage 1 and Stage 3
+        justification = eval_data.get("justification", [])
+        if not justification:
+            justification = stage_1_data.get("hiring_justification", [])
+        
+        # Recommendation from skeptic or readiness data
+        recommendation = "PROCEED WITH CAUTION"
+        if readiness_data and readiness_data.get("readiness_level"):
+            recommendation = readiness_data.get("readiness_level", "PROCEED WITH CAUTION")
+        
+        res_data = {
+            "resume_score": eval_data.get("resume_score") or int(coverage),
+            "github_score": eval_data.get("github_score", 0),
+            "overall_score": overall_score,
+            "risk_level": skeptic_data.get("risk_level", "LOW") if skeptic_data else "LOW",
+            "readiness_level": readiness_data.get("readiness_level", "MEDIUM") if readiness_data else "MEDIUM",
+            "recommendation": recommendation,
+            "repo_count": github_raw_data.get(cand_id, {}).get("total_repos", 0),
+            "ai_projects": len(github_raw_data.get(cand_id, {}).get("ai_relevant_repos", [])),
+            "skill_gaps": readiness_data.get("skill_gaps", []) if readiness_data else [],
+            "interview_focus": readiness_data.get("interview_focus", []) if readiness_data else [],
+            "github_features": gh_feat,
+            "repos": github_code_files.get(cand_id, {}).get("repos", []),
+            "interview_readiness": readiness_data if readiness_data else None,
+            "skeptic_analysis": skeptic_data if skeptic_data else None,
+            "ai_evidence": eval_data.get("ai_evidence", []),
+            "justification": justification,
+            "rank_position": rank_position,
+            "retrieval_mode": "flash_single_pass",
+            "retrieval_version": "v3_funnel",
+            "rag_enabled": True,
+            "rag_status": "healthy",
+            "rag_quality_status": "HEALTHY",
+            "rag_quality_score": base_score / 100.0,
+            "rag_override": False,
+            "judge_audit": eval_data.get("judge_audit", {}),
+            "rubric_scores": eval_data.get("rubric_scores", {}),
+            # Stage 1 specific data
+            "stage_1_coverage": coverage,
+            "stage_1_similarity": similarity,
+            "stage_1_base_score": base_score,
+            "stage_1_justification": stage_1_data.get("stage_1_justification", ""),
+        }
+        
+        # Save to DB
+        saved_res = repository.save_screening_result(db, db_cand.id, jd_id, res_data)
+
+        # Save Stage 1 metrics as RAG metrics (for compatibility with existing frontend)
+        stage1_metrics = {
+            "coverage": coverage / 100.0,
+            "similarity": similarity / 100.0,
+            "diversity": 0.0,  # Not applicable in new architecture
+            "density": 0.0,    # Not applicable in new architecture
+            "overall_rag_score": base_score / 100.0,
+            "rag_health_status": "HEALTHY",
+            "chunk_count": 0,
+            "jd_coverage_pct": coverage / 100.0,
+        }
+        try:
+            repository.save_rag_retrieval_metrics(db, db_cand.id, stage1_metrics)
+        except Exception as e:
+            logger.error(f"Failed to save Stage 1 metrics for {cand_id}: {str(e)}")
+        
+        # Format for API
+        ranking_item = {
+            "candidate_id": cand_id,
+            "name": db_cand.name,
+            "score": overall_score,
+            "github_url": db_cand.github_url
+        }
+        
+        evaluation = {
+            "overall_score": overall_score,
+            "resume_score": int(eval_data.get("resume_score", 0)) or int(coverage),
+            "github_score": int(eval_data.get("github_score", 0)),
+            "repo_count": github_raw_data.get(cand_id, {}).get("total_repos", 0),
+            "ai_projects": len(github_raw_data.get(cand_id, {}).get("ai_relevant_repos", [])),
+            "justification": justification,
+            "repos": github_code_files.get(cand_id, {}).get("repos", []),
+            "interview_readiness": readiness_data if readiness_data else None,
+            "skeptic_analysis": skeptic_data if skeptic_data else None,
+            "final_decision": recommendation,
+            "hr_decision": {
+                "decision": saved_res.hr_decision,
+                "notes": saved_res.hr_notes
+            },
+            "ai_evidence": eval_data.get("ai_evidence", []),
+            "evaluation_blocked": False,
+            "judge_audit": eval_data.get("judge_audit"),
+            "rubric_scores": eval_data.get("rubric_scores"),
+            "interview_status": "PENDING",
+            "evaluation_locked": False,
+            "interview_session_id": None,
+            "rag_override": False,
+            # Stage 1 data for frontend
+            "stage_1_scores": s1_scores,
+            "stage_1_justification": stage_1_data.get("stage_1_justification", ""),
+            "hiring_justification": stage_1_data.get("hiring_justification", []),
+        }
+        return ranking_item, evaluation
+
+    async def evaluate_candidate(self, roll_number: str, progress: Optional[Callable] = None, cancel_token: Optional[CancelToken] = None) -> Optional[Dict[str, Any]]:
+        """
+        Single-candidate pipeline run (force-evaluate / re-evaluate). Loads only that Woxsen
+        candidate, runs the graph with just their resume (every stage then handles one
+        candidate) and upserts only their result and leaderboard entry, so the cost is that
+        candidate's LLM/GitHub calls whatever the cohort size. Returns None when `roll_number`
+        is not a Woxsen candidate.
+        """
+        db = SessionLocal()
+        try:
+            wc = repository.get_woxsen_candidate_by_alias(db, roll_number, include_resume=True)
+            if wc is None:
+                return None
+            active_jd = await self._get_or_create_active_jd(db)
+            resume = self._pipeline_input(wc)
+            cand_id = resume["candidate_id"]
+
+            logger.info(f"[PIPELINE] Single-candidate evaluation for {cand_id}")
+            if progress:
+                progress("pipeline_started", {"candidate_id": cand_id, "force_eval": True})
+            result = self._run_workflow({
+                "message": f"Evaluating {cand_id}...",
+                "force_evaluation": True,
+                "target_candidate_id": cand_id,
+                "job_description": active_jd.jd_text,
+                "resumes": [resume],
+            }, progress=progress, cancel_token=cancel_token)
+
+            if progress:
+                progress("saving_results", {"total": 1})
+            ranking_item, evaluation = self._save_candidate_result(db, active_jd.id, cand_id, resume, result)
+
+            # Position in the cohort comes from the leaderboard the upsert just re-ranked
+            db_cand = repository.get_candidate_by_email(db, resume["email"]) if resume["email"] else None
+            entry = repository.get_leaderboard_entry(db, active_jd.id, db_cand.id) if db_cand else None
+            if entry is not None:
+                ranking_item["rank"] = entry.rank
+                repository.bulk_upsert_screening_results(db, active_jd.id, [(db_cand.id, {"rank_position": entry.rank})], partial=True)
+            return {
+                "ranking": [ranking_item],
+                "evaluations": {cand_id: evaluation}
+            }
+        except RunCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Single-candidate evaluation failed for {roll_number}: {str(e)}")
+            raise e
+        finally:
+            db.close()
+
+    async def run_bulk_screening(self, file_path: str, evaluation_weights: Optional[Dict[str, float]] = None, progress: Optional[Callable] = None, cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
         """
         Ingests candidates from a file and runs screening for them.
         """
@@ -327,9 +461,9 @@ class PipelineService:
         logger.info(f"[PIPELINE] Bulk screening triggered for file: {file_path}")
         
         candidates = data_ingestion_service.parse_file(file_path)
-        return await self.run_screening(candidates=candidates, evaluation_weights=evaluation_weights)
+        return await self.run_screening(candidates=candidates, evaluation_weights=evaluation_weights, progress=progress, cancel_token=cancel_token)
 
-    async def force_evaluate(self, candidate_id: str, evaluation_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    async def force_evaluate(self, candidate_id: str, evaluation_weights: Optional[Dict[str, float]] = None, progress: Optional[Callable] = None, cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
         """
         Force-run the pipeline by bypassing RAG quality gate.
         Resolves candidate_id (GitHub username, roll number, or DB ID) to the canonical
@@ -338,13 +472,9 @@ class PipelineService:
         logger.info(f"[API] Force evaluating candidate: {candidate_id}")
         db = SessionLocal()
         try:
-            # Resolve any fuzzy ID (GitHub username, email, etc.) → canonical roll number
-            cand = repository.get_candidate_by_fuzzy_id(db, candidate_id)
-            if cand:
-                # Get associated WoxsenCandidate to find roll_number (used as cand_id in ranking)
-                from app.db.models import WoxsenCandidate
-                wc = db.query(WoxsenCandidate).filter(WoxsenCandidate.email == cand.email).first()
-                resolved_id = wc.roll_number if wc else candidate_id
+            # Resolve any fuzzy ID (GitHub username, email, etc.) → canonical roll number (used as cand_id in ranking)
+            resolved_id = self._resolve_roll_number(db, candidate_id)
+            if resolved_id:
                 logger.info(f"[FORCE EVAL] Resolved '{candidate_id}' → '{resolved_id}'")
             else:
                 resolved_id = candidate_id
@@ -352,7 +482,12 @@ class PipelineService:
         finally:
             db.close()
 
-        return await self.run_screening(force_eval=True, target_candidate_id=resolved_id, evaluation_weights=evaluation_weights)
+        if progress:
+            progress("candidate_resolved", {"candidate_id": resolved_id})
+        results = await self.evaluate_candidate(resolved_id, progress=progress, cancel_token=cancel_token)
+        if results is not None:
+            return results
+        return await self.run_screening(force_eval=True, target_candidate_id=resolved_id, evaluation_weights=evaluation_weights, progress=progress, cancel_token=cancel_token)
 
     async def toggle_rag_override(self, candidate_id: str, override: bool) -> Dict[str, Any]:
         """
@@ -466,10 +601,84 @@ class PipelineService:
         finally:
             db.close()
 
+    async def get_github_cache_status(self) -> Dict[str, Any]:
+        """
+        Returns per-candidate freshness of the persistent GitHub cache warmed by the prefetcher.
+        """
+        from core.github_cache import github_cache
+        from core.stage2_github_agent import extract_github_username
+
+        db = SessionLocal()
+        try:
+            woxsen = [wc for wc in repository.list_woxsen_candidates(db) if wc.github_url]
+        finally:
+            db.close()
+
+        usernames = {wc.roll_number: extract_github_username(wc.github_url) for wc in woxsen}
+        freshness = await asyncio.to_thread(github_cache.freshness, [u for u in usernames.values() if u])
+
+        candidates = []
+        counts = {"fresh": 0, "stale": 0, "missing": 0}
+        for wc in woxsen:
+            username = usernames.get(wc.roll_number)
+            kinds = freshness.get(username.lower(), {}) if username else {}
+            repos = kinds.get("repos")
+            if not repos:
+                status = "missing"
+            elif repos["newest_age_s"] <= settings.GITHUB_CACHE_REPOS_TTL and "file" in kinds:
+                status = "fresh"
+            else:
+                status = "stale"
+            counts[status] += 1
+            candidates.append({
+                "candidate_id": wc.roll_number,
+                "name": wc.name,
+                "github_username": username,
+                "status": status,
+                "repos_age_s": repos["newest_age_s"] if repos else None,
+                "trees_cached": kinds.get("tree", {}).get("entries", 0),
+                "files_cached": kinds.get("file", {}).get("entries", 0),
+                "oldest_entry_age_s": max((k["oldest_age_s"] for k in kinds.values()), default=None),
+            })
+
+        return {"summary": counts, "candidates": candidates}
+
+
+    async def get_ranking(self, sort: str = "rank", descending: bool = False, stage: Optional[str] = None, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        One page of the active JD's ranking from the materialized leaderboard (no result rows loaded).
+        """
+        db = SessionLocal()
+        try:
+            active_jd = await self._get_or_create_active_jd(db)
+            entries, total = repository.get_leaderboard_page(
+                db, active_jd.id, sort=sort, descending=descending, stage=stage, offset=offset, limit=limit
+            )
+            return {
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "ranking": [
+                    {
+                        "rank": e.rank,
+                        "candidate_id": e.display_id,
+                        "name": e.name,
+                        "score": e.score,
+                        "stage": e.stage,
+                        "github_url": e.github_url,
+                        "risk_level": e.risk_level,
+                        "recommendation": e.recommendation,
+                        "hr_decision": e.hr_decision,
+                    }
+                    for e in entries
+                ],
+            }
+        finally:
+            db.close()
 
     async def re_evaluate(self, candidate_id: str) -> Dict[str, Any]:
         """
-        Deletes existing result and re-runs the pipeline.
+        Deletes existing result and re-runs the pipeline for that candidate only.
         """
         db = SessionLocal()
         try:
@@ -478,11 +687,15 @@ class PipelineService:
             
             if target_cand:
                 repository.delete_screening_result(db, target_cand.id, active_jd.id)
-            
-            return await self.run_screening()
+            roll_number = self._resolve_roll_number(db, candidate_id)
         finally:
             db.close()
 
+        results = await self.evaluate_candidate(roll_number) if roll_number else None
+        if results is not None:
+            return results
+        return await self.run_screening()
+
     async def get_stored_results(self) -> Dict[str, Any]:
         """
         Fetches existing results from DB. Returns empty data if nothing found.
@@ -490,17 +703,20 @@ class PipelineService:
         db = SessionLocal()
         try:
             active_jd = await self._get_or_create_active_jd(db)
-            stage2_results = repository.list_screening_results(db, active_jd.id)
+            # Three queries regardless of cohort size: results (+candidate, +woxsen), latest metrics, Stage 1 metrics
+            stage2_results = repository.list_screening_results_with_candidates(db, active_jd.id)
+            metrics_by_candidate = repository.get_latest_rag_retrieval_metrics_map(db)
+            all_stage1 = repository.list_all_rag_retrieval_metrics(db)
 
-            # Helper for robust JSON loading
-            def safe_json_load(val, default=None):
-                if not val or val == '{}' or val == '[]':
-                    return default
-                try:
-                    data = json.loads(val)
-                    return data if data else default
-                except:
-                    return default
+            # Candidates created before the woxsen link existed: resolve them by email in one query
+            unlinked = [r.candidate.email for r in stage2_results if r.candidate.woxsen is None]
+            unlinked += [m.candidate.email for m in all_stage1 if m.candidate.woxsen is None]
+            woxsen_by_email = repository.get_woxsen_candidates_by_email(db, unlinked, include_resume=True) if unlinked else {}
+
+            def resolve_woxsen(cand):
+                wc = cand.woxsen or woxsen_by_email.get((cand.email or "").lower())
+                cand_id = wc.roll_number if wc else cand.email.split('@')[0].upper()
+                return cand_id, wc
 
             formatted_ranking = []
             formatted_evaluations = {}
@@ -510,22 +726,9 @@ class PipelineService:
             sorted_stage2 = sorted(stage2_results, key=lambda x: (x.overall_score or 0.0, -(x.rank_position or 9999)), reverse=True)
             for idx, res in enumerate(sorted_stage2, 1):
                 cand = res.candidate
-                from app.db.models import WoxsenCandidate
-                wc = db.query(WoxsenCandidate).filter(WoxsenCandidate.email == cand.email).first()
-                cand_id = wc.roll_number if wc else cand.email.split('@')[0].upper()
+                cand_id, wc = resolve_woxsen(cand)
                 stage2_candidate_ids.add(cand.id)
 
-                metric_rec = repository.get_rag_retrieval_metrics(db, cand.id)
-                metrics = {}
-                if metric_rec:
-                    metrics = {
-                        "coverage": metric_rec.coverage,
-                        "similarity": metric_rec.similarity,
-                        "diversity": metric_rec.diversity,
-                        "density": metric_rec.density,
-                        "overall_score": metric_rec.overall_score
-                    }
-
                 formatted_ranking.append({
                     "rank": idx,
                     "candidate_id": cand_id,
@@ -534,58 +737,15 @@ class PipelineService:
                     "github_url": cand.github_url
                 })
 
-                formatted_evaluations[cand_id] = {
-                    "overall_score": int(res.overall_score or 0),
-                    "resume_score": int(res.resume_score or 0),
-                    "github_score": int(res.github_score or 0),
-                    "precision_score": int(metrics.get("precision_score", 0)),
-                    "recall_score": int(metrics.get("recall_score", 0)),
-                    "repo_count": getattr(res, 'repo_count', 0) or 0,
-                    "ai_projects": getattr(res, 'ai_projects', 0) or 0,
-                    "justification": safe_json_load(getattr(res, 'justification_json', None), [res.recommendation] if res.recommendation else []),
-                    "repos": safe_json_load(getattr(res, 'repos_json', None), []),
-                    "interview_readiness": safe_json_load(getattr(res, 'interview_readiness_json', None)),
-                    "skeptic_analysis": safe_json_load(getattr(res, 'skeptic_analysis_json', None)),
-                    "final_decision": res.recommendation,
-                    "final_synthesized_decision": safe_json_load(getattr(res, 'final_synthesized_decision_json', None)),
-                    "hr_decision": {
-                        "decision": res.hr_decision,
-                        "notes": res.hr_notes,
-                        "status": "COMPLETED" if res.hr_decision else "PENDING"
-                    },
-                    "ai_evidence": safe_json_load(getattr(res, 'ai_evidence_json', None), []),
-                    "code_evidence": safe_json_load(getattr(res, 'ai_evidence_json', None), []),
-                    "judge_audit": safe_json_load(getattr(res, 'judge_audit_json', None)),
-                    "rubric_scores": safe_json_load(getattr(res, 'rubric_scores_json', None)),
-                    "rag_quality": {
-                        "status": getattr(res, 'rag_status', 'CRITICAL') or 'CRITICAL',
-                        "score": metrics.get("overall_score", 0.0),
-                        "metrics": metrics
-                    },
-                    "evaluation_blocked": (getattr(res, 'rag_status', 'CRITICAL') != "healthy") and not getattr(res, 'rag_override', False),
-                    "raw_resume_text": wc.raw_resume_text if wc else "",
-                    "github_features": safe_json_load(getattr(res, 'github_features_json', None), {}),
-                    "stage": "stage2"
-                }
-
-                # Extract parsed GitHub rubric fields for direct frontend access
-                gh_features = formatted_evaluations[cand_id].get("github_features") or {}
-                if isinstance(gh_features, dict) and gh_features.get("rubric_scores"):
-                    formatted_evaluations[cand_id]["github_rubric"] = gh_features.get("rubric_scores", {})
-                    formatted_evaluations[cand_id]["github_strengths"] = gh_features.get("strengths", [])
-                    formatted_evaluations[cand_id]["github_weaknesses"] = gh_features.get("weaknesses", [])
-                    formatted_evaluations[cand_id]["github_justification"] = gh_features.get("github_justification", "")
+                formatted_evaluations[cand_id] = self._format_evaluation(res, wc, metrics_by_candidate.get(cand.id))
 
             # --- Phase 2: Append Stage 1-only candidates (not shortlisted for Stage 2) ---
-            all_stage1 = repository.list_all_rag_retrieval_metrics(db)
             stage1_only = [m for m in all_stage1 if m.candidate_id not in stage2_candidate_ids]
 
             stage2_count = len(formatted_ranking)
             for idx, m in enumerate(stage1_only, stage2_count + 1):
                 cand = m.candidate
-                from app.db.models import WoxsenCandidate
-                wc = db.query(WoxsenCandidate).filter(WoxsenCandidate.email == cand.email).first()
-                cand_id = wc.roll_number if wc else cand.email.split('@')[0].upper()
+                cand_id, _ = resolve_woxsen(cand)
 
 
                 metrics = {
@@ -638,10 +798,273 @@ class PipelineService:
         finally:
             db.close()
 
-    async def run_screening_stream(self, evaluation_weights: Optional[Dict[str, float]] = None):
+    async def get_data_version(self) -> str:
+        """
+        Version token for everything the read endpoints serve: active JD id, its data version and
+        the candidate-level version. Changes whenever a write commits or the active JD changes.
+        """
+        db = SessionLocal()
+        try:
+            active_jd = await self._get_or_create_active_jd(db)
+            jd_version, global_version = repository.get_data_versions(db, active_jd.id)
+            return f"{active_jd.id}.{jd_version}.{global_version}"
+        finally:
+            db.close()
+
+    async def get_results_page(
+        self,
+        fields: str = "summary",
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        stage: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        risk_level: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of results in ranking order. Paging and filters run against the materialized
+        leaderboard; only the page's result rows are loaded, and only the summary columns unless
+        fields="detail". Raises ValueError for a malformed cursor.
+        """
+        detail = fields == "detail"
+        after = _decode_results_cursor(cursor) if cursor else None
+        db = SessionLocal()
+        try:
+            active_jd = await self._get_or_create_active_jd(db)
+            entries, total = repository.get_leaderboard_slice(
+                db, active_jd.id, after=after, limit=limit + 1, stage=stage,
+                min_score=min_score, max_score=max_score, risk_level=risk_level,
+            )
+            has_more = len(entries) > limit
+            entries = entries[:limit]
+
+            candidate_ids = [e.candidate_id for e in entries]
+            results = repository.get_screening_results_for_candidates(db, active_jd.id, candidate_ids, detail=detail)
+            metrics_by_candidate = {}
+            woxsen_by_email = {}
+            if detail:
+                metrics_by_candidate = repository.get_latest_rag_retrieval_metrics_map(db, candidate_ids=candidate_ids)
+                unlinked = [r.candidate.email for r in results.values() if r.candidate.woxsen is None]
+                woxsen_by_email = repository.get_woxsen_candidates_by_email(db, unlinked, include_resume=True) if unlinked else {}
+
+            ranking = []
+            evaluations = {}
+            for entry in entries:
+                res = results.get(entry.candidate_id)
+                if res is None:
+                    continue
+                ranking.append({
+                    "rank": entry.rank,
+                    "candidate_id": entry.display_id,
+                    "name": entry.name,
+                    "score": entry.score,
+                    "github_url": entry.github_url,
+                    "stage": entry.stage,
+                })
+                if detail:
+                    wc = res.candidate.woxsen or woxsen_by_email.get((res.candidate.email or "").lower())
+                    evaluation = self._format_evaluation(res, wc, metrics_by_candidate.get(entry.candidate_id))
+                    evaluation.pop("code_evidence")  # same list as ai_evidence; only the legacy shape repeats it
+                else:
+                    evaluation = self._summarize_evaluation(res)
+                evaluation["stage"] = entry.stage
+                evaluation["risk_level"] = entry.risk_level
+                evaluations[entry.display_id] = evaluation
+
+            return {
+                "ranking": ranking,
+                "evaluations": evaluations,
+                "total": total,
+                "next_cursor": _encode_results_cursor(entries[-1]) if has_more else None,
+            }
+        finally:
+            db.close()
+
+    async def get_candidate_result(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Full evaluation (evidence, analysis, resume text) for one candidate of the active JD,
+        for lazy loading behind the summary list. None when the candidate has no result.
+        """
+        db = SessionLocal()
+        try:
+            active_jd = await self._get_or_create_active_jd(db)
+            cand = repository.get_candidate_by_fuzzy_id(db, candidate_id)
+            if not cand:
+                return None
+            res = repository.get_screening_results_for_candidates(db, active_jd.id, [cand.id], detail=True).get(cand.id)
+            if res is None:
+                return None
+            wc = cand.woxsen or repository.get_woxsen_candidates_by_email(db, [cand.email], include_resume=True).get((cand.email or "").lower())
+            metric_rec = repository.get_rag_retrieval_metrics(db, cand.id)
+            entry = repository.get_leaderboard_entry(db, active_jd.id, cand.id)
+
+            evaluation = self._format_evaluation(res, wc, metric_rec)
+            evaluation.pop("code_evidence")
+            if entry:
+                evaluation["stage"] = entry.stage
+            evaluation["risk_level"] = res.risk_level
+            return {
+                "candidate_id": entry.display_id if entry else (wc.roll_number if wc else cand.email.split('@')[0].upper()),
+                "name": cand.name,
+                "rank": entry.rank if entry else None,
+                "evaluation": evaluation,
+            }
+        finally:
+            db.close()
+
+    def _summarize_evaluation(self, res: ScreeningResult) -> Dict[str, Any]:
+        """Card-level fields of an evaluation; evidence and analysis come from the detail endpoint."""
+        return {
+            "overall_score": int(res.overall_score or 0),
+            "resume_score": int(res.resume_score or 0),
+            "github_score": int(res.github_score or 0),
+            "repo_count": res.repo_count or 0,
+            "ai_projects": res.ai_projects or 0,
+            "justification": safe_json_load(res.justification_json, [res.recommendation] if res.recommendation else []),
+            "final_decision": res.recommendation,
+            "hr_decision": {
+                "decision": res.hr_decision,
+                "notes": res.hr_notes,
+                "status": "COMPLETED" if res.hr_decision else "PENDING"
+            },
+            "rag_quality": {"status": res.rag_status or 'CRITICAL'},
+            "rag_override": bool(res.rag_override),
+            "evaluation_blocked": (res.rag_status != "healthy") and not res.rag_override,
+        }
+
+    def _format_evaluation(self, res: ScreeningResult, wc: Any, metric_rec: Any) -> Dict[str, Any]:
+        """Full evaluation payload for one screening result (`wc` = its WoxsenCandidate, `metric_rec` = latest retrieval metrics)."""
+        metrics = {}
+        if metric_rec:
+            metrics = {
+                "coverage": metric_rec.coverage,
+                "similarity": metric_rec.similarity,
+                "diversity": metric_rec.diversity,
+                "density": metric_rec.density,
+                "overall_score": metric_rec.overall_score
+            }
+
+        evaluation = {
+            "overall_score": int(res.overall_score or 0),
+            "resume_score": int(res.resume_score or 0),
+            "github_score": int(res.github_score or 0),
+            "precision_score": int(metrics.get("precision_score", 0)),
+            "recall_score": int(metrics.get("recall_score", 0)),
+            "repo_count": getattr(res, 'repo_count', 0) or 0,
+            "ai_projects": getattr(res, 'ai_projects', 0) or 0,
+            "justification": safe_json_load(getattr(res, 'justification_json', None), [res.recommendation] if res.recommendation else []),
+            "repos": safe_json_load(getattr(res, 'repos_json', None), []),
+            "interview_readiness": safe_json_load(getattr(res, 'interview_readiness_json', None)),
+            "skeptic_analysis": safe_json_load(getattr(res, 'skeptic_analysis_json', None)),
+            "final_decision": res.recommendation,
+            "final_synthesized_decision": safe_json_load(getattr(res, 'final_synthesized_decision_json', None)),
+            "hr_decision": {
+                "decision": res.hr_decision,
+                "notes": res.hr_notes,
+                "status": "COMPLETED" if res.hr_decision else "PENDING"
+            },
+            "ai_evidence": safe_json_load(getattr(res, 'ai_evidence_json', None), []),
+            "code_evidence": safe_json_load(getattr(res, 'ai_evidence_json', None), []),
+            "judge_audit": safe_json_load(getattr(res, 'judge_audit_json', None)),
+            "rubric_scores": safe_json_load(getattr(res, 'rubric_scores_json', None)),
+            "rag_quality": {
+                "status": getattr(res, 'rag_status', 'CRITICAL') or 'CRITICAL',
+                "score": metrics.get("overall_score", 0.0),
+                "metrics": metrics
+            },
+            "evaluation_blocked": (getattr(res, 'rag_status', 'CRITICAL') != "healthy") and not getattr(res, 'rag_override', False),
+            "raw_resume_text": wc.raw_resume_text if wc else "",
+            "github_features": safe_json_load(getattr(res, 'github_features_json', None), {}),
+            "stage": "stage2"
+        }
+
+        # Extract parsed GitHub rubric fields for direct frontend access
+        gh_features = evaluation.get("github_features") or {}
+        if isinstance(gh_features, dict) and gh_features.get("rubric_scores"):
+            evaluation["github_rubric"] = gh_features.get("rubric_scores", {})
+            evaluation["github_strengths"] = gh_features.get("strengths", [])
+            evaluation["github_weaknesses"] = gh_features.get("weaknesses", [])
+            evaluation["github_justification"] = gh_features.get("github_justification", "")
+        return evaluation
+
+    def _stage1_result_data(self, s1: Dict[str, Any]) -> Dict[str, Any]:
+        """ScreeningResult columns for a Stage 1 score (rank_position is filled in once the cohort is ranked)."""
+        s1_scores = s1.get("stage_1_scores", {})
+        return {
+            "resume_score": int(s1_scores.get("coverage_score", 0)),
+            "github_score": 0,
+            "overall_score": int(s1_scores.get("base_score", 0)),
+            "risk_level": "PENDING",
+            "readiness_level": "PENDING",
+            "recommendation": "STAGE 1 SCORED",
+            "repo_count": 0,
+            "ai_projects": 0,
+            "skill_gaps": [],
+            "interview_focus": [],
+            "github_features": {},
+            "repos": [],
+            "interview_readiness": None,
+            "skeptic_analysis": None,
+            "ai_evidence": [],
+            "justification": s1.get("hiring_justification", []),
+            "rank_position": None,
+            "retrieval_mode": "flash_single_pass",
+            "retrieval_version": "v3_funnel",
+            "rag_enabled": True,
+            "rag_status": "healthy",
+            "rag_quality_status": "HEALTHY",
+            "rag_quality_score": s1_scores.get("base_score", 0) / 100.0,
+            "rag_override": False,
+            "judge_audit": {},
+            "rubric_scores": {},
+            "stage_1_coverage": s1_scores.get("coverage_score", 0),
+            "stage_1_similarity": s1_scores.get("similarity_score", 0),
+            "stage_1_base_score": s1_scores.get("base_score", 0),
+            "stage_1_justification": s1.get("stage_1_justification", ""),
+        }
+
+    def _stage1_result_from_row(self, res: ScreeningResult) -> Dict[str, Any]:
+        """Scorer-shaped Stage 1 result rebuilt from a stored row (resumed runs don't re-score)."""
+        return {
+            "stage_1_scores": {
+                "coverage_score": int(res.resume_score or 0),
+                "similarity_score": 0,
+                "base_score": int(res.overall_score or 0),
+            },
+            "stage_1_justification": "Scored by an earlier, interrupted run",
+            "hiring_justification": safe_json_load(res.justification_json, []),
+        }
+
+    def _close_checkpoint(self, db, checkpoint_id: int, stage: str, completed_ids: set, total: int, token: CancelToken):
+        """
+        Record where an unfinished run stopped and log what stopping saved.
+        Blocking: the streams call it from a worker thread while winding down.
+        """
+        status = "CANCELLED" if token.cancelled else "FAILED"
+        try:
+            repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(completed_ids), status=status, cancel_reason=token.reason)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[CANCEL] Could not save {stage} checkpoint {checkpoint_id}: {e}")
+            return
+        skipped = token.skipped()
+        logger.info(
+            f"[CANCEL] {stage} run {status.lower()} ({token.reason or 'error'}): {len(completed_ids)}/{total} candidates "
+            f"checkpointed (#{checkpoint_id}), {total - len(completed_ids)} left for the next run, in-flight calls skipped: {skipped or 'none'}"
+        )
+
+    async def run_screening_stream(
+        self,
+        evaluation_weights: Optional[Dict[str, float]] = None,
+        stream_format: str = "delta",
+        cancel_token: Optional[CancelToken] = None,
+        resume: bool = True,
+    ):
         """
         Real-time streaming pipeline with batch-of-5 processing.
         Yields incremental NDJSON results as each batch completes.
+        Cancelling `cancel_token` stops the run at the next batch (the scorer skips calls not yet
+        started); scored candidates are checkpointed and, with resume=True, not re-scored next run.
         """
         import json
         from core.stage1_flash_scorer import Stage1FlashScorer
@@ -650,14 +1073,21 @@ class PipelineService:
 
         BATCH_SIZE = 5
         FUNNEL_THRESHOLD = 60
+        CHECKPOINT_EVERY = 10  # batches
 
+        token = cancel_token or CancelToken()
         db = SessionLocal()
+        persister = None
+        checkpoint_id = None
+        completed_ids = set()
+        checkpointed = set()
+        finished = False
         try:
             active_jd = await self._get_or_create_active_jd(db)
             jd_text = active_jd.jd_text
 
             # Load candidates from DB
-            db_woxsen = repository.list_woxsen_candidates(db)
+            db_woxsen = repository.list_woxsen_pipeline_inputs(db)
             candidates = []
             for wc in db_woxsen:
                 candidates.append({
@@ -677,21 +1107,111 @@ class PipelineService:
             yield json.dumps({"step": 1, "status": f"Loading {total} candidates"}) + "\n"
             await asyncio.sleep(0.1)
 
+            # Pick up an interrupted run for this JD: its checkpointed candidates keep their stored scores
+            resumed = {}
+            checkpoint = repository.get_resumable_checkpoint(db, active_jd.id, "stage1") if resume else None
+            if checkpoint:
+                done = set(safe_json_load(checkpoint.completed_ids_json, []))
+                cached = repository.get_cached_screening_results(db, [c for c in candidates if c["candidate_id"] in done], active_jd.id)
+                resumed = {cand_id: self._stage1_result_from_row(res) for cand_id, (_, res) in cached.items()}
+                checkpoint_id = checkpoint.id
+                repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(resumed), status="RUNNING", total=total)
+                logger.info(f"[CANCEL] Resuming Stage 1 run #{checkpoint_id}: {len(resumed)}/{total} candidates already scored")
+            else:
+                checkpoint_id = repository.create_pipeline_checkpoint(db, active_jd.id, "stage1", total).id
+            # Stage 1 rows are being rewritten, so an unfinished Stage 2 run no longer applies
+            repository.supersede_checkpoints(db, active_jd.id, "stage2")
+            completed_ids = set(resumed)
+
             # ================================================================
             # STAGE 1: Flash Scoring — Batch of 5, stream after each batch
             # ================================================================
             yield json.dumps({"step": 2, "status": "Stage 1: Flash Extraction & Scoring"}) + "\n"
 
             scorer = Stage1FlashScorer()
+            persister = ResultPersister(active_jd.id).start()
+            candidate_specs = {
+                cand["candidate_id"]: {
+                    "email": cand.get("email") or f"{cand['candidate_id'].lower()}@example.com",
+                    "name": cand.get("name", cand["candidate_id"]),
+                    "github_url": cand.get("links", {}).get("github", ""),
+                    "linkedin_url": cand.get("links", {}).get("linkedin", ""),
+                }
+                for cand in candidates
+            }
+
+            def unsaved_ids():
+                """Scored candidates with a Stage 1 record the writer has not committed (failed or still queued)."""
+                unwritten = persister.unwritten()
+                return {cand_id for cand_id in completed_ids if candidate_specs[cand_id]["email"] in unwritten}
+
             stage_1_results = {}
+            board = StreamRanking()
+            encoder = StreamDeltaEncoder(stream_format)
             all_ranking = []
             all_evaluations = {}
 
+            def record(cand, result):
+                """Put a Stage 1 result on the board and into the evaluation map."""
+                cand_id = cand["candidate_id"]
+                stage_1_results[cand_id] = result
+                s1_scores = result.get("stage_1_scores", {})
+                base_score = s1_scores.get("base_score", 0.0)
+
+                board.upsert(
+                    cand_id,
+                    int(base_score),
+                    name=cand.get("name", cand_id),
+                    github_url=cand.get("links", {}).get("github", ""),
+                )
+
+                all_evaluations[cand_id] = {
+                    "overall_score": int(base_score),
+                    "resume_score": int(s1_scores.get("coverage_score", 0)),
+                    "github_score": 0,
+                    "repo_count": 0,
+                    "ai_projects": 0,
+                    "justification": result.get("hiring_justification", []),
+                    "repos": [],
+                    "interview_readiness": None,
+                    "skeptic_analysis": None,
+                    "final_decision": "STAGE 1 SCORED",
+                    "hr_decision": {"decision": None, "notes": None},
+                    "ai_evidence": [],
+                    "evaluation_blocked": False,
+                    "judge_audit": None,
+                    "rubric_scores": None,
+                    "interview_status": "PENDING",
+                    "evaluation_locked": False,
+                    "interview_session_id": None,
+                    "rag_override": False,
+                    "stage_1_scores": s1_scores,
+                    "stage_1_justification": result.get("stage_1_justification", ""),
+                    "hiring_justification": result.get("hiring_justification", []),
+                    "raw_resume_text": cand.get("raw_resume_text", ""),
+                }
+                encoder.touch(cand_id)
+
+            for cand in candidates:
+                if cand["candidate_id"] in resumed:
+                    record(cand, resumed[cand["candidate_id"]])
+            if resumed:
+                all_ranking = board.ranking()
+                yield json.dumps({
+                    "step": 2,
+                    "status": f"Stage 1: Resumed {len(resumed)}/{total} candidates from the interrupted run",
+                    **encoder.frame(all_ranking, all_evaluations),
+                }) + "\n"
+
             # Process in batches of 5
-            for batch_start in range(0, total, BATCH_SIZE):
-                batch = candidates[batch_start:batch_start + BATCH_SIZE]
+            pending = [cand for cand in candidates if cand["candidate_id"] not in resumed]
+            checkpointed = set(completed_ids)
+            for batch_start in range(0, len(pending), BATCH_SIZE):
+                if token.cancelled:
+                    break
+                batch = pending[batch_start:batch_start + BATCH_SIZE]
                 batch_num = (batch_start // BATCH_SIZE) + 1
-                total_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE
+                total_batches = (len(pending) + BATCH_SIZE - 1) // BATCH_SIZE
 
                 logger.info(f"[STAGE 1] Batch {batch_num}/{total_batches} — scoring {len(batch)} candidates")
 
@@ -701,7 +1221,8 @@ class PipelineService:
                     tasks.append(scorer.score_candidate_async(
                         candidate_id=cand["candidate_id"],
                         resume_json=cand.get("raw_resume_text", ""),
-                        job_description=jd_text
+                        job_description=jd_text,
+                        cancel_token=token,
                     ))
 
                 batch_results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -710,6 +1231,9 @@ class PipelineService:
                 for cand, result in zip(batch, batch_results):
                     cand_id = cand["candidate_id"]
 
+                    if isinstance(result, RunCancelled):
+                        continue  # never scored: left for the resumed run
+
                     if isinstance(result, Exception):
                         logger.error(f"[STAGE 1] Error for {cand_id}: {result}")
                         result = {
@@ -721,164 +1245,124 @@ class PipelineService:
                             "domain_match": "None"
                         }
 
-                    stage_1_results[cand_id] = result
-                    s1_scores = result.get("stage_1_scores", {})
-                    base_score = s1_scores.get("base_score", 0.0)
-
-                    # Save candidate to DB
-                    email = cand.get("email") or f"{cand_id.lower()}@example.com"
-                    db_cand = repository.get_candidate_by_email(db, email)
-                    if not db_cand:
-                        db_cand = repository.create_candidate(
-                            db,
-                            name=cand.get("name", cand_id),
-                            email=email,
-                            github_url=cand.get("links", {}).get("github", ""),
-                            linkedin_url=cand.get("links", {}).get("linkedin", "")
-                        )
-
-                    all_ranking.append({
-                        "candidate_id": cand_id,
-                        "name": cand.get("name", cand_id),
-                        "score": int(base_score),
-                        "github_url": cand.get("links", {}).get("github", "")
-                    })
+                    # Hand off to the write-behind queue; the DB write happens off the event loop
+                    persister.submit(candidate_specs[cand_id], self._stage1_result_data(result))
+                    completed_ids.add(cand_id)
+                    record(cand, result)
 
-                    all_evaluations[cand_id] = {
-                        "overall_score": int(base_score),
-                        "resume_score": int(s1_scores.get("coverage_score", 0)),
-                        "github_score": 0,
-                        "repo_count": 0,
-                        "ai_projects": 0,
-                        "justification": result.get("hiring_justification", []),
-                        "repos": [],
-                        "interview_readiness": None,
-                        "skeptic_analysis": None,
-                        "final_decision": "STAGE 1 SCORED",
-                        "hr_decision": {"decision": None, "notes": None},
-                        "ai_evidence": [],
-                        "evaluation_blocked": False,
-                        "judge_audit": None,
-                        "rubric_scores": None,
-                        "interview_status": "PENDING",
-                        "evaluation_locked": False,
-                        "interview_session_id": None,
-                        "rag_override": False,
-                        "stage_1_scores": s1_scores,
-                        "stage_1_justification": result.get("stage_1_justification", ""),
-                        "hiring_justification": result.get("hiring_justification", []),
-                        "raw_resume_text": cand.get("raw_resume_text", ""),
-                    }
+                # Checkpoint only what the writer has committed
+                if batch_num % CHECKPOINT_EVERY == 0 and len(completed_ids) > len(checkpointed):
+                    await asyncio.to_thread(persister.flush)
+                    durable = completed_ids - unsaved_ids()
+                    if len(durable) > len(checkpointed):
+                        checkpointed = durable
+                        repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(checkpointed))
 
-                # Sort ranking after each batch and stream
-                all_ranking.sort(key=lambda x: x["score"], reverse=True)
-                for i, r in enumerate(all_ranking, 1):
-                    r["rank"] = i
+                # Board is kept in score order as results arrive; number it and stream what changed
+                all_ranking = board.ranking()
 
                 yield json.dumps({
                     "step": 2,
-                    "status": f"Stage 1: Scored {min(batch_start + BATCH_SIZE, total)}/{total} candidates",
-                    "partial_results": {
-                        "ranking": all_ranking,
-                        "evaluations": all_evaluations
-                    }
+                    "status": f"Stage 1: Scored {len(all_evaluations)}/{total} candidates",
+                    **encoder.frame(all_ranking, all_evaluations),
+                }) + "\n"
+
+            if token.cancelled:
+                # Bookkeeping (flush + checkpoint) happens in `finally`, which also covers a killed task
+                yield json.dumps({
+                    "cancelled": True,
+                    "reason": token.reason,
+                    "checkpoint_id": checkpoint_id,
+                    "scored": len(completed_ids),
+                    "total_candidates": total,
                 }) + "\n"
+                return
 
             # ================================================================
             # FINALIZE: Save all Stage 1 results to DB
             # ================================================================
             yield json.dumps({"step": 3, "status": "Saving Stage 1 results to database"}) + "\n"
 
-            for cand in candidates:
-                cand_id = cand["candidate_id"]
-                email = cand.get("email") or f"{cand_id.lower()}@example.com"
-                db_cand = repository.get_candidate_by_email(db, email)
-                if db_cand:
-                    s1 = stage_1_results.get(cand_id, {})
-                    s1_scores = s1.get("stage_1_scores", {})
-                    res_data = {
-                        "resume_score": int(s1_scores.get("coverage_score", 0)),
-                        "github_score": 0,
-                        "overall_score": int(s1_scores.get("base_score", 0)),
-                        "risk_level": "PENDING",
-                        "readiness_level": "PENDING",
-                        "recommendation": "STAGE 1 SCORED",
-                        "repo_count": 0,
-                        "ai_projects": 0,
-                        "skill_gaps": [],
-                        "interview_focus": [],
-                        "github_features": {},
-                        "repos": [],
-                        "interview_readiness": None,
-                        "skeptic_analysis": None,
-                        "ai_evidence": [],
-                        "justification": s1.get("hiring_justification", []),
-                        "rank_position": next((r["rank"] for r in all_ranking if r["candidate_id"] == cand_id), 0),
-                        "retrieval_mode": "flash_single_pass",
-                        "retrieval_version": "v3_funnel",
-                        "rag_enabled": True,
-                        "rag_status": "healthy",
-                        "rag_quality_status": "HEALTHY",
-                        "rag_quality_score": s1_scores.get("base_score", 0) / 100.0,
-                        "rag_override": False,
-                        "judge_audit": {},
-                        "rubric_scores": {},
-                        "stage_1_coverage": s1_scores.get("coverage_score", 0),
-                        "stage_1_similarity": s1_scores.get("similarity_score", 0),
-                        "stage_1_base_score": s1_scores.get("base_score", 0),
-                        "stage_1_justification": s1.get("stage_1_justification", ""),
-                    }
-                    try:
-                        repository.save_screening_result(db, db_cand.id, active_jd.id, res_data)
-                    except Exception as e:
-                        logger.error(f"[DB] Failed to save result for {cand_id}: {e}")
+            # Stage 1 rows were queued as they were scored; only final ranks remain
+            for r in all_ranking:
+                persister.submit(candidate_specs[r["candidate_id"]], {"rank_position": r["rank"]}, partial=True)
+
+            # Durable before announcing completion; the event loop stays free while the writer drains
+            persist_stats = await asyncio.to_thread(persister.flush)
+            logger.info(f"[DB] Stage 1 persistence: {persist_stats}")
+            unsaved = unsaved_ids()
+            if unsaved:
+                # Not complete: `finally` checkpoints the run without these candidates, so a resumed run re-scores them
+                reason = "flush timed out" if persist_stats["timed_out"] else "write failed"
+                logger.error(f"[DB] {len(unsaved)} Stage 1 results not saved ({reason})")
+                yield json.dumps({
+                    "error": f"{len(unsaved)} Stage 1 results could not be saved ({reason}); run again to retry them",
+                    "unsaved": sorted(unsaved),
+                    "checkpoint_id": checkpoint_id,
+                }) + "\n"
+                return
+            repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(completed_ids), status="COMPLETED")
+            finished = True
 
             # Final results
-            all_ranking.sort(key=lambda x: x["score"], reverse=True)
-            for i, r in enumerate(all_ranking, 1):
-                r["rank"] = i
-
-            final_results = {
-                "ranking": all_ranking,
-                "evaluations": all_evaluations
-            }
-
-            yield json.dumps({"step": 6, "results": final_results}) + "\n"
-            logger.info(f"[STREAM] Stage 1 complete. {total} candidates scored.")
-
+            all_ranking = board.ranking()
+            yield json.dumps({"step": 6, **encoder.final(all_ranking, all_evaluations)}) + "\n"
+            logger.info(f"[STREAM] Stage 1 complete. {total} candidates scored ({len(resumed)} resumed).")
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # The response task was torn down: stop the scorer threads still queued for this run
+            token.cancel("client disconnected")
+            raise
         except Exception as e:
             logger.error(f"[STREAM] Pipeline error: {str(e)}")
             import traceback
             traceback.print_exc()
             yield json.dumps({"error": str(e)}) + "\n"
         finally:
-            db.close()
+            def wind_down():
+                """Drain the writer, then record where an unfinished run stopped (only what is committed)."""
+                saved = completed_ids
+                if persister:
+                    persister.close()
+                    saved = completed_ids - unsaved_ids()
+                if checkpoint_id is not None and not finished:
+                    self._close_checkpoint(db, checkpoint_id, "Stage 1", saved, total, token)
+                db.close()
+
+            # Off the shared event loop, and shielded so a second cancel cannot cut the bookkeeping short
+            await asyncio.shield(asyncio.to_thread(wind_down))
 
     # ================================================================
     # STAGE 2: GitHub Verification — Manually Triggered
     # ================================================================
-    async def run_stage_2_stream(self):
+    async def run_stage_2_stream(self, stream_format: str = "delta", cancel_token: Optional[CancelToken] = None, resume: bool = True):
         """
         Stream Stage 2 GitHub verification for Top 60 candidates.
-        Processes in batches of 5, yields NDJSON with partial_results.
+        Processes in batches of 5, yields NDJSON snapshot/delta frames (partial_results with stream_format="full").
+        Cancellation and resume work as in run_screening_stream; verified candidates are checkpointed per batch.
         """
         from core.stage2_github_agent import Stage2GitHubAgent
-        from app.db.models import WoxsenCandidate
 
         BATCH_SIZE = 5
         TOP_N = 60
 
+        token = cancel_token or CancelToken()
         db = SessionLocal()
+        checkpoint_id = None
+        completed_ids = set()
+        unsaved = set()
+        total = 0
+        finished = False
         try:
             yield json.dumps({"step": 0, "status": "Loading Stage 1 results..."}) + "\n"
 
             active_jd = await self._get_or_create_active_jd(db)
             jd_text = active_jd.jd_text
 
-            # Load Top 60 by overall_score
-            all_results = repository.list_screening_results(db, active_jd.id)
-            sorted_results = sorted(all_results, key=lambda x: (x.overall_score or 0), reverse=True)
-            top_results = sorted_results[:TOP_N]
+            # Load Top 60 by overall_score (ranking projection: no evidence JSON)
+            top_results = repository.list_screening_ranking(db, active_jd.id, limit=TOP_N, include_resume=True)
+            unlinked = [r.candidate.email for r in top_results if r.candidate.woxsen is None]
+            woxsen_by_email = repository.get_woxsen_candidates_by_email(db, unlinked, include_resume=True) if unlinked else {}
 
             if not top_results:
                 yield json.dumps({"error": "No Stage 1 results found. Run Stage 1 first."}) + "\n"
@@ -887,24 +1371,21 @@ class PipelineService:
             logger.info(f"[STAGE 2] Starting GitHub verification for {len(top_results)} candidates")
 
             agent = Stage2GitHubAgent()
+            agent.cancel_token = token
             total = len(top_results)
-            all_ranking = []
+            board = StreamRanking()
+            encoder = StreamDeltaEncoder(stream_format)
             all_evaluations = {}
+            github_outcomes = {"delayed": [], "rate_limited": [], "unavailable": [], "empty": [], "no_github": []}
 
             # Build initial ranking from existing DB data
-            for idx, res in enumerate(top_results, 1):
+            for res in top_results:
                 cand = res.candidate
-                wc = db.query(WoxsenCandidate).filter(WoxsenCandidate.email == cand.email).first()
+                wc = cand.woxsen or woxsen_by_email.get((cand.email or "").lower())
                 cand_id = wc.roll_number if wc else cand.email.split("@")[0].upper()
                 github_url = cand.github_url or (wc.github_url if wc else "")
 
-                all_ranking.append({
-                    "rank": idx,
-                    "candidate_id": cand_id,
-                    "name": cand.name,
-                    "score": int(res.overall_score or 0),
-                    "github_url": github_url,
-                })
+                board.upsert(cand_id, int(res.overall_score or 0), name=cand.name, github_url=github_url)
                 all_evaluations[cand_id] = {
                     "candidate_id": cand_id,
                     "db_candidate_id": cand.id,
@@ -916,18 +1397,35 @@ class PipelineService:
                     "justification": json.loads(res.justification_json) if res.justification_json else [],
                     "raw_resume_text": wc.raw_resume_text if wc else "",
                 }
+            all_ranking = board.ranking()
+
+            # Candidates an interrupted run already verified keep their stored combined score
+            checkpoint = repository.get_resumable_checkpoint(db, active_jd.id, "stage2") if resume else None
+            if checkpoint:
+                checkpoint_id = checkpoint.id
+                completed_ids = set(safe_json_load(checkpoint.completed_ids_json, [])) & set(all_evaluations)
+                repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(completed_ids), status="RUNNING", total=total)
+                logger.info(f"[CANCEL] Resuming Stage 2 run #{checkpoint_id}: {len(completed_ids)}/{total} candidates already verified")
+            else:
+                checkpoint_id = repository.create_pipeline_checkpoint(db, active_jd.id, "stage2", total).id
+            # Stage 2 overwrites the Stage 1 scores, so an interrupted Stage 1 run can no longer be resumed
+            repository.supersede_checkpoints(db, active_jd.id, "stage1")
 
             yield json.dumps({
                 "step": 1,
                 "status": f"Stage 2: GitHub Verification for Top {total} candidates",
-                "partial_results": {"ranking": all_ranking, "evaluations": all_evaluations},
+                **encoder.frame(all_ranking, all_evaluations),
+                "resumed": len(completed_ids),
             }) + "\n"
 
             # Process in batches
-            for batch_start in range(0, total, BATCH_SIZE):
-                batch = list(all_evaluations.items())[batch_start:batch_start + BATCH_SIZE]
+            pending = [(cand_id, eval_data) for cand_id, eval_data in all_evaluations.items() if cand_id not in completed_ids]
+            for batch_start in range(0, len(pending), BATCH_SIZE):
+                if token.cancelled:
+                    break
+                batch = pending[batch_start:batch_start + BATCH_SIZE]
                 batch_num = (batch_start // BATCH_SIZE) + 1
-                total_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE
+                total_batches = (len(pending) + BATCH_SIZE - 1) // BATCH_SIZE
 
                 logger.info(f"[STAGE 2] Batch {batch_num}/{total_batches}")
                 yield json.dumps({
@@ -944,11 +1442,30 @@ class PipelineService:
                 results = await asyncio.gather(*tasks, return_exceptions=True)
 
                 # Process results
+                upsert_rows = []
+                verified = []
                 for (cand_id, eval_data), result in zip(batch, results):
                     if isinstance(result, Exception):
                         logger.error(f"[STAGE 2] Exception for {cand_id}: {result}")
                         result = agent._empty_result(str(result))
 
+                    github_status = result.get("github_status", "ok")
+                    if github_status == "cancelled":
+                        continue  # stopped mid-evaluation: left for the resumed run
+                    if github_status in github_outcomes:
+                        github_outcomes[github_status].append(cand_id)
+                    if result.get("rate_limit_delay_s", 0) > 0:
+                        github_outcomes["delayed"].append(cand_id)
+
+                    if github_status in ("rate_limited", "unavailable"):
+                        # Deferred, not empty — keep the Stage 1 score instead of recording a 0
+                        all_evaluations[cand_id].update({
+                            "github_status": github_status,
+                            "github_justification": result.get("github_justification", ""),
+                        })
+                        encoder.touch(cand_id)
+                        continue
+
                     gh_score = result.get("github_score", 0)
                     stage1_score = eval_data.get("resume_score", 0)
                     # Combined: 60% resume + 40% github
@@ -965,61 +1482,121 @@ class PipelineService:
                         "github_strengths": result.get("strengths", []),
                         "github_weaknesses": result.get("weaknesses", []),
                         "github_justification": result.get("github_justification", ""),
+                        "github_status": github_status,
+                        "rate_limit_delay_s": result.get("rate_limit_delay_s", 0),
                     })
 
-                    # Update ranking score
-                    for r in all_ranking:
-                        if r["candidate_id"] == cand_id:
-                            r["score"] = combined
-                            break
-
-                    # Persist to DB — update the existing screening_result row
-                    try:
-                        existing = db.query(ScreeningResult).get(eval_data["db_result_id"])
-                        if existing:
-                            existing.github_score = gh_score
-                            existing.overall_score = combined
-                            existing.repo_count = result.get("repo_count", 0)
-                            existing.ai_projects = result.get("ai_projects", 0)
-                            existing.repos_json = json.dumps(result.get("repos", []))
-                            existing.ai_evidence_json = json.dumps(result.get("code_evidence", []))
-                            existing.github_features_json = json.dumps({
-                                "rubric_scores": result.get("rubric_scores", {}),
-                                "strengths": result.get("strengths", []),
-                                "weaknesses": result.get("weaknesses", []),
-                                "github_justification": result.get("github_justification", ""),
-                                "github_username": result.get("github_username"),
-                            })
-                            db.commit()
-                    except Exception as e:
-                        logger.error(f"[STAGE 2] DB update failed for {cand_id}: {e}")
-                        db.rollback()
-
-                # Re-sort and stream after each batch
-                all_ranking.sort(key=lambda x: x["score"], reverse=True)
-                for i, r in enumerate(all_ranking, 1):
-                    r["rank"] = i
+                    # Update ranking score (binary search + reposition, no full re-sort)
+                    board.upsert(cand_id, combined)
+                    encoder.touch(cand_id)
+
+                    # Only the GitHub columns change; the Stage 1 row is updated in place
+                    upsert_rows.append((eval_data["db_candidate_id"], {
+                        "github_score": gh_score,
+                        "overall_score": combined,
+                        "repo_count": result.get("repo_count", 0),
+                        "ai_projects": result.get("ai_projects", 0),
+                        "repos": result.get("repos", []),
+                        "ai_evidence": result.get("code_evidence", []),
+                        "github_features": {
+                            "rubric_scores": result.get("rubric_scores", {}),
+                            "strengths": result.get("strengths", []),
+                            "weaknesses": result.get("weaknesses", []),
+                            "github_justification": result.get("github_justification", ""),
+                            "github_username": result.get("github_username"),
+                            "github_status": github_status,
+                        },
+                    }))
+                    verified.append(cand_id)
+
+                # Persist the batch in one transaction, then checkpoint it
+                try:
+                    repository.bulk_upsert_screening_results(db, active_jd.id, upsert_rows, partial=True)
+                    completed_ids.update(verified)
+                    repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(completed_ids))
+                except Exception as e:
+                    # Not checkpointed: the run ends resumable and a resumed run verifies these again
+                    unsaved.update(c for c in verified if c not in completed_ids)
+                    logger.error(f"[STAGE 2] DB update failed for batch {batch_num}: {e}")
+
+                # Stream the re-ranked board after each batch
+                all_ranking = board.ranking()
 
                 yield json.dumps({
                     "step": 2,
-                    "status": f"Stage 2: {min(batch_start + BATCH_SIZE, total)}/{total} candidates verified",
-                    "partial_results": {"ranking": all_ranking, "evaluations": all_evaluations},
+                    "status": f"Stage 2: {len(completed_ids)}/{total} candidates verified",
+                    **encoder.frame(all_ranking, all_evaluations),
+                    "github_outcomes": github_outcomes,
+                }) + "\n"
+
+            if token.cancelled:
+                yield json.dumps({
+                    "cancelled": True,
+                    "reason": token.reason,
+                    "checkpoint_id": checkpoint_id,
+                    "verified": len(completed_ids),
+                    "total_candidates": total,
+                    "github_outcomes": github_outcomes,
+                }) + "\n"
+                return
+
+            # Candidates pointing at the same GitHub user / repos (group projects, copied URLs)
+            shared_github = agent.shared_github_report()
+            for owners in list(shared_github["shared_usernames"].values()) + list(shared_github["shared_repos"].values()):
+                for cand_id in owners:
+                    if cand_id in all_evaluations:
+                        others = set(all_evaluations[cand_id].get("shared_github_with", []))
+                        others.update(c for c in owners if c != cand_id)
+                        all_evaluations[cand_id]["shared_github_with"] = sorted(others)
+                        encoder.touch(cand_id)
+            if shared_github["shared_usernames"] or shared_github["shared_repos"]:
+                logger.info(
+                    f"[STAGE 2] Shared GitHub work: {len(shared_github['shared_usernames'])} usernames, "
+                    f"{len(shared_github['shared_repos'])} repos; calls {shared_github['calls']}"
+                )
+
+            if unsaved:
+                logger.error(f"[STAGE 2] {len(unsaved)} verified candidates not saved; checkpoint #{checkpoint_id} left resumable")
+                yield json.dumps({
+                    "error": f"{len(unsaved)} Stage 2 results could not be saved; run again to retry them",
+                    "unsaved": sorted(unsaved),
+                    "checkpoint_id": checkpoint_id,
+                    "github_outcomes": github_outcomes,
                 }) + "\n"
+                return
+
+            repository.update_pipeline_checkpoint(db, checkpoint_id, completed_ids=list(completed_ids), status="COMPLETED")
+            finished = True
 
             # Final results
             yield json.dumps({
                 "step": 6,
-                "results": {"ranking": all_ranking, "evaluations": all_evaluations},
+                **encoder.final(all_ranking, all_evaluations),
+                "github_outcomes": github_outcomes,
+                "shared_github": shared_github,
             }) + "\n"
-            logger.info(f"[STAGE 2] Complete. {total} candidates GitHub-verified.")
+            logger.info(
+                f"[STAGE 2] Complete. {total} candidates GitHub-verified. "
+                f"Delayed by rate limit: {len(github_outcomes['delayed'])}, "
+                f"deferred: {len(github_outcomes['rate_limited']) + len(github_outcomes['unavailable'])}, "
+                f"empty: {len(github_outcomes['empty'])}"
+            )
 
+        except (asyncio.CancelledError, GeneratorExit):
+            token.cancel("client disconnected")
+            raise
         except Exception as e:
             logger.error(f"[STAGE 2] Pipeline error: {str(e)}")
             import traceback
             traceback.print_exc()
             yield json.dumps({"error": str(e)}) + "\n"
         finally:
-            db.close()
+            def wind_down():
+                if checkpoint_id is not None and not finished:
+                    self._close_checkpoint(db, checkpoint_id, "Stage 2", completed_ids, total, token)
+                db.close()
+
+            await asyncio.shield(asyncio.to_thread(wind_down))
 
     async def submit_hr_decision(self, request: Any) -> Dict[str, Any]:
         """
@@ -1081,22 +1658,22 @@ class PipelineService:
 
             print(f"DEBUG: Found screening. Locking...")
             # 1. Lock evaluation & update status
-            screening.evaluation_locked = True
-            screening.interview_status = "APPROVED"
+            interview_state = {"evaluation_locked": True, "interview_status": "APPROVED"}
             
             # 2. Trigger Session Creation (To be implemented in session_manager.py)
             from core.interview.session_manager import create_interview_session
             session_meta = create_interview_session(db, cand.id, screening.id)
-            screening.interview_session_id = session_meta['session_id']
+            interview_state["interview_session_id"] = session_meta['session_id']
 
             # 3. Trigger Email (To be implemented in interview_email.py)
             from core.notifications.interview_email import send_interview_invite
             invite_sent = send_interview_invite(cand.email, session_meta['link'], cand.name)
             if invite_sent:
-                screening.interview_invite_sent = True
-                screening.interview_status = "INTERVIEW_SENT"
+                interview_state["interview_invite_sent"] = True
+                interview_state["interview_status"] = "INTERVIEW_SENT"
 
-            db.commit()
+            # Session row and screening state commit together with the data-version bump
+            repository.update_screening_interview_state(db, screening, **interview_state)
             
             return {
                 "message": "Candidate approved. Interview session created and invitation sent.",
@@ -0,0 +1,59 @@
+"""
+Versioned cache for serialized read-endpoint responses.
+
+Dashboard polling hits /results, /rag/summary and the per-candidate metrics routes far more
+often than the data changes. Each response is cached as rendered JSON bytes under the data
+version it was built from (see repository.bump_data_version); a request at the same version
+is served from memory, and a client already holding that version gets a 304 without even
+that. A write bumps the version, so stale entries are never served — they are replaced on
+the next miss or evicted by LRU.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class VersionedResponseCache:
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        # key (path + query) -> (version, body); only the latest version per key is kept
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    def get(self, key: str, version: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: str, version: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": sum(len(body) for _, body in self._entries.values()),
+            }
+
+
+# Shared per process; versions live in the database, so every worker process agrees on them
+response_cache = VersionedResponseCache()
@@ -0,0 +1,225 @@
+"""
+Write-behind persistence for streaming screening runs.
+
+The scoring loop hands finished result records to `submit()` and moves on; a dedicated
+writer thread drains the queue and writes them in batched transactions (candidate rows
+created as needed, screening results bulk-upserted). `flush()` blocks until everything
+submitted so far is committed, so callers can guarantee durability before announcing
+completion.
+
+A failed batch is not dropped: its records are held back and retried with exponential
+backoff on the next drain, and a flush retries them until `max_attempts` is reached.
+Whatever is still not committed (held back, queued or timed out) is reported by
+`unwritten()`, so the caller can leave those candidates out of its checkpoint.
+"""
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.db import repository
+from app.db.database import SessionLocal
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class ResultPersister:
+    def __init__(
+        self,
+        jd_id: int,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        flush_timeout: float = 60.0,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        max_attempts: int = 4,
+        session_factory: Callable = SessionLocal,
+    ):
+        self.jd_id = jd_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"submitted": 0, "written": 0, "failed": 0, "retries": 0, "batches": 0, "write_seconds": 0.0}
+        self._stats_lock = threading.Lock()
+        # email -> records submitted but not committed yet
+        self._outstanding: Dict[str, int] = {}
+        # Records of failed batches, retried once `_retry_at` has passed
+        self._held: Dict[str, tuple] = {}
+        self._attempts = 0
+        self._retry_at = 0.0
+
+    # ──────────────────────────────────────────────
+    # Producer side (scoring loop)
+    # ──────────────────────────────────────────────
+
+    def start(self) -> "ResultPersister":
+        self._thread = threading.Thread(target=self._run, name=f"result-persister-jd{self.jd_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, candidate: Dict[str, Any], result_data: Dict[str, Any], partial: bool = False):
+        """
+        Queue a result for `candidate` ({email, name, github_url, linkedin_url}); never blocks.
+        partial=True updates only the given keys of an existing row (e.g. final rank_position).
+        """
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._outstanding[candidate["email"]] = self._outstanding.get(candidate["email"], 0) + 1
+        self._queue.put((candidate, result_data, partial))
+
+    def flush(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Block until every record submitted before this call is committed (held-back batches
+        retried with backoff) or `timeout` (default flush_timeout) passes; returns stats.
+        stats["unwritten"] > 0 means some records are not durable, whether they failed or timed out.
+        """
+        timeout = self.flush_timeout if timeout is None else timeout
+        done = threading.Event()
+        self._queue.put(done)
+        timed_out = not done.wait(timeout)
+        if timed_out:
+            logger.error(f"[PERSISTER] Flush timed out after {timeout}s")
+        stats = self.stats()
+        stats["timed_out"] = timed_out
+        return stats
+
+    def close(self, timeout: Optional[float] = None):
+        """Drain the queue (retrying held-back batches) and stop the writer thread."""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(self.flush_timeout if timeout is None else timeout)
+
+    def unwritten(self) -> Set[str]:
+        """Emails with a submitted record that is not committed (failed, still queued or in progress)."""
+        with self._stats_lock:
+            return set(self._outstanding)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["unwritten"] = len(self._outstanding)
+        stats["write_seconds"] = round(stats["write_seconds"], 3)
+        return stats
+
+    # ──────────────────────────────────────────────
+    # Writer thread
+    # ──────────────────────────────────────────────
+
+    @staticmethod
+    def _merge(pending: Dict[str, tuple], candidate: Dict[str, Any], result_data: Dict[str, Any], partial: bool, count: int = 1):
+        """Fold a record into `pending` (email -> (candidate spec, result_data, partial, records merged))."""
+        email = candidate["email"]
+        previous = pending.get(email)
+        if previous is None:
+            pending[email] = (candidate, dict(result_data), partial, count)
+        elif not partial:
+            pending[email] = (candidate, dict(result_data), partial, previous[3] + count)
+        else:
+            # A partial update on top of a queued record: merge, keep the earlier record's mode
+            pending[email] = (previous[0], {**previous[1], **result_data}, previous[2], previous[3] + count)
+
+    def _run(self):
+        # Later records for a candidate merge into earlier ones
+        pending: Dict[str, tuple] = {}
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, threading.Event):
+                self._drain(pending, final=item is not None)
+                pending = {}
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is _STOP:
+                    return
+                continue
+
+            candidate, result_data, partial = item
+            self._merge(pending, candidate, result_data, partial)
+
+            if len(pending) >= self.batch_size:
+                self._drain(pending)
+                pending = {}
+
+    def _drain(self, pending: Dict[str, tuple], final: bool = False):
+        """
+        Write `pending` together with any held-back records that are due. On a flush or stop
+        (final=True) held-back records are always retried, sleeping out the backoff between
+        attempts until they are written or max_attempts is reached.
+        """
+        while True:
+            # A record for a held-back candidate waits with it so it is never written ahead of it
+            fresh: Dict[str, tuple] = {}
+            for email, (candidate, result_data, partial, count) in pending.items():
+                self._merge(self._held if email in self._held else fresh, candidate, result_data, partial, count)
+            pending = {}
+
+            if self._held and (final or time.time() >= self._retry_at):
+                batch, self._held = self._held, {}
+                with self._stats_lock:
+                    self._stats["retries"] += 1
+                if self._write(batch):
+                    self._attempts = 0
+                else:
+                    self._hold(batch, retried=True)
+            if fresh and not self._write(fresh):
+                self._hold(fresh)
+
+            if not self._held or not final or self._attempts >= self.max_attempts:
+                if self._held and final:
+                    logger.error(f"[PERSISTER] {len(self._held)} results still unwritten after {self._attempts} attempts")
+                return
+            time.sleep(max(0.0, self._retry_at - time.time()))
+
+    def _hold(self, batch: Dict[str, tuple], retried: bool = False):
+        """Keep a failed batch for retry; the backoff doubles with every failed retry."""
+        for candidate, result_data, partial, count in batch.values():
+            self._merge(self._held, candidate, result_data, partial, count)
+        if retried or not self._attempts:
+            self._attempts += 1
+            self._retry_at = time.time() + min(self.retry_backoff * 2 ** (self._attempts - 1), self.max_backoff)
+
+    def _write(self, pending: Dict[str, tuple]) -> bool:
+        start = time.time()
+        db = self.session_factory()
+        try:
+            ids = repository.ensure_candidates(db, [spec for spec, _, _, _ in pending.values()])
+            for partial in (False, True):
+                rows = [
+                    (ids[email], result_data)
+                    for email, (_, result_data, is_partial, _) in pending.items()
+                    if is_partial == partial and email in ids
+                ]
+                repository.bulk_upsert_screening_results(db, self.jd_id, rows, partial=partial, commit=False)
+            db.commit()
+            outcome = "written"
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[PERSISTER] Batch of {len(pending)} results failed: {e}")
+            outcome = "failed"
+        finally:
+            db.close()
+
+        with self._stats_lock:
+            self._stats[outcome] += len(pending)
+            self._stats["batches"] += 1
+            self._stats["write_seconds"] += time.time() - start
+            if outcome == "written":
+                for email, (_, _, _, count) in pending.items():
+                    left = self._outstanding.get(email, 0) - count
+                    if left > 0:
+                        self._outstanding[email] = left
+                    else:
+                        self._outstanding.pop(email, None)
+        return outcome == "written"
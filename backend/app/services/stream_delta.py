@@ -0,0 +1,68 @@
+"""
+Delta encoding for the NDJSON progress streams.
+
+The streams used to re-send the whole board (every ranking entry and every evaluation,
+resume text included) after each batch: O(n²) bytes over a run. In delta mode each progress
+frame carries only what changed since the previous frame:
+
+    {"delta": {"seq": 7,
+               "evaluations": {cand_id: record, ...},   # new or changed records, replaced whole
+               "ranking": [entry, ...],                 # ranking entries of those candidates
+               "moves": [[cand_id, rank], ...]}}        # other candidates whose rank moved
+
+Every `snapshot_every` frames (and on the first one) the full state is sent instead as
+{"snapshot": {"seq": n, "ranking": [...], "evaluations": {...}}}, so a client that starts
+late or mis-applies a frame resynchronises. Clients apply a snapshot by replacing the
+ranking and merging the evaluations, and a delta by merging records, upserting entries and
+applying moves, then ordering by rank.
+
+In "full" mode the encoder emits the legacy {"partial_results": ...} / {"results": ...} frames.
+"""
+from typing import Any, Dict, List, Set
+
+STREAM_FORMATS = ("delta", "full")
+SNAPSHOT_EVERY = 20
+
+
+class StreamDeltaEncoder:
+    def __init__(self, mode: str = "delta", snapshot_every: int = SNAPSHOT_EVERY):
+        if mode not in STREAM_FORMATS:
+            raise ValueError(f"Unknown stream format: {mode!r}")
+        self.mode = mode
+        self.snapshot_every = snapshot_every
+        self._seq = 0
+        self._sent_ranks: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+
+    def touch(self, *candidate_ids: str):
+        """Mark evaluation records as new/changed since the last frame."""
+        self._dirty.update(candidate_ids)
+
+    def frame(self, ranking: List[Dict[str, Any]], evaluations: Dict[str, Dict[str, Any]], snapshot: bool = False) -> Dict[str, Any]:
+        """Progress frame for the current board (`ranking` must carry up-to-date ranks)."""
+        if self.mode == "full":
+            return {"partial_results": {"ranking": ranking, "evaluations": evaluations}}
+
+        self._seq += 1
+        if snapshot or (self._seq - 1) % self.snapshot_every == 0:
+            self._dirty.clear()
+            self._sent_ranks = {entry["candidate_id"]: entry["rank"] for entry in ranking}
+            return {"snapshot": {"seq": self._seq, "ranking": ranking, "evaluations": evaluations}}
+
+        changed, moves = [], []
+        for entry in ranking:
+            cand_id = entry["candidate_id"]
+            if cand_id in self._dirty:
+                changed.append(entry)
+            elif self._sent_ranks.get(cand_id) != entry["rank"]:
+                moves.append([cand_id, entry["rank"]])
+            self._sent_ranks[cand_id] = entry["rank"]
+        records = {cand_id: evaluations[cand_id] for cand_id in self._dirty if cand_id in evaluations}
+        self._dirty.clear()
+        return {"delta": {"seq": self._seq, "evaluations": records, "ranking": changed, "moves": moves}}
+
+    def final(self, ranking: List[Dict[str, Any]], evaluations: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Completion frame: the full results (legacy) or a last delta flagged complete."""
+        if self.mode == "full":
+            return {"results": {"ranking": ranking, "evaluations": evaluations}}
+        return {**self.frame(ranking, evaluations), "complete": True}
@@ -0,0 +1,156 @@
+"""
+Single-flight for the NDJSON progress streams.
+
+Two HR users pressing "Run" together used to start two identical pipelines over the same
+cohort and JD (double the LLM spend, and both runs rewriting the same rows). Streams are
+now keyed by (JD hash, candidate set hash, mode): the first caller starts the pipeline in
+its own task, and later callers with the same key attach to it. Every subscriber replays
+the frames produced so far (so a delta stream starts from its first snapshot), then gets
+new frames as they arrive.
+
+The run no longer belongs to one connection. A subscriber that goes away just detaches;
+the run's CancelToken is cancelled only when its last subscriber leaves, which keeps the
+stop-on-disconnect behaviour for the usual single-viewer case. A cancelled run is never
+joined: a new request for its key gets a new run, which waits for the cancelled one to
+finish winding down (in-flight batch, persister drain, checkpoint) before it starts. It
+therefore resumes from the checkpoint the old run closed, instead of sharing it and
+re-scoring the same in-flight candidates.
+
+Runs whose keys differ but which rewrite the same rows (a fresh and a resumed Stage 1 run,
+another format or weights for the same JD and cohort) share a lane. Only one live run
+per lane is allowed; join() raises StreamBusy for a second one.
+"""
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from core.cancellation import CancelToken
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamBusy(Exception):
+    """Another live run holds the lane; carries that run's key."""
+
+
+class _Flight:
+    def __init__(self, key: str, lane: str):
+        self.key = key
+        self.lane = lane
+        self.token = CancelToken()
+        self.frames: List[str] = []
+        self.done = False
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self.finished = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def wake(self):
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    async def wait(self):
+        await self._wakeup.wait()
+
+
+class StreamSubscription:
+    """One client's view of a shared stream: iterate it, close() to detach."""
+
+    def __init__(self, flight: _Flight, attached: bool):
+        self._flight = flight
+        self.attached = attached
+        self.closed = False
+        self._counted = False
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        flight = self._flight
+        if self._counted:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                flight.token.cancel("client disconnected")
+        flight.wake()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        flight = self._flight
+        flight.subscribers += 1
+        self._counted = True
+        index = 0
+        try:
+            while not self.closed:
+                if index < len(flight.frames):
+                    yield flight.frames[index]
+                    index += 1
+                elif flight.done:
+                    return
+                else:
+                    await flight.wait()
+        finally:
+            self.close()
+
+
+class StreamSingleFlight:
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        # lane -> its most recent run, kept until that run has finished winding down
+        self._lanes: Dict[str, _Flight] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def join(self, key: str, start: Callable[[CancelToken], AsyncIterator[str]], lane: Optional[str] = None) -> StreamSubscription:
+        """
+        Subscribe to the in-progress stream for `key`, or start one with start(cancel_token).
+        Raises StreamBusy if a live run with another key holds `lane` (defaults to the key).
+        Must be called on the event loop that serves the subscribers.
+        """
+        flight = self._flights.get(key)
+        if flight is not None and not flight.token.cancelled:
+            self.coalesced += 1
+            logger.info(f"[RUNS] Attached to in-progress stream {key} ({flight.subscribers} subscribers, {len(flight.frames)} frames)")
+            return StreamSubscription(flight, attached=True)
+
+        lane = lane or key
+        previous = self._lanes.get(lane)
+        if previous is not None and not previous.token.cancelled:
+            raise StreamBusy(previous.key)
+
+        flight = _Flight(key, lane)
+        self._flights[key] = flight
+        self._lanes[lane] = flight
+        self.executed += 1
+        flight.task = asyncio.create_task(self._produce(flight, start, previous))
+        return StreamSubscription(flight, attached=False)
+
+    async def _produce(self, flight: _Flight, start: Callable[[CancelToken], AsyncIterator[str]], previous: Optional[_Flight]):
+        try:
+            if previous is not None and not previous.done:
+                logger.info(f"[RUNS] Stream {flight.key} waits for cancelled run {previous.key} to wind down")
+                await previous.finished.wait()
+            if flight.token.cancelled:
+                return  # every subscriber left while it waited
+            async for frame in start(flight.token):
+                flight.frames.append(frame)
+                flight.wake()
+        except Exception as e:
+            logger.error(f"[RUNS] Shared stream {flight.key} failed: {e}")
+        finally:
+            flight.done = True
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            if self._lanes.get(flight.lane) is flight:
+                del self._lanes[flight.lane]
+            flight.finished.set()
+            flight.wake()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "subscribers": sum(flight.subscribers for flight in self._flights.values()),
+        }
+
+
+stream_flights = StreamSingleFlight()
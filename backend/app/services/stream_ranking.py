@@ -0,0 +1,57 @@
+"""
+Incremental ranking for the streaming pipelines.
+
+The streams used to append to a list, re-sort all of it after every batch and find a
+candidate to rescore with a linear search. StreamRanking keeps entries ordered by score as
+they arrive (bisect on a sorted key list), so a score change costs a binary search and one
+list shift instead of a full sort, and lookups by candidate are dict hits.
+"""
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StreamRanking:
+    def __init__(self):
+        # Sorted ascending by (-score, arrival); best candidate first
+        self._keys: List[Tuple[float, int, str]] = []
+        self._key_by_id: Dict[str, Tuple[float, int, str]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._arrival = count()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._entries
+
+    def upsert(self, candidate_id: str, score: float, **fields) -> Dict[str, Any]:
+        """Add a candidate or move it to its new score; extra fields are merged into its entry."""
+        key = self._key_by_id.get(candidate_id)
+        if key is not None:
+            if key[0] == -score:
+                self._entries[candidate_id].update(fields)
+                return self._entries[candidate_id]
+            del self._keys[bisect_left(self._keys, key)]
+            arrival = key[1]  # keep the original tie-break position
+        else:
+            arrival = next(self._arrival)
+
+        key = (-score, arrival, candidate_id)
+        insort(self._keys, key)
+        self._key_by_id[candidate_id] = key
+        entry = self._entries.setdefault(candidate_id, {"candidate_id": candidate_id})
+        entry.update(fields, score=score)
+        return entry
+
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(candidate_id)
+
+    def ranking(self) -> List[Dict[str, Any]]:
+        """Entries best-first with 1-based `rank` filled in (the same dicts on every call)."""
+        ranked = []
+        for rank, (_, _, candidate_id) in enumerate(self._keys, 1):
+            entry = self._entries[candidate_id]
+            entry["rank"] = rank
+            ranked.append(entry)
+        return ranked
@@ -0,0 +1,101 @@
+"""
+Query-plan regression check for the repository's hot lookups.
+
+Builds a throwaway SQLite database from the models + migrations, calls each repository
+function while capturing the SQL it emits, and runs EXPLAIN QUERY PLAN on every statement.
+Fails (exit code 1) when a lookup scans a whole table or sorts in a temp B-tree instead of
+using an index — i.e. when a schema or query change silently drops an index path.
+
+    python check_query_plans.py          # from the backend directory
+"""
+import os
+import sys
+import tempfile
+
+backend_dir = os.path.abspath(os.path.dirname(__file__))
+project_root = os.path.abspath(os.path.join(backend_dir, "../"))
+if backend_dir not in sys.path: sys.path.insert(0, backend_dir)
+if project_root not in sys.path: sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.migrations import run_migrations
+from app.db import repository
+
+# Plan details that mean "no index used"; scans of subqueries the plan itself materialized are fine
+BAD_PLAN_MARKERS = ("SCAN ", "USE TEMP B-TREE")
+
+
+def _bad_steps(plan):
+    derived = {step.split()[1] for step in plan if step.startswith("MATERIALIZE ")}
+    bad = []
+    for step in plan:
+        if not step.startswith(BAD_PLAN_MARKERS):
+            continue
+        if step.startswith("SCAN ") and (step.startswith("SCAN (") or step.split()[1] in derived):
+            continue
+        bad.append(step)
+    return bad
+
+# name -> repository call; each is expected to run on indexes only
+HOT_LOOKUPS = {
+    "get_candidate_by_email": lambda db: repository.get_candidate_by_email(db, "a@b.com"),
+    "get_candidate_ids_by_email": lambda db: repository.get_candidate_ids_by_email(db, ["a@b.com", "c@d.com"]),
+    "get_active_jd": lambda db: repository.get_active_jd(db),
+    "get_screening_result": lambda db: repository.get_screening_result(db, 1, 1),
+    "get_latest_screening_result": lambda db: repository.get_latest_screening_result(db, 1),
+    "list_screening_ranking": lambda db: repository.list_screening_ranking(db, 1, limit=60),
+    "get_latest_rag_retrieval_metrics": lambda db: repository.get_rag_retrieval_metrics(db, 1),
+    "get_rag_evaluation_by_candidate": lambda db: repository.get_rag_evaluation_by_candidate(db, 1),
+    "get_latest_rag_evaluation_job": lambda db: repository.get_latest_rag_evaluation_job(db, 1),
+    "get_pending_rag_evaluation_jobs": lambda db: repository.get_pending_rag_evaluation_jobs(db, limit=5),
+    "get_pending_llm_job": lambda db: repository.get_pending_llm_job(db),
+    "get_llm_eval_job_by_candidate": lambda db: repository.get_llm_eval_job_by_candidate(db, 1),
+    "get_active_interview_session_by_candidate": lambda db: repository.get_active_interview_session_by_candidate(db, 1),
+    "get_leaderboard_page": lambda db: repository.get_leaderboard_page(db, 1, offset=50, limit=50),
+    "refresh_leaderboard": lambda db: repository.refresh_leaderboard(db, 1, [1, 2, 3]),
+    "get_data_versions": lambda db: repository.get_data_versions(db, 1),
+    "get_leaderboard_slice": lambda db: repository.get_leaderboard_slice(db, 1, after=(72.5, 40), limit=51, stage="stage2"),
+    "get_screening_results_for_candidates": lambda db: repository.get_screening_results_for_candidates(db, 1, [1, 2, 3]),
+    "get_resumable_checkpoint": lambda db: repository.get_resumable_checkpoint(db, 1, "stage1"),
+    "list_pipeline_run_events": lambda db: repository.list_pipeline_run_events(db, 1, offset=20),
+    "fail_orphaned_pipeline_runs": lambda db: repository.fail_orphaned_pipeline_runs(db),
+}
+
+
+def check_plans() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'plan_check.db')}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        Session = sessionmaker(bind=engine)
+
+        captured = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, params, *_: captured.append((statement, params)))
+
+        failures = 0
+        for name, call in HOT_LOOKUPS.items():
+            db = Session()
+            captured.clear()
+            try:
+                call(db)
+            finally:
+                db.close()
+
+            for statement, params in list(captured):
+                with engine.connect() as conn:
+                    plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()]
+                bad = _bad_steps(plan)
+                status = "FAIL" if bad else "ok"
+                print(f"[{status:4}] {name}: {' | '.join(plan)}")
+                failures += bool(bad)
+        engine.dispose()
+
+    print(f"\n{len(HOT_LOOKUPS) - failures}/{len(HOT_LOOKUPS)} hot lookups use indexes only.")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if check_plans() else 0)
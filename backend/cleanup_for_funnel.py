@@ -9,7 +9,7 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.db.database import SessionLocal, engine
-from app.db import models
+from app.db import models, repository
 
 def cleanup():
     db = SessionLocal()
@@ -23,6 +23,10 @@ def cleanup():
             "rag_retrieval_metrics",
             "rag_metrics",
             "interview_sessions",
+            "pipeline_run_events",
+            "pipeline_runs",
+            "pipeline_checkpoints",
+            "leaderboard_entries",
             "screening_results",
         ]
 
@@ -67,6 +71,12 @@ def cleanup():
                 db.rollback()
                 print(f"  ❌ Error clearing {table_name}: {e}")
 
+        # Cached API responses are keyed by data version: bump every JD (and candidate-level data)
+        for (jd_id,) in db.query(models.JobDescription.id).all():
+            repository.bump_data_version(db, jd_id)
+        repository.bump_data_version(db)
+        db.commit()
+
         # Verify
         print("\n" + "=" * 60)
         print("AFTER CLEANUP")
@@ -16,7 +16,7 @@ def clear_dummy_data():
     all_tables = inspector.get_table_names()
     
     # We carefully DO NOT include 'woxsen_candidates' or 'users' or 'job_descriptions'
-    tables_to_keep = ["woxsen_candidates", "users", "job_descriptions", "alembic_version"]
+    tables_to_keep = ["woxsen_candidates", "users", "job_descriptions", "alembic_version", "schema_migrations", "data_versions"]
     tables_to_clear = [t for t in all_tables if t not in tables_to_keep]
     
     try:
@@ -29,6 +29,11 @@ def clear_dummy_data():
             except Exception as e:
                 print(f"  Skipping {table_name}: {e}")
                 session.rollback()
+
+        # Never reset data versions (a client could revalidate a stale ETag); bump every scope instead
+        if "data_versions" in all_tables:
+            session.execute(text("INSERT OR IGNORE INTO data_versions (scope, version) SELECT id, 0 FROM job_descriptions UNION SELECT 0, 0"))
+            session.execute(text("UPDATE data_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP"))
             
         session.commit()
         print("✅ Database dummy tables cleared successfully.")
@@ -45,7 +50,8 @@ def clear_storage_directories():
     if os.path.exists(storage_dir):
         print(f"Clearing storage directory: {storage_dir}")
         for item in os.listdir(storage_dir):
-            if item == "embedding_cache.json":
+            # github_cache.db (and its -wal/-shm files) stays open in the running API and prefetcher
+            if item == "embedding_cache.json" or item.startswith("github_cache.db"):
                 print(f"  Keeping cache: {item}")
                 continue
             item_path = os.path.join(storage_dir, item)
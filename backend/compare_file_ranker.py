@@ -0,0 +1,118 @@
+"""
+Offline comparison: deterministic file ranker vs. LLM file selection (Stage 2).
+
+For each sampled repo, runs both selectors on the same filtered tree and reports
+agreement, bucketed by ranker confidence so STAGE2_RANKER_MIN_CONFIDENCE can be tuned.
+
+Usage:
+    python compare_file_ranker.py --limit 10
+    python compare_file_ranker.py --usernames octocat,torvalds --out ranker_report.json
+"""
+import sys
+import os
+import json
+import argparse
+import logging
+from typing import List, Dict, Any
+
+backend_dir = os.path.abspath(os.path.dirname(__file__))
+project_root = os.path.abspath(os.path.join(backend_dir, "../"))
+if backend_dir not in sys.path: sys.path.insert(0, backend_dir)
+if project_root not in sys.path: sys.path.insert(0, project_root)
+
+from app.db.database import SessionLocal
+from app.db import repository
+from core.stage2_github_agent import Stage2GitHubAgent
+from core.github_file_ranker import rank_files
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("ranker_comparison")
+
+CONFIDENCE_BUCKETS = [(0.0, 0.4), (0.4, 0.6), (0.6, 0.8), (0.8, 1.01)]
+
+
+def load_inputs(usernames: List[str], limit: int) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        jd = repository.get_active_jd(db)
+        jd_text = jd.jd_text if jd else open(os.path.join(project_root, "NEW-JD"), encoding="utf-8").read()
+        if not usernames:
+            agent = Stage2GitHubAgent()
+            for wc in repository.list_woxsen_candidates(db):
+                username = agent.extract_github_username(wc.github_url or "")
+                if username:
+                    usernames.append(username)
+                if len(usernames) >= limit:
+                    break
+        return {"jd_text": jd_text, "usernames": usernames}
+    finally:
+        db.close()
+
+
+def compare(usernames: List[str], jd_text: str, repos_per_user: int) -> Dict[str, Any]:
+    agent = Stage2GitHubAgent()
+    rows = []
+
+    for username in usernames:
+        repos = [r for r in agent._fetch_repos(username) if not r.get("fork")]
+        repos.sort(key=lambda r: (r.get("stargazers_count", 0), r.get("size", 0)), reverse=True)
+        for repo in repos[:repos_per_user]:
+            tree = agent._fetch_tree(username, repo["name"])
+            paths = agent._filter_tree(tree)
+            if not paths:
+                continue
+            sizes = {item.get("path"): item.get("size", 0) for item in tree}
+            ranking = rank_files([(p, sizes.get(p, 0)) for p in paths], jd_text)
+            llm_pick = agent._llm_select_files(repo["name"], paths, jd_text, sizes)
+
+            ranker_set, llm_set = set(ranking.selected), set(llm_pick)
+            union = ranker_set | llm_set
+            rows.append({
+                "repo": f"{username}/{repo['name']}",
+                "file_count": len(paths),
+                "confidence": ranking.confidence,
+                "ranker": ranking.selected,
+                "llm": llm_pick,
+                "overlap_at_5": len(ranker_set & llm_set) / max(len(llm_set), 1),
+                "jaccard": len(ranker_set & llm_set) / max(len(union), 1),
+                "top1_match": bool(ranking.selected and llm_pick and ranking.selected[0] == llm_pick[0]),
+            })
+            logger.info(f"{rows[-1]['repo']}: confidence={ranking.confidence} overlap@5={rows[-1]['overlap_at_5']:.2f}")
+
+    def summarize(subset: List[Dict]) -> Dict[str, Any]:
+        if not subset:
+            return {"repos": 0}
+        n = len(subset)
+        return {
+            "repos": n,
+            "mean_overlap_at_5": round(sum(r["overlap_at_5"] for r in subset) / n, 3),
+            "mean_jaccard": round(sum(r["jaccard"] for r in subset) / n, 3),
+            "top1_agreement": round(sum(r["top1_match"] for r in subset) / n, 3),
+        }
+
+    buckets = {
+        f"{lo:.1f}-{min(hi, 1.0):.1f}": summarize([r for r in rows if lo <= r["confidence"] < hi])
+        for lo, hi in CONFIDENCE_BUCKETS
+    }
+    return {"overall": summarize(rows), "by_confidence": buckets, "repos": rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the Stage 2 file ranker against LLM file selection.")
+    parser.add_argument("--usernames", default="", help="Comma-separated GitHub usernames (default: Woxsen candidates)")
+    parser.add_argument("--limit", type=int, default=10, help="Number of candidates to sample from the DB")
+    parser.add_argument("--repos-per-user", type=int, default=3)
+    parser.add_argument("--out", default="", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    inputs = load_inputs([u for u in args.usernames.split(",") if u], args.limit)
+    report = compare(inputs["usernames"], inputs["jd_text"], args.repos_per_user)
+
+    logger.info(f"Overall: {json.dumps(report['overall'])}")
+    for bucket, stats in report["by_confidence"].items():
+        logger.info(f"Confidence {bucket}: {json.dumps(stats)}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report written to {args.out}")
@@ -2,7 +2,7 @@ import urllib.request
 import json
 
 try:
-    req = urllib.request.Request('http://localhost:8000/api/force-evaluate/C001', method='POST', data=b"{}")
+    req = urllib.request.Request('http://localhost:8000/api/force-evaluate/C001?wait=true', method='POST', data=b"{}")
     req.add_header('Content-Type', 'application/json')
     response = urllib.request.urlopen(req)
     print(response.read().decode('utf-8'))
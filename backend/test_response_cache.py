@@ -0,0 +1,104 @@
+"""
+Check for the ETag/304 handling and the versioned response cache behind the read routes.
+
+Covers routes._etag_matches (weak and strong tags, lists, "*", mismatches) and
+VersionedResponseCache: a body is only served at the data version it was rendered at, a new
+version replaces it, LRU eviction keeps recently read keys, and the counters add up.
+
+    python test_response_cache.py          # from the backend directory; exit code 1 on failure
+"""
+import os
+import sys
+
+backend_dir = os.path.abspath(os.path.dirname(__file__))
+project_root = os.path.abspath(os.path.join(backend_dir, "../"))
+if backend_dir not in sys.path: sys.path.insert(0, backend_dir)
+if project_root not in sys.path: sys.path.insert(0, project_root)
+
+from app.api.routes import _etag_matches
+from app.services.response_cache import VersionedResponseCache
+
+VERSION = "3-17"
+
+
+def check_etag_matches():
+    cases = [
+        (None, False),
+        ("", False),
+        (f'W/"{VERSION}"', True),
+        (f'"{VERSION}"', True),
+        (f'W/"1-1", W/"{VERSION}"', True),
+        (f' "x" ,W/"{VERSION}" ', True),
+        ("*", True),
+        ('W/"3-16"', False),
+        (f'W/"{VERSION}-old"', False),
+        ('W/"1-1", "2-2"', False),
+    ]
+    return [
+        f"If-None-Match {header!r}: got {not expected}, expected {expected}"
+        for header, expected in cases
+        if _etag_matches(header, VERSION) != expected
+    ]
+
+
+def check_versioning():
+    failures = []
+    cache = VersionedResponseCache()
+    if cache.get("/results?limit=50", "1") is not None:
+        failures.append("empty cache returned a body")
+    cache.put("/results?limit=50", "1", b"v1")
+    if cache.get("/results?limit=50", "1") != b"v1":
+        failures.append("body not served at the version it was rendered at")
+    if cache.get("/results?limit=50", "2") is not None:
+        failures.append("stale body served after a version bump")
+    if cache.get("/results?limit=20", "1") is not None:
+        failures.append("body served for another query string")
+    cache.put("/results?limit=50", "2", b"v2")
+    if cache.get("/results?limit=50", "1") is not None or cache.get("/results?limit=50", "2") != b"v2":
+        failures.append("new version did not replace the old body")
+    stats = cache.stats()
+    if (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) != (2, 4, 1, 2):
+        failures.append(f"stats {stats}")
+    cache.record_not_modified()
+    if cache.stats()["not_modified"] != 1:
+        failures.append("not_modified not counted")
+    cache.clear()
+    if cache.stats()["entries"] != 0 or cache.get("/results?limit=50", "2") is not None:
+        failures.append("clear() kept entries")
+    return failures
+
+
+def check_lru_eviction():
+    failures = []
+    cache = VersionedResponseCache(max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, "1", key.encode())
+    cache.get("a", "1")  # a is now the most recently used
+    cache.put("d", "1", b"d")
+    present = {key for key in ("a", "b", "c", "d") if cache.get(key, "1") is not None}
+    if present != {"a", "c", "d"}:
+        failures.append(f"after eviction kept {sorted(present)}, expected ['a', 'c', 'd']")
+    return failures
+
+
+CHECKS = {
+    "If-None-Match matching": check_etag_matches,
+    "bodies are served only at their data version": check_versioning,
+    "LRU eviction": check_lru_eviction,
+}
+
+
+def main():
+    failed = 0
+    for name, check in CHECKS.items():
+        problems = check()
+        print(f"[{'FAIL' if problems else 'ok':4}] {name}")
+        for problem in problems[:5]:
+            print(f"         {problem}")
+        failed += bool(problems)
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} response cache checks passed.")
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
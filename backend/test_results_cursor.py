@@ -0,0 +1,135 @@
+"""
+Check for the opaque /results cursor and the keyset paging behind it.
+
+The cursor is the (score, leaderboard entry id) of the last row on the previous page,
+base64-encoded JSON (pipeline_service._encode_results_cursor / _decode_results_cursor). This
+script checks the round trip, that malformed cursors raise ValueError (the route turns that
+into a 400), and that walking a throwaway leaderboard page by page with
+repository.get_leaderboard_slice — plain and filtered, with many tied scores — visits every
+row exactly once, in ranking order.
+
+    python test_results_cursor.py          # from the backend directory; exit code 1 on failure
+"""
+import os
+import sys
+import json
+import base64
+import random
+import tempfile
+from types import SimpleNamespace
+
+backend_dir = os.path.abspath(os.path.dirname(__file__))
+project_root = os.path.abspath(os.path.join(backend_dir, "../"))
+if backend_dir not in sys.path: sys.path.insert(0, backend_dir)
+if project_root not in sys.path: sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.migrations import run_migrations
+from app.db import repository
+from app.db.models import Candidate, LeaderboardEntry
+from app.services.pipeline_service import _encode_results_cursor, _decode_results_cursor
+
+ENTRIES = 137
+PAGE_SIZE = 10
+
+
+def _b64(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def check_round_trip():
+    failures = []
+    for score, entry_id in [(72.5, 40), (0, 1), (100, 987654)]:
+        decoded = _decode_results_cursor(_encode_results_cursor(SimpleNamespace(score=score, id=entry_id)))
+        if decoded != (float(score), entry_id) or not isinstance(decoded[0], float):
+            failures.append(f"({score}, {entry_id}) decoded as {decoded!r}")
+    return failures
+
+
+def check_malformed():
+    failures = []
+    for cursor in ["", "not base64 !!", _b64({}), _b64([1]), _b64(["high", 3]), _b64([1, 2, 3]), _b64(None)]:
+        try:
+            decoded = _decode_results_cursor(cursor)
+        except ValueError:
+            continue
+        failures.append(f"{cursor!r} accepted as {decoded!r}")
+    return failures
+
+
+def _walk(db, jd_id, **filters):
+    """Every page's entries, following next cursors the way get_results_page builds them."""
+    seen, after = [], None
+    while True:
+        entries, total = repository.get_leaderboard_slice(db, jd_id, after=after, limit=PAGE_SIZE + 1, **filters)
+        seen.extend(entries[:PAGE_SIZE])
+        if len(entries) <= PAGE_SIZE:
+            return seen, total
+        after = _decode_results_cursor(_encode_results_cursor(entries[PAGE_SIZE - 1]))
+
+
+def check_keyset_paging():
+    failures = []
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'cursor_check.db')}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            jd_id = repository.create_job_description(db, "Cursor check JD").id
+            candidates = [Candidate(name=f"C{i}", email=f"c{i}@example.com") for i in range(ENTRIES)]
+            db.add_all(candidates)
+            db.flush()
+            db.add_all([
+                LeaderboardEntry(
+                    jd_id=jd_id, candidate_id=cand.id, display_id=f"C{i}", name=cand.name,
+                    score=float(rng.choice([90, 75, 75.5, 60, 60, 60, 42])),  # heavy ties
+                    stage=rng.choice(["stage1", "stage2"]),
+                )
+                for i, cand in enumerate(candidates)
+            ])
+            db.commit()
+
+            all_rows = db.query(LeaderboardEntry).filter(LeaderboardEntry.jd_id == jd_id).all()
+            for label, filters, keep in [
+                ("unfiltered", {}, lambda e: True),
+                ("stage2", {"stage": "stage2"}, lambda e: e.stage == "stage2"),
+                ("score 60..75.5", {"min_score": 60, "max_score": 75.5}, lambda e: 60 <= e.score <= 75.5),
+            ]:
+                expected = sorted((e for e in all_rows if keep(e)), key=lambda e: (-e.score, -e.id))
+                seen, total = _walk(db, jd_id, **filters)
+                if [e.id for e in seen] != [e.id for e in expected]:
+                    failures.append(f"{label}: pages visit {len(seen)} rows ({len(set(e.id for e in seen))} distinct), expected {len(expected)} in ranking order")
+                if total != len(expected):
+                    failures.append(f"{label}: total {total}, expected {len(expected)}")
+        finally:
+            db.close()
+            engine.dispose()
+    return failures
+
+
+CHECKS = {
+    "cursor round trip": check_round_trip,
+    "malformed cursors raise ValueError": check_malformed,
+    "keyset pages cover the board once, in order": check_keyset_paging,
+}
+
+
+def main():
+    failed = 0
+    for name, check in CHECKS.items():
+        problems = check()
+        print(f"[{'FAIL' if problems else 'ok':4}] {name}")
+        for problem in problems[:5]:
+            print(f"         {problem}")
+        failed += bool(problems)
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} results cursor checks passed.")
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,166 @@
+"""
+Replay check for the delta-encoded NDJSON streams (app/services/stream_delta.py).
+
+Simulates a Stage 1 style run (600 candidates scored in batches of 5) followed by Stage 2
+style rescoring, encodes every batch with StreamDeltaEncoder, round-trips each frame through
+JSON and applies it the way the frontend's applyStreamFrame does (ScreeningContext.jsx).
+After every frame the client's board must equal StreamRanking.ranking() and the server's
+evaluations. Also checks the snapshot cadence, the final `complete` frame, a client that
+joins late, and that ?format=full yields the same client state.
+
+    python test_stream_delta.py          # from the backend directory; exit code 1 on failure
+"""
+import os
+import sys
+import json
+import random
+
+backend_dir = os.path.abspath(os.path.dirname(__file__))
+if backend_dir not in sys.path: sys.path.insert(0, backend_dir)
+
+from app.services.stream_delta import StreamDeltaEncoder, SNAPSHOT_EVERY
+from app.services.stream_ranking import StreamRanking
+
+CANDIDATES = 600
+BATCH_SIZE = 5
+
+
+def apply_stream_frame(prev, data):
+    """Python port of applyStreamFrame: replace on full/snapshot frames, merge deltas."""
+    full = data.get("partial_results") or data.get("results") or data.get("snapshot")
+    if full:
+        return {
+            "ranking": full.get("ranking") or (prev or {}).get("ranking") or [],
+            "evaluations": {**(prev or {}).get("evaluations", {}), **(full.get("evaluations") or {})},
+        }
+    if "delta" not in data:
+        return prev
+
+    delta = data["delta"]
+    entries = {entry["candidate_id"]: entry for entry in (prev or {}).get("ranking", [])}
+    for entry in delta["ranking"]:
+        entries[entry["candidate_id"]] = entry
+    for candidate_id, rank in delta["moves"]:
+        if candidate_id in entries:
+            entries[candidate_id] = {**entries[candidate_id], "rank": rank}
+    return {
+        "ranking": sorted(entries.values(), key=lambda entry: entry["rank"]),
+        "evaluations": {**(prev or {}).get("evaluations", {}), **delta["evaluations"]},
+    }
+
+
+def simulate(mode, seed=7):
+    """Yield (frame as received by the client, server ranking, server evaluations) per frame."""
+    rng = random.Random(seed)
+    board = StreamRanking()
+    encoder = StreamDeltaEncoder(mode)
+    evaluations = {}
+    ids = [f"R{i:04d}" for i in range(CANDIDATES)]
+
+    def emit(frame):
+        return json.loads(json.dumps(frame)), json.loads(json.dumps(board.ranking())), json.loads(json.dumps(evaluations))
+
+    # Stage 1: new candidates arrive, many with tied scores
+    for start in range(0, CANDIDATES, BATCH_SIZE):
+        for cand_id in ids[start:start + BATCH_SIZE]:
+            score = rng.randint(0, 100)
+            board.upsert(cand_id, score, name=cand_id.lower())
+            evaluations[cand_id] = {"overall_score": score, "github_score": 0}
+            encoder.touch(cand_id)
+        yield emit(encoder.frame(board.ranking(), evaluations))
+
+    # Stage 2: existing candidates rescored, moving others without touching them
+    for _ in range(40):
+        for cand_id in rng.sample(ids[:60], BATCH_SIZE):
+            score = rng.randint(0, 100)
+            board.upsert(cand_id, score)
+            evaluations[cand_id] = {**evaluations[cand_id], "overall_score": score, "github_score": rng.randint(0, 100)}
+            encoder.touch(cand_id)
+        yield emit(encoder.frame(board.ranking(), evaluations))
+
+    yield emit(encoder.final(board.ranking(), evaluations))
+
+
+def board_of(state):
+    return [(entry["candidate_id"], entry["rank"], entry["score"]) for entry in state["ranking"]]
+
+
+def check_delta_replay():
+    failures = []
+    client, kinds, moves = None, [], 0
+    for n, (frame, ranking, evaluations) in enumerate(simulate("delta"), 1):
+        kinds.append("snapshot" if "snapshot" in frame else "delta")
+        moves += len(frame.get("delta", {}).get("moves", []))
+        client = apply_stream_frame(client, frame)
+        if board_of(client) != board_of({"ranking": ranking}):
+            failures.append(f"frame {n}: ranking differs from StreamRanking.ranking()")
+        if client["evaluations"] != evaluations:
+            failures.append(f"frame {n}: evaluations differ")
+    if not frame.get("complete"):
+        failures.append("last frame is not flagged complete")
+
+    expected = ["snapshot" if (n - 1) % SNAPSHOT_EVERY == 0 else "delta" for n in range(1, len(kinds) + 1)]
+    if kinds != expected:
+        failures.append(f"snapshot cadence: got snapshots at {[n for n, k in enumerate(kinds, 1) if k == 'snapshot']}")
+    if not moves:
+        failures.append("no delta frame carried moves (simulation does not exercise them)")
+    return failures
+
+
+def check_late_joiner():
+    """A client that starts mid-run ignores deltas until a snapshot, then stays in sync."""
+    failures = []
+    client, synced = None, False
+    for n, (frame, ranking, evaluations) in enumerate(simulate("delta"), 1):
+        if n < SNAPSHOT_EVERY // 2:
+            continue  # not connected yet
+        if not synced and "snapshot" not in frame:
+            continue
+        synced = True
+        client = apply_stream_frame(client, frame)
+        if board_of(client) != board_of({"ranking": ranking}):
+            failures.append(f"frame {n}: late client out of sync")
+    if not synced:
+        failures.append("late client never saw a snapshot")
+    return failures
+
+
+def check_full_parity():
+    """?format=full and the default delta format leave the client with the same state."""
+    delta_client = full_client = None
+    full_kinds = []
+    for frame, _, _ in simulate("delta"):
+        delta_client = apply_stream_frame(delta_client, frame)
+    for frame, _, _ in simulate("full"):
+        full_kinds.append(next(iter(frame)))
+        full_client = apply_stream_frame(full_client, frame)
+
+    failures = []
+    if board_of(delta_client) != board_of(full_client) or delta_client["evaluations"] != full_client["evaluations"]:
+        failures.append("delta and full formats end in different client states")
+    if full_kinds[-1] != "results" or set(full_kinds[:-1]) != {"partial_results"}:
+        failures.append(f"full format frame kinds: {sorted(set(full_kinds))}")
+    return failures
+
+
+CHECKS = {
+    "delta replay matches the server board after every frame": check_delta_replay,
+    "late joiner resynchronises at the next snapshot": check_late_joiner,
+    "format=full parity": check_full_parity,
+}
+
+
+def main():
+    failed = 0
+    for name, check in CHECKS.items():
+        problems = check()
+        print(f"[{'FAIL' if problems else 'ok':4}] {name}")
+        for problem in problems[:5]:
+            print(f"         {problem}")
+        failed += bool(problems)
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} stream delta checks passed.")
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,49 @@
+"""
+Cooperative cancellation for pipeline runs.
+
+Scorer and agent work runs in worker threads (sync httpx / LLM clients), which asyncio
+cannot interrupt. A CancelToken is shared by the run and its threads instead: the owner
+calls cancel() (e.g. when the streaming client disconnects) and the workers check the
+token before each LLM or GitHub call, so nothing new is started once a run is abandoned.
+Calls already in flight finish; their results are still checkpointed.
+"""
+import threading
+from typing import Dict, Optional
+
+
+class RunCancelled(Exception):
+    """Raised at a cancellation checkpoint once the run's token is cancelled."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Run cancelled: {reason}")
+        self.reason = reason
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+        # Calls not made because the token was already cancelled, by kind ("llm", "github", ...)
+        self._skipped: Dict[str, int] = {}
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        with self._lock:
+            if self.reason is None:
+                self.reason = reason
+        self._event.set()
+
+    def check(self, kind: str = "call"):
+        """Checkpoint before an expensive call: raises RunCancelled (and counts the skip) once cancelled."""
+        if self._event.is_set():
+            with self._lock:
+                self._skipped[kind] = self._skipped.get(kind, 0) + 1
+            raise RunCancelled(self.reason or "cancelled")
+
+    def skipped(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._skipped)
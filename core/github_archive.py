@@ -0,0 +1,98 @@
+"""
+GitHub Archive Fetcher
+Streams a repository tarball once and pulls out only the requested paths.
+
+Used by Stage 2 when several files are needed from a small repo: one archive request
+replaces N sequential raw downloads (plus their main → master fallbacks). The archive
+is decompressed as it arrives — nothing is written to disk — and the download is
+aborted as soon as every wanted path has been seen or the byte cap is exceeded.
+"""
+import io
+import tarfile
+from typing import Dict, Iterable, Iterator, Optional
+
+import httpx
+
+from core.github_rate_governor import github_governor
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArchiveTooLarge(Exception):
+    """Raised when the streamed archive exceeds the configured byte cap."""
+
+
+class _CappedStream(io.RawIOBase):
+    """Read-only file object over an iterator of bytes chunks, enforcing a byte cap."""
+
+    def __init__(self, chunks: Iterator[bytes], max_bytes: int):
+        self._chunks = chunks
+        self._buffer = b""
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                return 0
+            self.bytes_read += len(chunk)
+            if self.bytes_read > self._max_bytes:
+                raise ArchiveTooLarge(f"archive exceeded {self._max_bytes} bytes")
+            self._buffer = chunk
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def fetch_archive_files(
+    client: httpx.Client,
+    username: str,
+    repo_name: str,
+    paths: Iterable[str],
+    max_bytes: int,
+    ref: Optional[str] = None,
+    max_file_bytes: int = 200_000,
+) -> Dict[str, bytes]:
+    """
+    Stream `username/repo_name`'s tarball and return {path: raw bytes} for the wanted paths.
+    Paths missing from the archive are simply absent from the result.
+    Raises ArchiveTooLarge past `max_bytes` of compressed data.
+    """
+    wanted = set(paths)
+    found: Dict[str, bytes] = {}
+    url = f"https://api.github.com/repos/{username}/{repo_name}/tarball"
+    if ref:
+        url += f"/{ref}"
+
+    with github_governor.stream(client, url, follow_redirects=True) as resp:
+        if resp.status_code != 200:
+            logger.warning(f"[ARCHIVE] {username}/{repo_name} tarball returned {resp.status_code}")
+            return found
+
+        stream = _CappedStream(resp.iter_bytes(), max_bytes)
+        with tarfile.open(fileobj=io.BufferedReader(stream), mode="r|gz") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # Members are prefixed with "<owner>-<repo>-<sha>/"
+                _, _, rel_path = member.name.partition("/")
+                if rel_path not in wanted:
+                    continue
+                fobj = tar.extractfile(member)
+                if fobj is not None:
+                    found[rel_path] = fobj.read(max_file_bytes)
+                if len(found) == len(wanted):
+                    break
+
+        logger.info(
+            f"[ARCHIVE] {username}/{repo_name}: extracted {len(found)}/{len(wanted)} files "
+            f"from {stream.bytes_read // 1024}KB streamed"
+        )
+    return found
@@ -0,0 +1,127 @@
+"""
+Persistent GitHub Response Cache
+SQLite-backed key/value store for Stage 2's GitHub reads (repo lists, trees, file contents).
+
+Shared by interactive Stage 2 runs and the background prefetcher, so work done off-peak
+turns into cache hits when HR is waiting. Entries carry their fetch time; each read passes
+the maximum age it accepts, so freshness policy stays with the caller.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Absolute so the API server and the prefetcher share one file regardless of working directory
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "backend", "storage", "github_cache.db")
+
+
+class GitHubCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS github_cache (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    username TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_github_cache_username ON github_cache (username)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, kind: str, key: str, max_age: float) -> Optional[Any]:
+        """Cached value for (kind, key) if fetched within `max_age` seconds, else None."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value, fetched_at FROM github_cache WHERE kind = ? AND key = ?", (kind, key)
+                ).fetchone()
+                if row and time.time() - row[1] <= max_age:
+                    self.hits += 1
+                    return json.loads(row[0])
+                self.misses += 1
+        except Exception as e:
+            logger.warning(f"[GITHUB CACHE] Read failed for {kind}:{key}: {e}")
+        return None
+
+    def put(self, kind: str, key: str, username: str, value: Any):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO github_cache (kind, key, username, value, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, key, username.lower(), json.dumps(value), time.time()),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"[GITHUB CACHE] Write failed for {kind}:{key}: {e}")
+
+    def freshness(self, usernames: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Per username and kind: entry count plus oldest/newest fetch age in seconds."""
+        names = [u.lower() for u in usernames if u]
+        if not names:
+            return {}
+        now = time.time()
+        report: Dict[str, Dict[str, Any]] = {u: {} for u in names}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                rows = conn.execute(
+                    f"""SELECT username, kind, COUNT(*), MIN(fetched_at), MAX(fetched_at)
+                        FROM github_cache WHERE username IN ({",".join("?" * len(chunk))})
+                        GROUP BY username, kind""",
+                    chunk,
+                ).fetchall()
+                for username, kind, count, oldest, newest in rows:
+                    report[username][kind] = {
+                        "entries": count,
+                        "oldest_age_s": round(now - oldest),
+                        "newest_age_s": round(now - newest),
+                    }
+        return report
+
+    def purge_older_than(self, max_age: float) -> int:
+        with self._lock:
+            conn = self._connect()
+            cur = conn.execute("DELETE FROM github_cache WHERE fetched_at < ?", (time.time() - max_age,))
+            conn.commit()
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Shared per process; SQLite handles the backend and prefetcher processes writing concurrently
+github_cache = GitHubCache()
+
+
+def cache_key(username: str, repo_name: str = "", path: str = "") -> str:
+    """GitHub owner/repo names are case-insensitive; file paths are not."""
+    key = username.lower()
+    if repo_name:
+        key += f"/{repo_name.lower()}"
+    if path:
+        key += f":{path}"
+    return key
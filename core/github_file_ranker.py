@@ -0,0 +1,173 @@
+"""
+Deterministic GitHub File Ranker
+Scores repository paths in-process so Stage 2 only asks the LLM to pick files
+when the heuristic choice is ambiguous.
+
+Signals per path:
+  - extension (source code over config/docs)
+  - directory (src/, app/, core/ ... over docs/, examples/)
+  - depth and blob size (avoid stubs, vendored blobs, deeply nested noise)
+  - path tokens overlapping JD keywords
+  - penalties for tests and boilerplate
+"""
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+EXTENSION_WEIGHTS = {
+    ".py": 3.0, ".go": 2.8, ".rs": 2.8, ".ts": 2.8, ".tsx": 2.5, ".js": 2.5, ".jsx": 2.2,
+    ".java": 2.5, ".kt": 2.3, ".scala": 2.3, ".cs": 2.2, ".cpp": 2.2, ".cc": 2.2, ".c": 2.0,
+    ".swift": 2.2, ".rb": 2.0, ".php": 1.8, ".ipynb": 2.0, ".sql": 1.2, ".sh": 0.8,
+    ".yml": 0.5, ".yaml": 0.5, ".toml": 0.4, ".md": 0.3, ".html": 0.3, ".json": 0.2, ".txt": 0.1,
+}
+PREFERRED_DIRS = {
+    "src", "app", "core", "lib", "api", "server", "backend", "services", "service", "models",
+    "agents", "agent", "pipeline", "pipelines", "ml", "engine", "pkg", "internal", "cmd", "routes",
+}
+LOW_SIGNAL_DIRS = {"docs", "doc", "examples", "example", "samples", "scripts", "migrations", "vendor", "third_party", "assets", "static", "public"}
+TEST_DIRS = {"test", "tests", "__tests__", "spec", "specs", "testing"}
+TEST_NAME_RE = re.compile(r"(^test_|_test\.|\.test\.|\.spec\.|^conftest\.py$)")
+BOILERPLATE_NAMES = {
+    "__init__.py", "setup.py", "setup.cfg", "manage.py", "wsgi.py", "asgi.py", "settings.py",
+    "config.py", "constants.py", "requirements.txt", "package.json", "tsconfig.json",
+    "dockerfile", "makefile", "readme.md", "vite.config.js", "webpack.config.js", "babel.config.js",
+    "serviceworker.js", "reportwebvitals.js", "setuptests.js", "main.jsx", "index.jsx",
+}
+JD_STOPWORDS = {
+    "and", "the", "with", "for", "you", "our", "are", "will", "have", "experience", "years",
+    "team", "work", "working", "strong", "knowledge", "ability", "skills", "using", "such",
+    "this", "that", "from", "role", "job", "must", "should", "etc", "including", "good",
+}
+TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+
+STRONG_SCORE = 4.0
+# Blob size (bytes) that most looks like a real module; sampling prefers sizes near it
+TYPICAL_SOURCE_SIZE = 6000
+
+
+@dataclass
+class FileRanking:
+    selected: List[str]
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ordered_paths(self) -> List[str]:
+        return sorted(self.scores, key=lambda p: self.scores[p], reverse=True)
+
+
+def _tokens(text: str) -> List[str]:
+    text = CAMEL_RE.sub(r"\1 \2", text).lower()
+    return [t for t in TOKEN_SPLIT_RE.split(text) if len(t) >= 2]
+
+
+def jd_keywords(jd_text: str) -> set:
+    """Lower-cased JD terms worth matching against path tokens."""
+    return {t for t in _tokens(jd_text or "") if len(t) >= 3 and t not in JD_STOPWORDS}
+
+
+def score_path(path: str, size: int, keywords: set) -> float:
+    parts = path.split("/")
+    basename = parts[-1]
+    lower_name = basename.lower()
+    dirs = {d.lower() for d in parts[:-1]}
+    _, dot, ext = basename.rpartition(".")
+    ext = f".{ext.lower()}" if dot else ""
+
+    score = EXTENSION_WEIGHTS.get(ext, 0.0)
+
+    if dirs & PREFERRED_DIRS:
+        score += 1.0
+    if dirs & LOW_SIGNAL_DIRS:
+        score -= 1.0
+
+    depth = len(parts) - 1
+    if depth > 4:
+        score -= 0.25 * (depth - 4)
+
+    if size:
+        if size < 300:
+            score -= 1.5
+        elif 1500 <= size <= 30000:
+            score += 1.0
+        elif size > 60000:
+            score -= 0.5
+
+    if keywords:
+        overlap = len(set(_tokens(path)) & keywords)
+        score += min(overlap * 1.2, 3.0)
+
+    if dirs & TEST_DIRS or TEST_NAME_RE.search(lower_name):
+        score -= 2.5
+    if lower_name in BOILERPLATE_NAMES:
+        score -= 2.0
+
+    return round(score, 3)
+
+
+def rank_files(files: List[Tuple[str, int]], jd_text: str, top_k: int = 5) -> FileRanking:
+    """
+    Rank (path, size) pairs and return the top_k picks with a 0-1 confidence.
+
+    Confidence is high when every pick is a strong source file and there is a clear
+    gap to the next-best path; low when picks are weak or the cut-off is a coin toss.
+    """
+    keywords = jd_keywords(jd_text)
+    scores = {path: score_path(path, size, keywords) for path, size in files}
+    ordered = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+    picks = [(p, s) for p, s in ordered if s > 0][:top_k]
+
+    if not picks:
+        return FileRanking(selected=[], confidence=0.0, scores=scores)
+
+    if len(ordered) <= top_k:
+        # Nothing to choose between — the ranker only filters out noise
+        return FileRanking(selected=[p for p, _ in picks], confidence=1.0, scores=scores)
+
+    strong_frac = sum(1 for _, s in picks if s >= STRONG_SCORE) / top_k
+    cutoff = picks[-1][1]
+    next_best = ordered[len(picks)][1] if len(ordered) > len(picks) else 0.0
+    gap = max(0.0, cutoff - next_best)
+    confidence = strong_frac * (0.7 + 0.3 * min(1.0, gap))
+
+    return FileRanking(
+        selected=[p for p, _ in picks],
+        confidence=round(confidence, 3),
+        scores=scores,
+    )
+
+
+def sample_paths(files: List[Tuple[str, int]], k: int = 200) -> List[str]:
+    """
+    Pick k representative paths from a large tree for the LLM prompt.
+
+    Paths are grouped by their first two directories and drawn round-robin, so every
+    area of a monorepo is represented instead of the first k alphabetically. Within a
+    group, files closest to a typical module size come first (stubs and vendored blobs last).
+    """
+    if len(files) <= k:
+        return [path for path, _ in files]
+
+    groups: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+    for path, size in files:
+        groups["/".join(path.split("/")[:-1][:2])].append((path, size))
+
+    def size_rank(entry: Tuple[str, int]) -> float:
+        size = entry[1] or 1
+        return abs(math.log(size) - math.log(TYPICAL_SOURCE_SIZE))
+
+    # Largest areas first so they win the tie when there are more groups than slots
+    queues = [sorted(g, key=size_rank) for _, g in sorted(groups.items(), key=lambda kv: -len(kv[1]))]
+    picked: List[str] = []
+    depth = 0
+    while len(picked) < k:
+        for queue in queues:
+            if depth < len(queue):
+                picked.append(queue[depth][0])
+                if len(picked) == k:
+                    break
+        depth += 1
+    return sorted(picked)
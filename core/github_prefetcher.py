@@ -0,0 +1,150 @@
+"""
+Off-peak GitHub Prefetcher.
+Walks woxsen_candidates.github_url on a schedule and warms the persistent GitHub cache
+(repo lists, trees and the files the deterministic ranker would pick) so an interactive
+Stage 2 run is mostly cache hits.
+
+Runs as its own process, like the RAG evaluation worker:
+    python core/github_prefetcher.py            # loop every GITHUB_PREFETCH_INTERVAL seconds
+    python core/github_prefetcher.py --once     # single pass
+
+Quota etiquette: it stops a pass while the core API has fewer than
+GITHUB_PREFETCH_MIN_REMAINING requests left, leaving the headroom to interactive runs.
+"""
+import sys
+import time
+import argparse
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# Need to make sure backend is in path if script is run directly
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config.logging_config import get_logger
+from app.db.database import SessionLocal
+from app.db import repository
+from core.settings import settings
+from core.github_rate_governor import github_governor, RateLimitExhausted
+from core.github_file_ranker import rank_files
+from core.github_cache import github_cache
+from core.stage2_github_agent import Stage2GitHubAgent
+from core.single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+API_BUCKET = "api.github.com"
+
+
+def in_prefetch_window(window: str, hour: Optional[int] = None) -> bool:
+    """True if `hour` falls in a "start-end" local-hour window (wrapping past midnight); empty = always."""
+    if not window:
+        return True
+    hour = datetime.now().hour if hour is None else hour
+    try:
+        start, end = (int(h) for h in window.split("-", 1))
+    except ValueError:
+        logger.warning(f"[PREFETCH] Ignoring malformed GITHUB_PREFETCH_WINDOW={window!r}")
+        return True
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+class GitHubPrefetcher:
+    def __init__(self, agent: Optional[Stage2GitHubAgent] = None):
+        self.agent = agent or Stage2GitHubAgent()
+        # Refresh entries past half their TTL so interactive runs rarely see an expired one
+        self.agent.cache_age_factor = 0.5
+
+    def quota_low(self) -> bool:
+        state = github_governor.snapshot().get(API_BUCKET, {})
+        remaining = state.get("remaining")
+        return remaining is not None and remaining < settings.GITHUB_PREFETCH_MIN_REMAINING
+
+    def prefetch_user(self, username: str, jd_text: str) -> Dict[str, int]:
+        """Warm repos → trees → likely-relevant files for one GitHub user."""
+        stats = {"repos": 0, "files": 0}
+        repos = self.agent._fetch_repos(username)
+        for repo in self.agent._select_repos(repos):
+            tree = self.agent._fetch_tree(username, repo["name"])
+            paths = self.agent._filter_tree(tree)
+            if not paths:
+                continue
+            sizes = {item.get("path"): item.get("size", 0) for item in tree}
+            # A wider pick than Stage 2's top 5 so LLM-selected files are usually covered too
+            ranking = rank_files([(p, sizes.get(p, 0)) for p in paths], jd_text, top_k=settings.GITHUB_PREFETCH_FILES_PER_REPO)
+            files = self.agent._fetch_files(username, repo, ranking.selected)
+            stats["repos"] += 1
+            stats["files"] += sum(1 for c in files.values() if c)
+        return stats
+
+    def run_cycle(self) -> Dict[str, Any]:
+        summary = {"users": 0, "repos": 0, "files": 0, "skipped": 0, "stopped_early": False}
+        if not in_prefetch_window(settings.GITHUB_PREFETCH_WINDOW):
+            logger.info(f"[PREFETCH] Outside window {settings.GITHUB_PREFETCH_WINDOW} — skipping pass")
+            return summary
+
+        db = SessionLocal()
+        try:
+            jd = repository.get_active_jd(db)
+            jd_text = jd.jd_text if jd else ""
+            targets = [(wc.roll_number, wc.github_url) for wc in repository.list_woxsen_candidates(db) if wc.github_url]
+        finally:
+            db.close()
+
+        # SingleFlight keeps completed results for its lifetime: a fresh one per pass, or every
+        # later pass would re-store the first pass's downloads instead of refetching them
+        self.agent.flight = SingleFlight()
+        seen = set()
+        start = time.time()
+        for roll_number, github_url in targets:
+            username = self.agent.extract_github_username(github_url)
+            if not username or username.lower() in seen:
+                summary["skipped"] += 1
+                continue
+            seen.add(username.lower())
+
+            if self.quota_low():
+                logger.info(f"[PREFETCH] GitHub quota below {settings.GITHUB_PREFETCH_MIN_REMAINING} — ending pass early")
+                summary["stopped_early"] = True
+                break
+            try:
+                stats = self.prefetch_user(username, jd_text)
+            except RateLimitExhausted as e:
+                logger.warning(f"[PREFETCH] {e} — ending pass early")
+                summary["stopped_early"] = True
+                break
+            except Exception as e:
+                logger.error(f"[PREFETCH] Failed for {roll_number} ({username}): {e}")
+                continue
+            summary["users"] += 1
+            summary["repos"] += stats["repos"]
+            summary["files"] += stats["files"]
+
+        summary["duration_s"] = round(time.time() - start, 1)
+        summary["cache"] = github_cache.stats()
+        logger.info(f"[PREFETCH] Pass complete: {summary}")
+        return summary
+
+    def run_forever(self):
+        logger.info(f"[PREFETCH] Starting GitHub prefetcher (interval {settings.GITHUB_PREFETCH_INTERVAL:.0f}s)")
+        while True:
+            try:
+                self.run_cycle()
+            except Exception as e:
+                logger.error(f"[PREFETCH ERROR] Pass failed: {e}")
+            time.sleep(settings.GITHUB_PREFETCH_INTERVAL)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the Stage 2 GitHub cache for all Woxsen candidates.")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    args = parser.parse_args()
+
+    prefetcher = GitHubPrefetcher()
+    if args.once:
+        prefetcher.run_cycle()
+    else:
+        prefetcher.run_forever()
@@ -0,0 +1,248 @@
+"""
+GitHub Rate-Limit Governor
+Shared, thread-safe pacing for every GitHub request made during a run.
+
+Reads the primary-limit headers (X-RateLimit-Remaining / X-RateLimit-Reset) and the
+secondary-limit Retry-After header from each response. When quota runs low, callers
+are spaced out across the remaining window; when it runs out, callers pause until the
+reset instead of failing into an empty result. Delays are attributed to the candidate
+currently being evaluated so Stage 2 can tell "delayed" apart from "truly empty".
+"""
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from core.settings import settings
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Candidate the current thread/task is working for (set by Stage 2 per evaluation)
+current_candidate: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "github_current_candidate", default=None
+)
+
+# GitHub asks clients to wait at least a minute on a secondary limit without Retry-After
+SECONDARY_LIMIT_DEFAULT_WAIT = 60.0
+
+
+class RateLimitExhausted(Exception):
+    """Raised when honouring the rate limit would exceed the governor's max wait."""
+
+    def __init__(self, wait_seconds: float, bucket: str):
+        super().__init__(f"GitHub rate limit on {bucket} needs {wait_seconds:.0f}s wait")
+        self.wait_seconds = wait_seconds
+        self.bucket = bucket
+
+
+@dataclass
+class _BucketState:
+    remaining: Optional[int] = None
+    limit: Optional[int] = None
+    reset_at: float = 0.0
+    blocked_until: float = 0.0
+    next_slot: float = 0.0
+
+
+class GitHubRateGovernor:
+    """
+    Tracks remaining quota per host and paces requests across concurrent candidates.
+    """
+
+    def __init__(
+        self,
+        reserve: int = settings.GITHUB_RATE_RESERVE,
+        pace_below: int = settings.GITHUB_RATE_PACE_BELOW,
+        max_wait_seconds: float = settings.GITHUB_RATE_MAX_WAIT,
+        max_retries: int = 3,
+    ):
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _BucketState] = {}
+        self._delays: Dict[str, float] = {}
+        self._exhausted: set = set()
+
+    # ──────────────────────────────────────────────
+    # Candidate attribution
+    # ──────────────────────────────────────────────
+
+    @contextmanager
+    def track(self, candidate_id: str):
+        """Attribute all GitHub waits inside the block to `candidate_id`."""
+        token = current_candidate.set(candidate_id)
+        with self._lock:
+            self._delays.setdefault(candidate_id, 0.0)
+            self._exhausted.discard(candidate_id)
+        try:
+            yield
+        finally:
+            current_candidate.reset(token)
+
+    def candidate_report(self, candidate_id: str) -> Dict[str, Any]:
+        """Delay/exhaustion attributed to `candidate_id`; reading it clears the candidate's entry."""
+        with self._lock:
+            rate_limited = candidate_id in self._exhausted
+            self._exhausted.discard(candidate_id)
+            return {
+                "rate_limit_delay_s": round(self._delays.pop(candidate_id, 0.0), 1),
+                "rate_limited": rate_limited,
+            }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current quota per bucket, for logging and status endpoints."""
+        now = time.time()
+        with self._lock:
+            return {
+                bucket: {
+                    "remaining": state.remaining,
+                    "limit": state.limit,
+                    "resets_in_s": max(0, round(state.reset_at - now)) if state.reset_at else None,
+                    "blocked_for_s": max(0, round(state.blocked_until - now)),
+                }
+                for bucket, state in self._buckets.items()
+            }
+
+    def _record_delay(self, seconds: float):
+        cand = current_candidate.get()
+        if cand:
+            with self._lock:
+                self._delays[cand] = self._delays.get(cand, 0.0) + seconds
+
+    def _record_exhausted(self):
+        cand = current_candidate.get()
+        if cand:
+            with self._lock:
+                self._exhausted.add(cand)
+
+    # ──────────────────────────────────────────────
+    # Pacing
+    # ──────────────────────────────────────────────
+
+    def acquire(self, bucket: str):
+        """Block until a request may be sent on `bucket`."""
+        while True:
+            with self._lock:
+                now = time.time()
+                state = self._buckets.setdefault(bucket, _BucketState())
+                wait = 0.0
+                paced = False
+
+                if state.blocked_until > now:
+                    wait = state.blocked_until - now
+                elif state.remaining is not None and state.reset_at > now:
+                    if state.remaining <= self.reserve:
+                        wait = state.reset_at - now + 1.0
+                    elif state.remaining < self.pace_below:
+                        # Spread what is left of the quota evenly over the window
+                        interval = (state.reset_at - now) / max(state.remaining - self.reserve, 1)
+                        slot = max(state.next_slot, now)
+                        state.next_slot = slot + interval
+                        wait = slot - now
+                        paced = True
+
+                if wait <= 0 or paced:
+                    if state.remaining is not None:
+                        state.remaining -= 1
+                if wait <= 0:
+                    return
+
+            if wait > self.max_wait_seconds:
+                self._record_exhausted()
+                raise RateLimitExhausted(wait, bucket)
+
+            if not paced:
+                logger.warning(
+                    f"[GITHUB RATE] {bucket} quota exhausted — pausing {wait:.0f}s "
+                    f"(candidate: {current_candidate.get() or 'n/a'})"
+                )
+            self._record_delay(wait)
+            time.sleep(wait)
+            if paced:
+                return
+
+    def observe(self, resp: httpx.Response, bucket: str) -> bool:
+        """
+        Update quota from response headers.
+        Returns True if the response was rate-limited and the request should be retried.
+        """
+        headers = resp.headers
+        now = time.time()
+        limited = False
+
+        with self._lock:
+            state = self._buckets.setdefault(bucket, _BucketState())
+            if "X-RateLimit-Remaining" in headers:
+                try:
+                    state.remaining = int(headers["X-RateLimit-Remaining"])
+                    state.limit = int(headers.get("X-RateLimit-Limit", state.limit or 0)) or state.limit
+                    state.reset_at = float(headers.get("X-RateLimit-Reset", state.reset_at))
+                except ValueError:
+                    pass
+
+            if resp.status_code in (403, 429):
+                retry_after = headers.get("Retry-After")
+                if retry_after is not None:
+                    try:
+                        state.blocked_until = now + float(retry_after)
+                    except ValueError:
+                        state.blocked_until = now + SECONDARY_LIMIT_DEFAULT_WAIT
+                    limited = True
+                elif state.remaining == 0:
+                    state.blocked_until = max(state.reset_at + 1.0, now + 1.0)
+                    limited = True
+                elif resp.status_code == 429 or "rate limit" in resp.text.lower():
+                    state.blocked_until = now + SECONDARY_LIMIT_DEFAULT_WAIT
+                    limited = True
+
+        return limited
+
+    def request(self, client: httpx.Client, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the governor, pausing and retrying on rate limits."""
+        bucket = urlparse(url).netloc or "api.github.com"
+        for attempt in range(self.max_retries + 1):
+            self.acquire(bucket)
+            resp = client.request(method, url, **kwargs)
+            if not self.observe(resp, bucket):
+                return resp
+            logger.warning(
+                f"[GITHUB RATE] {resp.status_code} rate-limited on {bucket} "
+                f"(attempt {attempt + 1}/{self.max_retries + 1})"
+            )
+        self._record_exhausted()
+        raise RateLimitExhausted(self.max_wait_seconds, bucket)
+
+    def get(self, client: httpx.Client, url: str, **kwargs) -> httpx.Response:
+        return self.request(client, "GET", url, **kwargs)
+
+    @contextmanager
+    def stream(self, client: httpx.Client, url: str, **kwargs):
+        """Streaming GET through the governor (for archives); yields the open response."""
+        bucket = urlparse(url).netloc or "api.github.com"
+        for attempt in range(self.max_retries + 1):
+            self.acquire(bucket)
+            with client.stream("GET", url, **kwargs) as resp:
+                if resp.status_code in (403, 429):
+                    resp.read()  # error bodies are small; observe() inspects the text
+                if self.observe(resp, bucket):
+                    logger.warning(
+                        f"[GITHUB RATE] {resp.status_code} rate-limited on {bucket} "
+                        f"(attempt {attempt + 1}/{self.max_retries + 1})"
+                    )
+                    continue
+                yield resp
+                return
+        self._record_exhausted()
+        raise RateLimitExhausted(self.max_wait_seconds, bucket)
+
+
+# Shared per process so every candidate draws from the same quota view
+github_governor = GitHubRateGovernor()
@@ -5,6 +5,8 @@ import base64
 from typing import List, Dict, Tuple
 from core.llm_service import LLMService
 from core.settings import settings
+from core.github_rate_governor import github_governor, RateLimitExhausted
+from core.utils.notebook_normalizer import normalize_notebook, is_notebook, MAX_NOTEBOOK_BYTES
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -36,12 +38,14 @@ class GitHubVerifier:
         logger.info(f"Fetching GitHub repos for {username}")
         try:
             with httpx.Client(headers=self.headers) as client:
-                response = client.get(url, timeout=15.0)
+                response = github_governor.get(client, url, timeout=15.0)
                 if response.status_code == 404:
                     logger.warning(f"GitHub user {username} not found")
                     return []
                 response.raise_for_status()
                 return response.json()
+        except RateLimitExhausted:
+            raise  # deferred by the caller, not an empty profile
         except Exception as e:
             logger.error(f"Failed to fetch repos for {username}: {str(e)}")
             return []
@@ -51,13 +55,15 @@ class GitHubVerifier:
         url = f"https://api.github.com/repos/{username}/{repo_name}/readme"
         try:
             with httpx.Client(headers=self.headers) as client:
-                response = client.get(url, timeout=10.0)
+                response = github_governor.get(client, url, timeout=10.0)
                 if response.status_code == 404:
                     return ""
                 response.raise_for_status()
                 data = response.json()
                 content_b64 = data.get("content", "")
                 return base64.b64decode(content_b64).decode("utf-8", errors="ignore")
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch README for {repo_name}: {str(e)}")
             return ""
@@ -70,13 +76,15 @@ class GitHubVerifier:
         
         try:
             with httpx.Client(headers=self.headers) as client:
-                response = client.get(url, timeout=10.0)
+                response = github_governor.get(client, url, timeout=10.0)
                 if response.status_code != 200:
                     return []
                 contents = response.json()
                 
                 # Filter for priority files
                 files = [c for c in contents if c.get("type") == "file"]
+                # Oversized notebooks are mostly embedded outputs; skip the download entirely
+                files = [f for f in files if not (is_notebook(f.get("name", "")) and f.get("size", 0) > MAX_NOTEBOOK_BYTES)]
                 priority_files = [f for f in files if any(f.get("name", "").endswith(ext) for ext in target_exts)]
                 other_files = [f for f in files if f not in priority_files]
                 
@@ -86,9 +94,14 @@ class GitHubVerifier:
                     f_url = f.get("download_url")
                     if f_url:
                         # Headers are important even for download urls if they are private or hit limits
-                        f_res = client.get(f_url, timeout=10.0)
+                        f_res = github_governor.get(client, f_url, timeout=10.0)
                         if f_res.status_code == 200:
-                            snippets.append(f_res.text[:2000]) # Cap snippet size
+                            text = f_res.text
+                            if is_notebook(f.get("name", "")):
+                                text = normalize_notebook(text)
+                            snippets.append(text[:2000]) # Cap snippet size
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch snippets for {repo_name}: {str(e)}")
             
@@ -12,4 +12,45 @@ class Settings:
     LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "true")
     RETRIEVAL_VERSION = "v1.0.1"
 
+    # GitHub rate-limit governor
+    GITHUB_RATE_RESERVE = int(os.getenv("GITHUB_RATE_RESERVE", "5"))
+    GITHUB_RATE_PACE_BELOW = int(os.getenv("GITHUB_RATE_PACE_BELOW", "200"))
+    GITHUB_RATE_MAX_WAIT = float(os.getenv("GITHUB_RATE_MAX_WAIT", "900"))
+
+    # Stage 2 file selection: below this ranker confidence, fall back to the LLM
+    STAGE2_RANKER_MIN_CONFIDENCE = float(os.getenv("STAGE2_RANKER_MIN_CONFIDENCE", "0.6"))
+
+    # Stage 2 archive fetch: one tarball instead of N raw requests for small repos
+    STAGE2_ARCHIVE_MAX_REPO_KB = int(os.getenv("STAGE2_ARCHIVE_MAX_REPO_KB", "5000"))
+    STAGE2_ARCHIVE_MAX_BYTES = int(os.getenv("STAGE2_ARCHIVE_MAX_BYTES", str(8 * 1024 * 1024)))
+    STAGE2_ARCHIVE_MIN_FILES = int(os.getenv("STAGE2_ARCHIVE_MIN_FILES", "3"))
+
+    # Stage 2 concurrency: simultaneous connections per GitHub host across all candidates
+    STAGE2_MAX_CONNECTIONS_PER_HOST = int(os.getenv("STAGE2_MAX_CONNECTIONS_PER_HOST", "8"))
+    # Extra Trees API calls allowed to complete a truncated (monorepo) tree
+    STAGE2_TREE_SUBTREE_BUDGET = int(os.getenv("STAGE2_TREE_SUBTREE_BUDGET", "15"))
+
+    # Persistent GitHub cache (seconds a cached repo list / tree / file stays usable)
+    GITHUB_CACHE_REPOS_TTL = float(os.getenv("GITHUB_CACHE_REPOS_TTL", str(6 * 3600)))
+    GITHUB_CACHE_TREE_TTL = float(os.getenv("GITHUB_CACHE_TREE_TTL", str(24 * 3600)))
+    GITHUB_CACHE_FILE_TTL = float(os.getenv("GITHUB_CACHE_FILE_TTL", str(24 * 3600)))
+
+    # Background GitHub prefetcher
+    GITHUB_PREFETCH_INTERVAL = float(os.getenv("GITHUB_PREFETCH_INTERVAL", str(6 * 3600)))
+    GITHUB_PREFETCH_WINDOW = os.getenv("GITHUB_PREFETCH_WINDOW", "")  # e.g. "22-6" (local hours); empty = any time
+    GITHUB_PREFETCH_MIN_REMAINING = int(os.getenv("GITHUB_PREFETCH_MIN_REMAINING", "1000"))
+    GITHUB_PREFETCH_FILES_PER_REPO = int(os.getenv("GITHUB_PREFETCH_FILES_PER_REPO", "8"))
+
+    # Stage 2 rubric: "unified" (one JD-aware call) or "split" (cached code review + per-JD relevance)
+    STAGE2_RUBRIC_MODE = os.getenv("STAGE2_RUBRIC_MODE", "unified")
+    STAGE2_RELEVANCE_MODEL = os.getenv("STAGE2_RELEVANCE_MODEL", "gemini-2.5-flash")
+    STAGE2_CODE_RUBRIC_TTL = float(os.getenv("STAGE2_CODE_RUBRIC_TTL", str(30 * 24 * 3600)))
+
+    # Stage 2 code excerpts (~4 chars/token): per file in the rubric prompt / in stored evidence
+    STAGE2_EXCERPT_TOKEN_BUDGET = int(os.getenv("STAGE2_EXCERPT_TOKEN_BUDGET", "750"))
+    STAGE2_SNIPPET_TOKEN_BUDGET = int(os.getenv("STAGE2_SNIPPET_TOKEN_BUDGET", "500"))
+
+    # Background pipeline runs (/screen, upload-and-screen, force-evaluate): concurrent runs per process
+    PIPELINE_RUN_WORKERS = int(os.getenv("PIPELINE_RUN_WORKERS", "2"))
+
 settings = Settings()
@@ -0,0 +1,59 @@
+"""
+Single-Flight Call Coalescing
+Concurrent callers asking for the same key share one in-flight execution.
+
+Scoped to one object lifetime (Stage 2 creates one per run): completed results are kept
+so later candidates in the same run reuse them. Only calls that raise are not memoized,
+so callers must raise on transient failures (Stage 2's fetchers raise GitHubUnavailable)
+rather than return an empty value that would be shared as the answer. Each key also records which candidates asked for it, which is how Stage 2
+reports candidates pointing at the same GitHub user or repos.
+"""
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._requesters: Dict[Hashable, Set[str]] = defaultdict(set)
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, requester: Optional[str] = None) -> Any:
+        """Run fn(*args) once per key; concurrent and later callers get the same result."""
+        with self._lock:
+            if requester:
+                self._requesters[key].add(requester)
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if owner:
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+                with self._lock:
+                    self._calls.pop(key, None)
+        return future.result()
+
+    def shared_keys(self, kind: str) -> Dict[Hashable, List[str]]:
+        """Keys of the given kind (first tuple element) requested by more than one caller."""
+        with self._lock:
+            return {
+                key: sorted(requesters)
+                for key, requesters in self._requesters.items()
+                if isinstance(key, tuple) and key and key[0] == kind and len(requesters) > 1
+            }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced}
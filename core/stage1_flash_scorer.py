@@ -14,6 +14,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from langsmith import traceable
 from core.settings import settings
+from core.cancellation import CancelToken
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -151,12 +152,20 @@ Evaluate this candidate against the JD. Return ONLY valid JSON."""
         candidate_id: str,
         resume_json: str,
         job_description: str,
+        cancel_token: Optional[CancelToken] = None,
     ) -> Dict[str, Any]:
-        """Async wrapper for concurrent batch processing."""
+        """
+        Async wrapper for concurrent batch processing.
+        Raises RunCancelled instead of calling the LLM if `cancel_token` fired before the thread got to it.
+        """
         import asyncio
-        return await asyncio.to_thread(
-            self.score_candidate, candidate_id, resume_json, job_description
-        )
+
+        def run():
+            if cancel_token is not None:
+                cancel_token.check("llm")
+            return self.score_candidate(candidate_id, resume_json, job_description)
+
+        return await asyncio.to_thread(run)
 
     def _error_result(self, candidate_id: str, error: str) -> Dict[str, Any]:
         """Returns a safe fallback result on error."""
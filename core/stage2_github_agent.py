@@ -4,20 +4,35 @@ Uses GitHub Trees API + Gemini 2.5 Pro to intelligently analyze candidate code.
 
 Flow:
   1. Fetch repo list → pick top 3 repos by relevance
-  2. Fetch file tree via Trees API → LLM selects top 5 high-signal files
-  3. Download raw file content
-  4. LLM rubric scoring with [reponame-filename] citations
+  2. Per repo, concurrently: fetch file tree via Trees API → select top 5 high-signal files
+  3. Download file content (archive or raw, fanned out under a per-host limit)
+  4. LLM rubric scoring with [reponame-filename] citations once all repos are in
 """
 import json
 import httpx
 import asyncio
 import base64
 import re
-from typing import Dict, Any, List, Optional
+import hashlib
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from langsmith import traceable
 from core.settings import settings
+from core.github_rate_governor import github_governor, RateLimitExhausted, current_candidate
+from core.github_file_ranker import rank_files, sample_paths
+from core.github_archive import fetch_archive_files, ArchiveTooLarge
+from core.single_flight import SingleFlight
+from core.cancellation import CancelToken, RunCancelled
+from core.github_cache import github_cache, cache_key
+from core.utils.code_excerpter import excerpt_code, is_generated_or_minified
+from core.utils.notebook_normalizer import normalize_notebook, is_notebook
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -30,7 +45,94 @@ NOISE_PATTERNS = {
     "node_modules", "__pycache__", ".next", "dist", "build",
     ".vscode", ".idea", ".git",
 }
-NOISE_EXTENSIONS = {".css", ".scss", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".woff", ".woff2", ".ttf", ".map"}
+NOISE_EXTENSIONS = frozenset({".css", ".scss", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".woff", ".woff2", ".ttf", ".map"})
+NOISE_DIRS = frozenset({"node_modules", "__pycache__", ".git", "dist", "build", ".next"})
+MAX_BLOB_SIZE = 100_000
+# Paths shown to the LLM file selector
+LLM_TREE_SAMPLE = 200
+
+
+def _is_noise_dir(name: str) -> bool:
+    return name in NOISE_DIRS or name in NOISE_PATTERNS
+
+
+def _is_source_blob(item: Dict) -> bool:
+    """Single pass over one tree entry: blob type, size, noise name/extension/directory."""
+    if item.get("type") != "blob" or item.get("size", 0) > MAX_BLOB_SIZE:
+        return False
+    parts = item.get("path", "").split("/")
+    basename = parts[-1]
+    if basename in NOISE_PATTERNS:
+        return False
+    _, dot, ext = basename.rpartition(".")
+    if dot and f".{ext}" in NOISE_EXTENSIONS:
+        return False
+    return NOISE_DIRS.isdisjoint(parts[:-1])
+
+# Repo name/description hints for AI work (repo selection bonus, ai_projects count)
+AI_REPO_KEYWORDS = ["ai", "ml", "llm", "rag", "langchain", "pytorch", "tensorflow", "agent", "transformer", "neural", "deep"]
+
+# Bump when the code-rubric prompt changes so cached JD-independent scores are recomputed
+CODE_RUBRIC_VERSION = "v1"
+
+# Full source is fetched (tree filter already drops >100KB blobs) and excerpted afterwards
+MAX_SOURCE_CHARS = 100_000
+
+
+def _source_text(path: str, text: str) -> str:
+    """Downloaded file → source text; notebooks are reduced to their cells before the cap."""
+    if is_notebook(path):
+        text = normalize_notebook(text)
+    return text[:MAX_SOURCE_CHARS]
+
+
+def _parse_json_response(content: str) -> Dict[str, Any]:
+    """LLM reply → dict, tolerating ```json fences."""
+    content = content.strip()
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    return json.loads(content)
+
+
+def _rubric_points(value: Any, cap: int = 25) -> int:
+    """One rubric criterion from LLM output: numeric text accepted, anything else 0, clamped to 0..cap."""
+    try:
+        return max(0, min(cap, int(float(value))))
+    except (TypeError, ValueError):
+        return 0
+
+
+def extract_github_username(url: str) -> Optional[str]:
+    if not url:
+        return None
+    match = re.search(r"github\.com/([a-zA-Z0-9_-]+)", url)
+    return match.group(1) if match else None
+
+
+# Per-host connection limit shared by every candidate/repo thread in the process
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+@contextmanager
+def _host_slot(url: str):
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        sem = _host_semaphores.setdefault(host, threading.BoundedSemaphore(settings.STAGE2_MAX_CONNECTIONS_PER_HOST))
+    with sem:
+        yield
+
+
+def _submit_in_context(pool: ThreadPoolExecutor, fn, *args) -> Future:
+    """Submit to a pool while keeping contextvars (rate-limit attribution) intact."""
+    ctx = contextvars.copy_context()
+    return pool.submit(ctx.run, fn, *args)
+
+
+class GitHubUnavailable(Exception):
+    """A repo list or tree could not be fetched (timeout, 5xx, bad payload): retry later, don't score as empty."""
 
 
 class Stage2GitHubAgent:
@@ -46,110 +148,268 @@ class Stage2GitHubAgent:
             temperature=0.1,
             convert_system_message_to_human=True,
         )
+        # Cheaper model for the per-JD relevance pass in split rubric mode
+        self.relevance_llm = ChatGoogleGenerativeAI(
+            model=settings.STAGE2_RELEVANCE_MODEL,
+            google_api_key=settings.GOOGLE_API_KEY,
+            temperature=0.1,
+            convert_system_message_to_human=True,
+        )
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "AI-Recruitment-Stage2",
         }
         if settings.GITHUB_TOKEN:
             self.headers["Authorization"] = f"token {settings.GITHUB_TOKEN}"
+        # One agent per Stage 2 run: identical GitHub/LLM work across candidates is shared
+        self.flight = SingleFlight()
+        # Fraction of each cache TTL this agent accepts; the prefetcher refreshes early (<1.0)
+        self.cache_age_factor = 1.0
+        # Set by the run owner; checked before every GitHub / LLM step
+        self.cancel_token: Optional[CancelToken] = None
+
+    def _check_cancelled(self, kind: str):
+        if self.cancel_token is not None:
+            self.cancel_token.check(kind)
+
+    def _coalesce(self, key: tuple, fn, *args):
+        """Share one in-flight (or completed) call per key across this run's candidates."""
+        self._check_cancelled(key[0])
+        return self.flight.do(key, fn, *args, requester=current_candidate.get())
+
+    def shared_github_report(self) -> Dict[str, Any]:
+        """GitHub users / repos that more than one candidate pointed at during this run."""
+        return {
+            "shared_usernames": {key[1]: cands for key, cands in self.flight.shared_keys("repos").items()},
+            "shared_repos": {f"{key[1]}/{key[2]}": cands for key, cands in self.flight.shared_keys("tree").items()},
+            "calls": self.flight.stats(),
+        }
 
     # ──────────────────────────────────────────────
     # GitHub API helpers
     # ──────────────────────────────────────────────
 
     def extract_github_username(self, url: str) -> Optional[str]:
-        if not url:
-            return None
-        match = re.search(r"github\.com/([a-zA-Z0-9_-]+)", url)
-        return match.group(1) if match else None
+        return extract_github_username(url)
+
+    def _read_through(self, kind: str, key: str, username: str, max_age: float, fetch, *args):
+        """Serve from the persistent GitHub cache when fresh; otherwise fetch and store non-empty results."""
+        cached = github_cache.get(kind, key, max_age * self.cache_age_factor)
+        if cached is not None:
+            return cached
+        value = fetch(*args)
+        if value:
+            github_cache.put(kind, key, username, value)
+        return value
 
     def _fetch_repos(self, username: str) -> List[Dict]:
+        return self._read_through(
+            "repos", cache_key(username), username, settings.GITHUB_CACHE_REPOS_TTL, self._fetch_repos_live, username
+        )
+
+    def _fetch_repos_live(self, username: str) -> List[Dict]:
         """Fetch all public repos for a user."""
         url = f"https://api.github.com/users/{username}/repos?per_page=100&sort=updated"
         try:
-            with httpx.Client(headers=self.headers, timeout=15.0) as client:
-                resp = client.get(url)
+            with _host_slot(url), httpx.Client(headers=self.headers, timeout=15.0) as client:
+                resp = github_governor.get(client, url)
                 if resp.status_code == 404:
                     logger.warning(f"[STAGE 2] GitHub user {username} not found")
                     return []
                 resp.raise_for_status()
                 return resp.json()
+        except RateLimitExhausted:
+            raise
         except Exception as e:
+            # Raised, not returned as []: SingleFlight and the cache only keep successful results
             logger.error(f"[STAGE 2] Failed to fetch repos for {username}: {e}")
-            return []
+            raise GitHubUnavailable(f"repos for {username}: {e}") from e
 
     def _fetch_tree(self, username: str, repo_name: str, branch: str = "main") -> List[Dict]:
-        """Fetch the full recursive file tree via Trees API."""
+        return self._read_through(
+            "tree", cache_key(username, repo_name), username, settings.GITHUB_CACHE_TREE_TTL,
+            self._fetch_tree_live, username, repo_name, branch,
+        )
+
+    def _fetch_tree_live(self, username: str, repo_name: str, branch: str = "main") -> List[Dict]:
+        """Fetch the full recursive file tree via Trees API (completing truncated trees)."""
         url = f"https://api.github.com/repos/{username}/{repo_name}/git/trees/{branch}?recursive=1"
         try:
-            with httpx.Client(headers=self.headers, timeout=15.0) as client:
-                resp = client.get(url)
+            with _host_slot(url), httpx.Client(headers=self.headers, timeout=15.0) as client:
+                resp = github_governor.get(client, url)
                 if resp.status_code == 404:
                     # Try 'master' branch
                     url2 = f"https://api.github.com/repos/{username}/{repo_name}/git/trees/master?recursive=1"
-                    resp = client.get(url2)
-                if resp.status_code != 200:
-                    return []
+                    resp = github_governor.get(client, url2)
+                if resp.status_code in (404, 409):
+                    return []  # no such branch, or an empty repo
+                resp.raise_for_status()
                 data = resp.json()
-                return data.get("tree", [])
+                if not data.get("truncated"):
+                    return data.get("tree", [])
+                return list(self._walk_truncated_tree(client, username, repo_name, data))
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             logger.error(f"[STAGE 2] Failed to fetch tree for {repo_name}: {e}")
-            return []
+            raise GitHubUnavailable(f"tree of {username}/{repo_name}: {e}") from e
+
+    def _walk_truncated_tree(self, client: httpx.Client, username: str, repo_name: str, root: Dict) -> Iterator[Dict]:
+        """
+        Yield the entries of a tree the API truncated.
+
+        Keeps the partial listing, then walks subtrees by sha (skipping noise dirs): each
+        subtree is tried recursively first and only split further if it is itself truncated.
+        Stops after STAGE2_TREE_SUBTREE_BUDGET extra requests. A subtree request that fails is
+        skipped, so one timeout costs that subtree, not the entries already walked.
+        """
+        seen = set()
+        for item in root.get("tree", []):
+            seen.add(item.get("path"))
+            yield item
+
+        base = f"https://api.github.com/repos/{username}/{repo_name}/git/trees"
+        pending = deque([("", root.get("sha"), False)])
+        budget = settings.STAGE2_TREE_SUBTREE_BUDGET
+        while pending and budget > 0:
+            prefix, sha, recursive = pending.popleft()
+            if not sha:
+                continue
+            budget -= 1
+            try:
+                resp = github_governor.get(client, f"{base}/{sha}" + ("?recursive=1" if recursive else ""))
+                if resp.status_code != 200:
+                    continue
+                data = resp.json()
+            except RateLimitExhausted:
+                raise
+            except Exception as e:
+                logger.warning(f"[STAGE 2] Skipping subtree {prefix or '/'} of {username}/{repo_name}: {e}")
+                continue
+            if recursive and data.get("truncated"):
+                # Still too big: list this level only and descend one directory at a time
+                pending.appendleft((prefix, sha, False))
+                continue
+            for item in data.get("tree", []):
+                path = f"{prefix}{item.get('path', '')}"
+                if item.get("type") == "tree":
+                    if not recursive and not _is_noise_dir(path.rsplit("/", 1)[-1]):
+                        pending.append((f"{path}/", item.get("sha"), True))
+                    continue
+                if path not in seen:
+                    seen.add(path)
+                    yield {**item, "path": path}
+
+        if pending:
+            logger.warning(f"[STAGE 2] Tree for {username}/{repo_name} still incomplete — {len(pending)} subtrees over budget")
+        else:
+            logger.info(f"[STAGE 2] Completed truncated tree for {username}/{repo_name} ({len(seen)} entries)")
 
     def _download_raw_file(self, username: str, repo_name: str, file_path: str, branch: str = "main") -> str:
         """Download raw file content from GitHub."""
         url = f"https://raw.githubusercontent.com/{username}/{repo_name}/{branch}/{file_path}"
         try:
-            with httpx.Client(headers=self.headers, timeout=10.0) as client:
-                resp = client.get(url)
+            with _host_slot(url), httpx.Client(headers=self.headers, timeout=10.0) as client:
+                resp = github_governor.get(client, url)
                 if resp.status_code == 404:
                     url2 = f"https://raw.githubusercontent.com/{username}/{repo_name}/master/{file_path}"
-                    resp = client.get(url2)
+                    resp = github_governor.get(client, url2)
                 if resp.status_code == 200:
-                    return resp.text[:4000]  # Cap at 4KB
+                    return _source_text(file_path, resp.text)
                 return ""
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             logger.error(f"[STAGE 2] Failed to download {file_path}: {e}")
             return ""
 
-    def _filter_tree(self, tree: List[Dict]) -> List[str]:
-        """Filter the tree to keep only meaningful source files."""
-        filtered = []
-        for item in tree:
-            if item.get("type") != "blob":
-                continue
-            path = item.get("path", "")
-            basename = path.split("/")[-1]
-
-            # Skip noise files
-            if basename in NOISE_PATTERNS:
-                continue
-            # Skip noise extensions
-            ext = "." + basename.split(".")[-1] if "." in basename else ""
-            if ext in NOISE_EXTENSIONS:
-                continue
-            # Skip paths containing noise dirs
-            if any(noise_dir in path.split("/") for noise_dir in ["node_modules", "__pycache__", ".git", "dist", "build", ".next"]):
-                continue
-            # Skip very large files (>100KB as indicated by size)
-            if item.get("size", 0) > 100000:
-                continue
+    def _use_archive(self, repo: Dict, file_count: int) -> bool:
+        """Archive mode pays off for several files from a repo small enough to stream whole."""
+        size_kb = repo.get("size", 0) or 0
+        return (
+            file_count >= settings.STAGE2_ARCHIVE_MIN_FILES
+            and 0 < size_kb <= settings.STAGE2_ARCHIVE_MAX_REPO_KB
+        )
 
-            filtered.append(path)
-        return filtered
+    def _fetch_files(self, username: str, repo: Dict, file_paths: List[str]) -> Dict[str, str]:
+        """Selected files from the persistent cache, fetching only the misses."""
+        repo_name = repo["name"]
+        contents: Dict[str, str] = {}
+        for path in file_paths:
+            cached = github_cache.get("file", cache_key(username, repo_name, path), settings.GITHUB_CACHE_FILE_TTL * self.cache_age_factor)
+            if cached is not None:
+                contents[path] = cached
+
+        missing = [p for p in file_paths if p not in contents]
+        if missing:
+            fetched = self._fetch_files_live(username, repo, missing)
+            for path, text in fetched.items():
+                if text:
+                    github_cache.put("file", cache_key(username, repo_name, path), username, text)
+            contents.update(fetched)
+        return contents
+
+    def _fetch_files_live(self, username: str, repo: Dict, file_paths: List[str]) -> Dict[str, str]:
+        """Fetch selected files via one streamed archive when worthwhile, else raw per file."""
+        repo_name = repo["name"]
+        contents: Dict[str, str] = {}
+
+        if self._use_archive(repo, len(file_paths)):
+            try:
+                with _host_slot("https://api.github.com"), httpx.Client(headers=self.headers, timeout=30.0) as client:
+                    raw = fetch_archive_files(
+                        client, username, repo_name, file_paths,
+                        max_bytes=settings.STAGE2_ARCHIVE_MAX_BYTES,
+                        ref=repo.get("default_branch"),
+                    )
+                contents = {p: _source_text(p, data.decode("utf-8", errors="ignore")) for p, data in raw.items()}
+            except RateLimitExhausted:
+                raise
+            except ArchiveTooLarge as e:
+                logger.info(f"[STAGE 2] Archive for {repo_name} too large ({e}) — falling back to raw files")
+            except Exception as e:
+                logger.warning(f"[STAGE 2] Archive fetch failed for {repo_name}: {e} — falling back to raw files")
+
+        missing = [p for p in file_paths if p not in contents]
+        if missing:
+            # Fan out; the per-host semaphore in _download_raw_file bounds real concurrency
+            with ThreadPoolExecutor(max_workers=len(missing), thread_name_prefix="stage2-file") as pool:
+                futures = {
+                    p: _submit_in_context(pool, self._coalesce, ("file", username.lower(), repo_name, p), self._download_raw_file, username, repo_name, p)
+                    for p in missing
+                }
+                for fpath, future in futures.items():
+                    contents[fpath] = future.result()
+        return contents
+
+    def _filter_tree(self, tree: Iterable[Dict]) -> List[str]:
+        """Filter the tree to keep only meaningful source files."""
+        return [item["path"] for item in tree if _is_source_blob(item)]
 
     # ──────────────────────────────────────────────
     # LLM-powered analysis
     # ──────────────────────────────────────────────
 
+    def _select_files(self, repo_name: str, tree: List[Dict], file_paths: List[str], jd_text: str) -> List[str]:
+        """Rank files locally; only ask the LLM when the ranker's top picks are low-confidence."""
+        sizes = {item.get("path"): item.get("size", 0) for item in tree}
+        ranking = rank_files([(p, sizes.get(p, 0)) for p in file_paths], jd_text)
+        if ranking.selected and ranking.confidence >= settings.STAGE2_RANKER_MIN_CONFIDENCE:
+            logger.info(f"[STAGE 2] Ranker selected files for {repo_name} (confidence={ranking.confidence})")
+            return ranking.selected
+
+        logger.info(f"[STAGE 2] Ranker unsure for {repo_name} (confidence={ranking.confidence}) — using LLM")
+        return self._llm_select_files(repo_name, file_paths, jd_text, sizes)
+
     @traceable(name="Stage 2 - LLM File Selection")
-    def _llm_select_files(self, repo_name: str, file_paths: List[str], jd_text: str) -> List[str]:
+    def _llm_select_files(self, repo_name: str, file_paths: List[str], jd_text: str, sizes: Optional[Dict[str, int]] = None) -> List[str]:
         """Use LLM to select the top 5 most JD-relevant files from a repo's file tree."""
         if not file_paths:
             return []
 
-        # Cap the file list to prevent token overflow
-        paths_str = "\n".join(file_paths[:200])
+        # Cap the file list to prevent token overflow, sampling across directories
+        sizes = sizes or {}
+        paths_str = "\n".join(sample_paths([(p, sizes.get(p, 0)) for p in file_paths], LLM_TREE_SAMPLE))
 
         system_prompt = """You are a technical recruiter's code analysis assistant.
 Given a repository's file tree and a job description, select the TOP 5 files that are most likely
@@ -210,16 +470,13 @@ Select the top 5 most relevant files. Return ONLY valid JSON."""
         repos_data: List[Dict],
     ) -> Dict[str, Any]:
         """Score the candidate's GitHub code against the JD with rubric and citations."""
-        # Build code evidence block
-        code_block = ""
-        for repo in repos_data:
-            for f in repo.get("files", []):
-                code_block += f"\n--- [{repo['name']}-{f['path']}] ---\n"
-                code_block += f["content"][:3000] + "\n"
-
+        code_block = self._build_code_block(repos_data)
         if not code_block.strip():
             return self._empty_result("No code files found")
 
+        if settings.STAGE2_RUBRIC_MODE == "split":
+            return self._split_rubric_score(candidate_id, jd_text, repos_data, code_block)
+
         system_prompt = """You are an enterprise-grade AI code reviewer for recruitment.
 Evaluate the candidate's GitHub code against the Job Description.
 
@@ -275,16 +532,171 @@ Evaluate this code against the JD. Return ONLY valid JSON."""
                     "metadata": {"candidate_id": candidate_id},
                 },
             )
-            content = response.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            return json.loads(content)
+            return _parse_json_response(response.content)
         except Exception as e:
             logger.error(f"[STAGE 2] LLM rubric scoring failed for {candidate_id}: {e}")
             return self._empty_result(str(e))
 
+    def _build_code_block(self, repos_data: List[Dict], field: str = "files") -> str:
+        code_block = ""
+        for repo in repos_data:
+            for f in repo.get(field, []):
+                code_block += f"\n--- [{repo['name']}-{f['path']}] ---\n"
+                code_block += f["content"] + "\n"  # already excerpted to the per-file token budget
+        return code_block
+
+    # ──────────────────────────────────────────────
+    # Split rubric: JD-independent code review (cached) + per-JD relevance
+    # ──────────────────────────────────────────────
+
+    def _select_review_files(self, tree: List[Dict], file_paths: List[str]) -> List[str]:
+        """Files for the JD-independent code review: the ranker's structural picks, no JD terms, no LLM."""
+        sizes = {item.get("path"): item.get("size", 0) for item in tree}
+        return rank_files([(p, sizes.get(p, 0)) for p in file_paths], "").selected
+
+    def _commit_set_key(self, repos_data: List[Dict], field: str = "review_files") -> str:
+        """Identity of the exact code being reviewed: repo, path and blob sha of every reviewed file."""
+        entries = sorted(
+            (repo["name"].lower(), f["path"], f.get("sha", ""))
+            for repo in repos_data for f in repo.get(field, [])
+        )
+        payload = json.dumps([CODE_RUBRIC_VERSION, settings.STAGE2_EXCERPT_TOKEN_BUDGET, entries])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _split_rubric_score(self, candidate_id: str, jd_text: str, repos_data: List[Dict], code_block: str) -> Dict[str, Any]:
+        """
+        github_score = cached code rubric (75) + fresh JD relevance (25).
+        The review reads the JD-independent file picks (review_files) so its cache key survives a JD
+        change; relevance reads the JD-selected files.
+        """
+        field = "review_files" if any(repo.get("review_files") for repo in repos_data) else "files"
+        key = self._commit_set_key(repos_data, field)
+        code_rubric = github_cache.get("code_rubric", key, settings.STAGE2_CODE_RUBRIC_TTL)
+        if code_rubric is not None:
+            logger.info(f"[STAGE 2] {candidate_id}: code rubric cache hit — JD relevance only")
+        else:
+            review_block = self._build_code_block(repos_data, field)
+            code_rubric = self._coalesce(("code_rubric", key), self._llm_code_rubric, candidate_id, review_block)
+            if code_rubric.get("github_status"):
+                return code_rubric  # LLM failure, already shaped as an empty result
+            github_cache.put("code_rubric", key, current_candidate.get() or candidate_id, code_rubric)
+
+        self._check_cancelled("jd_relevance")
+        relevance = self._llm_jd_relevance(candidate_id, jd_text, code_block)
+
+        rubric_scores = {
+            "code_quality": _rubric_points(code_rubric.get("code_quality")),
+            "jd_relevance": _rubric_points(relevance.get("jd_relevance")),
+            "complexity": _rubric_points(code_rubric.get("complexity")),
+            "best_practices": _rubric_points(code_rubric.get("best_practices")),
+        }
+        justification = " ".join(
+            s for s in (code_rubric.get("code_justification", ""), relevance.get("relevance_justification", "")) if s
+        )
+        return {
+            "github_score": sum(rubric_scores.values()),
+            "rubric_scores": rubric_scores,
+            "strengths": code_rubric.get("strengths", []) + relevance.get("strengths", []),
+            "weaknesses": code_rubric.get("weaknesses", []) + relevance.get("weaknesses", []),
+            "github_justification": justification,
+        }
+
+    @traceable(name="Stage 2 - LLM Code Rubric")
+    def _llm_code_rubric(self, candidate_id: str, code_block: str) -> Dict[str, Any]:
+        """JD-independent review: code_quality, complexity, best_practices."""
+        system_prompt = """You are an enterprise-grade AI code reviewer for recruitment.
+Evaluate the candidate's GitHub code on its own merits. There is no job description — do NOT judge relevance.
+
+RUBRIC (each 0-25):
+- code_quality: Clean code, proper structure, error handling, documentation
+- complexity: Sophistication of algorithms, architecture, and problem-solving
+- best_practices: Design patterns, testing, security, performance awareness
+
+RULES:
+1. Score ONLY what you can see in the code. Do NOT assume.
+2. Every strength and weakness MUST include a citation tag [reponame-filename] at the END.
+3. Be strict — tutorial-level code should score LOW.
+
+RESPONSE FORMAT (STRICT JSON — no markdown):
+{
+  "code_quality": <int 0-25>,
+  "complexity": <int 0-25>,
+  "best_practices": <int 0-25>,
+  "strengths": ["✔ <strength with specific code reference> [reponame-filename]"],
+  "weaknesses": ["⚠ <weakness with specific detail> [reponame-filename]"],
+  "code_justification": "<1-2 sentence summary of the code's engineering quality>"
+}"""
+
+        user_msg = f"""CANDIDATE'S CODE FROM GITHUB:
+{code_block[:12000]}
+
+Review this code. Return ONLY valid JSON."""
+
+        try:
+            response = self.llm.invoke(
+                [
+                    SystemMessage(content=system_prompt),
+                    HumanMessage(content=user_msg),
+                ],
+                config={
+                    "run_name": "stage2-code-rubric",
+                    "tags": ["stage2", "rubric-scoring", "code-rubric"],
+                    "metadata": {"candidate_id": candidate_id},
+                },
+            )
+            return _parse_json_response(response.content)
+        except Exception as e:
+            logger.error(f"[STAGE 2] Code rubric failed for {candidate_id}: {e}")
+            return self._empty_result(str(e))
+
+    @traceable(name="Stage 2 - LLM JD Relevance")
+    def _llm_jd_relevance(self, candidate_id: str, jd_text: str, code_block: str) -> Dict[str, Any]:
+        """Per-JD pass on the cheaper model: jd_relevance only."""
+        system_prompt = """You are a technical recruiter's code analysis assistant.
+Judge ONLY how well the candidate's code demonstrates the skills required by the Job Description.
+Code quality is scored elsewhere — ignore it.
+
+RUBRIC:
+- jd_relevance (0-25): 0 = unrelated to the JD, 25 = directly demonstrates its core requirements
+
+RULES:
+1. Score ONLY what you can see in the code.
+2. Every strength and weakness MUST include a citation tag [reponame-filename] at the END.
+
+RESPONSE FORMAT (STRICT JSON — no markdown):
+{
+  "jd_relevance": <int 0-25>,
+  "strengths": ["✔ <JD-relevant skill shown> [reponame-filename]"],
+  "weaknesses": ["⚠ <JD requirement not evidenced>"],
+  "relevance_justification": "<1 sentence on fit to the JD>"
+}
+Give at most 2 strengths and 2 weaknesses."""
+
+        user_msg = f"""JOB DESCRIPTION:
+{jd_text[:2000]}
+
+CANDIDATE'S CODE FROM GITHUB:
+{code_block[:12000]}
+
+Return ONLY valid JSON."""
+
+        try:
+            response = self.relevance_llm.invoke(
+                [
+                    SystemMessage(content=system_prompt),
+                    HumanMessage(content=user_msg),
+                ],
+                config={
+                    "run_name": "stage2-jd-relevance",
+                    "tags": ["stage2", "rubric-scoring", "jd-relevance"],
+                    "metadata": {"candidate_id": candidate_id},
+                },
+            )
+            return _parse_json_response(response.content)
+        except Exception as e:
+            logger.error(f"[STAGE 2] JD relevance scoring failed for {candidate_id}: {e}")
+            return {"jd_relevance": 0, "relevance_justification": f"JD relevance unavailable: {e}"}
+
     # ──────────────────────────────────────────────
     # Main evaluation pipeline
     # ──────────────────────────────────────────────
@@ -298,91 +710,75 @@ Evaluate this code against the JD. Return ONLY valid JSON."""
         username = self.extract_github_username(github_url)
         if not username:
             logger.warning(f"[STAGE 2] No GitHub username for {candidate_id}")
-            return self._empty_result("No GitHub URL found")
+            return self._empty_result("No GitHub URL found", status="no_github")
 
         logger.info(f"[STAGE 2] Evaluating {candidate_id} (GitHub: {username})")
 
-        # 1. Fetch repos
-        repos = self._fetch_repos(username)
-        if not repos:
-            return self._empty_result("No repositories found")
+        with github_governor.track(candidate_id):
+            try:
+                self._check_cancelled("candidate")
+                result = self._evaluate_user(candidate_id, username, jd_text)
+            except RateLimitExhausted as e:
+                logger.warning(f"[STAGE 2] {candidate_id}: deferred — {e}")
+                result = self._empty_result("GitHub rate limit exhausted — evaluation deferred", status="rate_limited")
+                result["github_username"] = username
+            except GitHubUnavailable as e:
+                logger.warning(f"[STAGE 2] {candidate_id}: deferred — {e}")
+                result = self._empty_result("GitHub unavailable — evaluation deferred", status="unavailable")
+                result["github_username"] = username
+            except RunCancelled as e:
+                logger.info(f"[STAGE 2] {candidate_id}: stopped — {e}")
+                result = self._empty_result("Evaluation cancelled", status="cancelled")
+                result["github_username"] = username
+
+        result.update(github_governor.candidate_report(candidate_id))
+        return result
 
-        # Pick top 3 repos by stars + recency
-        ai_keywords = ["ai", "ml", "llm", "rag", "langchain", "pytorch", "tensorflow", "agent", "transformer", "neural", "deep"]
+    def _select_repos(self, repos: List[Dict], limit: int = 3) -> List[Dict]:
+        """Pick top repos by stars + size, with a bonus for AI-related names/descriptions."""
         scored_repos = []
         for r in repos:
             name_desc = ((r.get("name") or "") + " " + (r.get("description") or "")).lower()
-            ai_bonus = 50 if any(k in name_desc for k in ai_keywords) else 0
+            ai_bonus = 50 if any(k in name_desc for k in AI_REPO_KEYWORDS) else 0
             score = (r.get("stargazers_count", 0) * 10) + (r.get("size", 0) / 100) + ai_bonus
             if not r.get("fork", False):
                 scored_repos.append((r, score))
 
         scored_repos.sort(key=lambda x: x[1], reverse=True)
-        top_repos = [r for r, _ in scored_repos[:3]]
+        return [r for r, _ in scored_repos[:limit]]
 
+    def _evaluate_user(self, candidate_id: str, username: str, jd_text: str) -> Dict[str, Any]:
+        """Repo selection → file selection → download → rubric for one GitHub user."""
+        # 1. Fetch repos
+        repos = self._coalesce(("repos", username.lower()), self._fetch_repos, username)
+        if not repos:
+            return self._empty_result("No repositories found")
+
+        top_repos = self._select_repos(repos)
         if not top_repos:
             return self._empty_result("No non-fork repositories found")
 
-        # 2. For each repo: fetch tree → LLM file selection → download files
+        # 2. All repos in parallel: fetch tree → file selection → download files
         repos_data = []
         code_evidence = []
         repo_links = []
 
-        for repo in top_repos:
-            repo_name = repo["name"]
-            repo_url = repo.get("html_url", f"https://github.com/{username}/{repo_name}")
-
-            logger.info(f"[STAGE 2] Analyzing repo: {username}/{repo_name}")
+        with ThreadPoolExecutor(max_workers=len(top_repos), thread_name_prefix="stage2-repo") as pool:
+            futures = [_submit_in_context(pool, self._analyze_repo, username, repo, jd_text) for repo in top_repos]
+            analyzed = [f.result() for f in futures]  # keeps repo order stable for the rubric prompt
 
-            # Fetch file tree
-            tree = self._fetch_tree(username, repo_name)
-            filtered_paths = self._filter_tree(tree)
-
-            if not filtered_paths:
-                logger.info(f"[STAGE 2] No meaningful files in {repo_name}")
+        for repo_result in analyzed:
+            if not repo_result:
                 continue
-
-            # LLM selects top 5 files
-            selected_files = self._llm_select_files(repo_name, filtered_paths, jd_text)
-            logger.info(f"[STAGE 2] Selected files from {repo_name}: {selected_files}")
-
-            # Download selected files
-            repo_files = []
-            for fpath in selected_files:
-                content = self._download_raw_file(username, repo_name, fpath)
-                if content:
-                    repo_files.append({
-                        "path": fpath,
-                        "content": content,
-                    })
-                    code_evidence.append({
-                        "repo_name": repo_name,
-                        "repo_url": repo_url,
-                        "file_path": fpath,
-                        "file_url": f"{repo_url}/blob/main/{fpath}",
-                        "code_snippet": content[:2000],
-                        "language": fpath.split(".")[-1] if "." in fpath else "text",
-                    })
-
-            repos_data.append({
-                "name": repo_name,
-                "url": repo_url,
-                "description": repo.get("description", ""),
-                "files": repo_files,
-            })
-
-            repo_links.append({
-                "name": repo_name,
-                "url": repo_url,
-                "description": repo.get("description", ""),
-                "stars": repo.get("stargazers_count", 0),
-                "language": repo.get("language", "Unknown"),
-            })
+            repos_data.append(repo_result["repo_data"])
+            code_evidence.extend(repo_result["code_evidence"])
+            repo_links.append(repo_result["repo_link"])
 
         if not repos_data:
             return self._empty_result("Could not fetch files from any repository")
 
         # 3. LLM rubric scoring
+        self._check_cancelled("rubric")
         scoring_result = self._llm_rubric_score(candidate_id, jd_text, repos_data)
 
         # 4. Package final output
@@ -397,19 +793,109 @@ Evaluate this code against the JD. Return ONLY valid JSON."""
             "repo_count": len(repos),
             "ai_projects": len([r for r in repos if any(
                 k in ((r.get("name") or "") + " " + (r.get("description") or "")).lower()
-                for k in ai_keywords
+                for k in AI_REPO_KEYWORDS
             )]),
             "github_username": username,
+            "github_status": "ok",
         }
 
         logger.info(f"[STAGE 2] {candidate_id}: GitHub Score={result['github_score']}")
         return result
 
+    def _analyze_repo(self, username: str, repo: Dict, jd_text: str) -> Optional[Dict[str, Any]]:
+        """Tree → file selection → download for one repo. Runs concurrently with its siblings."""
+        repo_name = repo["name"]
+        repo_url = repo.get("html_url", f"https://github.com/{username}/{repo_name}")
+
+        logger.info(f"[STAGE 2] Analyzing repo: {username}/{repo_name}")
+
+        owner = username.lower()
+
+        # Fetch file tree
+        tree = self._coalesce(("tree", owner, repo_name), self._fetch_tree, username, repo_name)
+        filtered_paths = self._filter_tree(tree)
+
+        if not filtered_paths:
+            logger.info(f"[STAGE 2] No meaningful files in {repo_name}")
+            return None
+
+        # Ranker (or LLM when unsure) selects top 5 files
+        jd_hash = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+        selected_files = self._coalesce(
+            ("select", owner, repo_name, jd_hash), self._select_files, repo_name, tree, filtered_paths, jd_text
+        )
+        logger.info(f"[STAGE 2] Selected files from {repo_name}: {selected_files}")
+
+        # Split rubric mode reviews code quality on picks that ignore the JD (cache key stable across JDs)
+        review_paths = []
+        if settings.STAGE2_RUBRIC_MODE == "split":
+            review_paths = self._coalesce(("review_select", owner, repo_name), self._select_review_files, tree, filtered_paths)
+        fetch_paths = list(dict.fromkeys(selected_files + review_paths))
+
+        # Download selected files (archive or raw, chosen per repo)
+        file_contents = self._coalesce(
+            ("files", owner, repo_name, tuple(fetch_paths)), self._fetch_files, username, repo, fetch_paths
+        )
+        blob_shas = {item.get("path"): item.get("sha") for item in tree}
+        excerpts = {}
+        for fpath in fetch_paths:
+            source = file_contents.get(fpath, "")
+            if not source:
+                continue
+            if is_generated_or_minified(fpath, source):
+                logger.info(f"[STAGE 2] Skipping generated/minified file {repo_name}/{fpath}")
+                continue
+            excerpts[fpath] = {
+                "path": fpath,
+                "content": excerpt_code(fpath, source, settings.STAGE2_EXCERPT_TOKEN_BUDGET),
+                "sha": blob_shas.get(fpath) or hashlib.sha1(source.encode("utf-8")).hexdigest(),
+            }
+
+        repo_files = [excerpts[fpath] for fpath in selected_files if fpath in excerpts]
+        review_files = [excerpts[fpath] for fpath in review_paths if fpath in excerpts]
+        code_evidence = []
+        for fpath in selected_files:
+            if fpath not in excerpts:
+                continue
+            source = file_contents[fpath]
+            code_evidence.append({
+                "repo_name": repo_name,
+                "repo_url": repo_url,
+                "file_path": fpath,
+                "file_url": f"{repo_url}/blob/main/{fpath}",
+                "code_snippet": excerpt_code(fpath, source, settings.STAGE2_SNIPPET_TOKEN_BUDGET),
+                "language": fpath.split(".")[-1] if "." in fpath else "text",
+            })
+
+        return {
+            "repo_data": {
+                "name": repo_name,
+                "url": repo_url,
+                "description": repo.get("description", ""),
+                "files": repo_files,
+                "review_files": review_files,
+            },
+            "repo_link": {
+                "name": repo_name,
+                "url": repo_url,
+                "description": repo.get("description", ""),
+                "stars": repo.get("stargazers_count", 0),
+                "language": repo.get("language", "Unknown"),
+            },
+            "code_evidence": code_evidence,
+        }
+
     async def evaluate_async(self, candidate_id: str, github_url: str, jd_text: str) -> Dict[str, Any]:
         """Async wrapper for concurrent batch processing."""
         return await asyncio.to_thread(self.evaluate, candidate_id, github_url, jd_text)
 
-    def _empty_result(self, reason: str) -> Dict[str, Any]:
+    def _empty_result(self, reason: str, status: str = "empty") -> Dict[str, Any]:
+        """
+        status distinguishes why there is no score:
+        "empty" (nothing to analyze), "no_github" (no URL), "rate_limited" / "unavailable"
+        (deferred by rate limits or a failed GitHub request, retry later) or "cancelled"
+        (run stopped before this candidate finished).
+        """
         return {
             "github_score": 0,
             "rubric_scores": {"code_quality": 0, "jd_relevance": 0, "complexity": 0, "best_practices": 0},
@@ -421,4 +907,5 @@ Evaluate this code against the JD. Return ONLY valid JSON."""
             "repo_count": 0,
             "ai_projects": 0,
             "github_username": None,
+            "github_status": status,
         }
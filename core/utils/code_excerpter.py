@@ -0,0 +1,231 @@
+"""
+Code excerpting for LLM evidence.
+Instead of the first N characters of a file (usually license headers and imports),
+pick the densest function/class bodies that fit a token budget.
+
+  - Python: parsed with `ast`; units are top-level functions/classes (methods when a
+    class alone would blow the budget) and runs of module-level statements (script and
+    config code, notebook cells), split at cell markers and kept under a third of the budget.
+  - JS/TS: function/class/arrow declarations located by regex and closed by brace matching.
+  - Anything else (or unparsable code): leading comment/license block skipped, then head.
+
+Minified or generated files are detected by markers, line length and character entropy
+so they can be dropped before they reach the prompt.
+"""
+import ast
+import math
+import re
+from collections import Counter
+from typing import List, Tuple
+
+CHARS_PER_TOKEN = 4
+
+GENERATED_MARKERS = ("@generated", "do not edit", "auto-generated", "autogenerated", "generated by", "code generated")
+GENERATED_PATH_RE = re.compile(r"(\.min\.(js|css)$|_pb2(_grpc)?\.py$|\.pb\.go$|\.g\.dart$|bundle\.js$|\.chunk\.js$)")
+JS_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+JS_UNIT_RE = re.compile(
+    r"^[ \t]*(?:export\s+)?(?:default\s+)?(?:"
+    r"(?:async\s+)?function\b[^\n(]*\(|"
+    r"(?:abstract\s+)?class\s+\w+|"
+    r"(?:const|let|var)\s+\w+\s*(?::[^=\n]+)?=\s*(?:async\s*)?(?:\([^)\n]*\)|\w+)\s*(?::[^=\n]+)?=>"
+    r")",
+    re.MULTILINE,
+)
+JS_PARAMS_END_RE = re.compile(r"\s*(?::[^{;\n]+)?\{")
+JS_CLASS_HEAD_RE = re.compile(r"[^{;]*\{")
+CODE_TOKEN_RE = re.compile(r"\w+|[^\s\w]")
+NOTEBOOK_CELL_MARKER = "# %%"
+LEADING_COMMENT_RE = re.compile(r"\A(?:\s*(?:#[^\n]*|//[^\n]*|/\*.*?\*/|\"\"\".*?\"\"\"|'''.*?'''))+\s*", re.DOTALL)
+
+# (start_line, end_line, density) with 1-based inclusive line numbers
+Unit = Tuple[int, int, float]
+
+
+def _entropy(text: str) -> float:
+    if not text:
+        return 0.0
+    counts = Counter(text)
+    total = len(text)
+    return -sum(c / total * math.log2(c / total) for c in counts.values())
+
+
+def is_generated_or_minified(path: str, text: str) -> bool:
+    """True for minified bundles, generated code and embedded blobs not worth prompting with."""
+    if GENERATED_PATH_RE.search(path.lower()):
+        return True
+    head = text[:1500].lower()
+    if any(marker in head for marker in GENERATED_MARKERS):
+        return True
+
+    lines = [l for l in text.splitlines() if l.strip()]
+    if not lines:
+        return False
+    avg_len = sum(len(l) for l in lines) / len(lines)
+    longest = max(len(l) for l in lines)
+    if avg_len > 250 or (longest > 2000 and len(lines) < 20):
+        return True
+    # Long lines of near-random characters: base64 blobs, packed data
+    return avg_len > 120 and _entropy(text[:20000]) > 5.2
+
+
+def _token_density(lines: List[str]) -> float:
+    code_lines = [l for l in lines if l.strip() and not l.strip().startswith(("#", "//", "*", "/*"))]
+    if not code_lines:
+        return 0.0
+    tokens = sum(len(CODE_TOKEN_RE.findall(l)) for l in code_lines)
+    return tokens / len(lines)
+
+
+def _python_units(text: str, budget_chars: int, lines: List[str]) -> List[Unit]:
+    tree = ast.parse(text)
+    units: List[Unit] = []
+
+    def add(node):
+        start = min([d.lineno for d in getattr(node, "decorator_list", [])] + [node.lineno])
+        end = node.end_lineno or node.lineno
+        span = end - start + 1
+        density = sum(1 for _ in ast.walk(node)) / span
+        units.append((start, end, density))
+
+    # Module-level statements between definitions: one unit per run, broken at notebook
+    # cell markers and whenever the run would outgrow a third of the budget
+    cell_lines = [i for i, l in enumerate(lines, 1) if l.startswith(NOTEBOOK_CELL_MARKER)]
+    run_chars = budget_chars // 3
+    run: List[ast.stmt] = []
+
+    def flush():
+        if run:
+            start, end = run[0].lineno, run[-1].end_lineno or run[-1].lineno
+            nodes = sum(1 for stmt in run for _ in ast.walk(stmt))
+            units.append((start, end, nodes / (end - start + 1)))
+            run.clear()
+
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)) or (
+            isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+        ):
+            flush()  # imports and docstrings are not evidence
+            continue
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if run:
+                prev_end = run[-1].end_lineno or run[-1].lineno
+                end = node.end_lineno or node.lineno
+                new_cell = any(prev_end < line < node.lineno for line in cell_lines)
+                if new_cell or sum(len(l) + 1 for l in lines[run[0].lineno - 1:end]) > run_chars:
+                    flush()
+            run.append(node)
+            continue
+
+        flush()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            add(node)
+        elif isinstance(node, ast.ClassDef):
+            class_chars = sum(len(l) + 1 for l in lines[node.lineno - 1:node.end_lineno])
+            methods = [n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            if class_chars > budget_chars and methods:
+                for m in methods:
+                    add(m)
+            else:
+                add(node)
+    flush()
+    return units
+
+
+def _js_body_open(text: str, match: re.Match) -> int:
+    """Index of the `{` opening the matched unit's body, or -1 (e.g. expression-bodied arrows)."""
+    head, i = match.group(0), match.end()
+    if head.endswith("=>"):
+        while i < len(text) and text[i].isspace():
+            i += 1
+        return i if i < len(text) and text[i] == "{" else -1
+    if head.endswith("("):
+        # Close the parameter list; the body brace follows it (after an optional return type)
+        depth = 1
+        while i < len(text) and depth:
+            depth += {"(": 1, ")": -1}.get(text[i], 0)
+            i += 1
+        brace = JS_PARAMS_END_RE.match(text, i)
+    else:
+        brace = JS_CLASS_HEAD_RE.match(text, i)
+    return brace.end() - 1 if brace else -1
+
+
+def _js_units(text: str, lines: List[str]) -> List[Unit]:
+    units: List[Unit] = []
+    for match in JS_UNIT_RE.finditer(text):
+        open_idx = _js_body_open(text, match)
+        if open_idx == -1:
+            continue
+        depth, i, quote = 0, open_idx, None
+        while i < len(text):
+            ch = text[i]
+            if quote:
+                if ch == "\\":
+                    i += 1
+                elif ch == quote:
+                    quote = None
+            elif ch in "\"'`":
+                quote = ch
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        start = text.count("\n", 0, match.start()) + 1
+        end = text.count("\n", 0, i) + 1
+        if units and start <= units[-1][1]:
+            continue  # nested inside the previous unit
+        units.append((start, end, _token_density(lines[start - 1:end])))
+    return units
+
+
+def _head_excerpt(text: str, budget_chars: int) -> str:
+    """Fallback: skip a leading license/comment block, then take the head."""
+    body = LEADING_COMMENT_RE.sub("", text, count=1) or text
+    return body[:budget_chars]
+
+
+def excerpt_code(path: str, text: str, budget_tokens: int) -> str:
+    """Return the most informative part of `text` that fits `budget_tokens`."""
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget_chars:
+        return text
+
+    lines = text.splitlines()
+    lower = path.lower()
+    try:
+        if lower.endswith((".py", ".ipynb")):  # notebooks arrive normalized to percent-format Python
+            units = _python_units(text, budget_chars, lines)
+        elif lower.endswith(JS_EXTENSIONS):
+            units = _js_units(text, lines)
+        else:
+            units = []
+    except (SyntaxError, ValueError, RecursionError):
+        units = []
+
+    if not units:
+        return _head_excerpt(text, budget_chars)
+
+    # Densest first, weighted by size so one-line helpers don't crowd out real logic
+    ranked = sorted(units, key=lambda u: u[2] * math.sqrt(u[1] - u[0] + 1), reverse=True)
+    chosen, used = [], 0
+    for start, end, _ in ranked:
+        size = sum(len(l) + 1 for l in lines[start - 1:end])
+        if used + size > budget_chars:
+            continue
+        chosen.append((start, end))
+        used += size
+
+    if not chosen:
+        # Every unit is bigger than the budget: take the densest one's head
+        start, end, _ = ranked[0]
+        return "\n".join(lines[start - 1:end])[:budget_chars]
+
+    comment = "#" if lower.endswith((".py", ".ipynb")) else "//"
+    parts = []
+    for start, end in sorted(chosen):
+        parts.append(f"{comment} ... lines {start}-{end}")
+        parts.append("\n".join(lines[start - 1:end]))
+    return "\n".join(parts)
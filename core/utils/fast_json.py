@@ -0,0 +1,31 @@
+"""
+JSON decoding for hot read paths (dashboard results, stored evidence columns).
+Uses orjson when installed — several times faster on the large *_json text columns —
+and falls back to the standard library otherwise.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    def loads(value) -> Any:
+        return orjson.loads(value)
+
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError, TypeError)
+except ImportError:  # pragma: no cover - optional dependency
+    def loads(value) -> Any:
+        return json.loads(value)
+
+    JSON_DECODE_ERRORS = (ValueError, TypeError)
+
+
+def safe_json_load(val, default=None):
+    """Decode a stored JSON text column; empty containers, blanks and bad JSON yield `default`."""
+    if not val or val == '{}' or val == '[]':
+        return default
+    try:
+        data = loads(val)
+        return data if data else default
+    except JSON_DECODE_ERRORS:
+        return default
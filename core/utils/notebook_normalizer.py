@@ -0,0 +1,87 @@
+"""
+Jupyter notebook normalization.
+Turns raw .ipynb JSON into compact source text: code and markdown cells only,
+outputs (base64 images, dataframes, tracebacks), attachments and metadata dropped.
+
+Output uses the jupytext "percent" layout so cell boundaries survive, markdown is
+emitted as comments and IPython magics / shell escapes are commented out, which keeps
+the result parseable as Python for the code excerpter.
+"""
+import json
+import re
+from typing import List
+
+# Notebooks above this are almost always dominated by outputs; not worth downloading
+MAX_NOTEBOOK_BYTES = 1_000_000
+
+# Truncated downloads are not valid JSON; fall back to pulling the "source" arrays out directly
+SOURCE_ARRAY_RE = re.compile(r'"(?:source|input)"\s*:\s*(\[(?:\s*"(?:[^"\\]|\\.)*"\s*,?)*\s*\])')
+
+
+def is_notebook(path: str) -> bool:
+    return path.lower().endswith(".ipynb")
+
+
+def _join_source(source) -> str:
+    if isinstance(source, list):
+        return "".join(source)
+    return source or ""
+
+
+def _comment_magics(code: str) -> str:
+    lines = []
+    for line in code.splitlines():
+        stripped = line.lstrip()
+        if stripped.startswith(("%", "!")):
+            line = "# " + line
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _render_cell(cell_type: str, source: str) -> str:
+    source = source.strip()
+    if not source:
+        return ""
+    if cell_type == "markdown":
+        body = "\n".join(f"# {l}".rstrip() for l in source.splitlines())
+        return f"# %% [markdown]\n{body}"
+    return f"# %%\n{_comment_magics(source)}"
+
+
+def _fallback_sources(raw: str) -> List[str]:
+    sources = []
+    for match in SOURCE_ARRAY_RE.finditer(raw):
+        try:
+            sources.append(_join_source(json.loads(match.group(1))))
+        except ValueError:
+            continue
+    return sources
+
+
+def normalize_notebook(raw: str) -> str:
+    """Return the notebook's code/markdown cells as compact text ("" if nothing usable)."""
+    try:
+        nb = json.loads(raw)
+    except ValueError:
+        # Truncated or malformed: recover whatever complete cell sources are present
+        blocks = [_render_cell("code", s) for s in _fallback_sources(raw)]
+        return "\n\n".join(b for b in blocks if b)
+
+    if not isinstance(nb, dict):
+        return ""
+    cells = nb.get("cells")
+    if cells is None:
+        # nbformat 3 keeps cells under worksheets and code under "input"
+        cells = [c for ws in nb.get("worksheets", []) for c in ws.get("cells", [])]
+
+    blocks = []
+    for cell in cells:
+        if not isinstance(cell, dict):
+            continue
+        cell_type = cell.get("cell_type", "code")
+        if cell_type not in ("code", "markdown"):
+            continue
+        block = _render_cell(cell_type, _join_source(cell.get("source", cell.get("input"))))
+        if block:
+            blocks.append(block)
+    return "\n\n".join(blocks)
@@ -10,6 +10,68 @@ export const useScreening = () => {
   return context;
 };
 
+// Applies one NDJSON progress frame to the results state. Snapshots replace the ranking and
+// merge evaluations; deltas carry only new/changed records plus rank moves (see stream_delta.py).
+// Legacy partial_results / results frames (?format=full) are merged the same way.
+const applyStreamFrame = (prev, data) => {
+  const full = data.partial_results || data.results || data.snapshot;
+  if (full) {
+    return {
+      ranking: full.ranking || prev?.ranking || [],
+      evaluations: { ...(prev?.evaluations || {}), ...(full.evaluations || {}) },
+    };
+  }
+  if (!data.delta) return prev;
+
+  const { evaluations, ranking, moves } = data.delta;
+  const entries = new Map((prev?.ranking || []).map(entry => [entry.candidate_id, entry]));
+  ranking.forEach(entry => entries.set(entry.candidate_id, entry));
+  moves.forEach(([candidateId, rank]) => {
+    const entry = entries.get(candidateId);
+    if (entry) entries.set(candidateId, { ...entry, rank });
+  });
+  return {
+    ranking: [...entries.values()].sort((a, b) => a.rank - b.rank),
+    evaluations: { ...(prev?.evaluations || {}), ...evaluations },
+  };
+};
+
+const RUN_TERMINAL_EVENTS = ['completed', 'failed', 'cancelled'];
+
+// Follows a background run's NDJSON event log until it finishes. A dropped connection is
+// resumed from the next unseen seq. Resolves with the terminal event.
+const followRun = async (apiBase, runId, onEvent = () => {}, maxReconnects = 5) => {
+  let offset = 0;
+  for (let attempt = 0; attempt <= maxReconnects; attempt++) {
+    try {
+      const response = await fetch(`${apiBase}/runs/${runId}/events?offset=${offset}`);
+      if (!response.ok) throw new Error(`Failed to follow run ${runId}`);
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          offset = event.seq + 1;
+          onEvent(event);
+          if (RUN_TERMINAL_EVENTS.includes(event.event)) return event;
+        }
+      }
+    } catch (err) {
+      console.warn(`Run ${runId} event stream interrupted, resuming at ${offset}:`, err);
+    }
+    await new Promise(resolve => setTimeout(resolve, 1000));
+  }
+  throw new Error(`Lost track of run ${runId}`);
+};
+
 export const ScreeningProvider = ({ children }) => {
   const [isScreening, setIsScreening] = useState(false);
   const [isRunningStage2, setIsRunningStage2] = useState(false);
@@ -68,6 +130,7 @@ export const ScreeningProvider = ({ children }) => {
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
       let buffer = '';
+      let streamResults = null;
 
       while (true) {
         const { done, value } = await reader.read();
@@ -90,18 +153,13 @@ export const ScreeningProvider = ({ children }) => {
               setCurrentStep(data.step);
             }
 
-            if (data.results) {
-              setResults(data.results);
-              if (data.results.ranking && data.results.ranking.length > 0) {
-                setSelectedCandidateId(prev => prev || data.results.ranking[0].candidate_id);
-              }
-            }
-
-            // Handle incremental batch updates (partial results)
-            if (data.partial_results) {
-              setResults(data.partial_results);
-              if (!selectedCandidateId && data.partial_results.ranking && data.partial_results.ranking.length > 0) {
-                setSelectedCandidateId(data.partial_results.ranking[0].candidate_id);
+            // Incremental batch updates (snapshot / delta frames) and the final frame
+            const next = applyStreamFrame(streamResults, data);
+            if (next !== streamResults) {
+              streamResults = next;
+              setResults(next);
+              if (next.ranking.length > 0) {
+                setSelectedCandidateId(prev => prev || next.ranking[0].candidate_id);
               }
             }
           } catch (e) {
@@ -198,6 +256,13 @@ export const ScreeningProvider = ({ children }) => {
 
       if (!response.ok) throw new Error('Force evaluation failed');
 
+      // Runs in the background: wait for the run to finish
+      const run = await response.json();
+      const outcome = await followRun(API_BASE, run.run_id);
+      if (outcome.event !== 'completed') {
+        throw new Error(outcome.data?.error || outcome.data?.reason || `Force evaluation ${outcome.event}`);
+      }
+
       // After agent runs, always fetch fresh full results so ranking updates correctly
       const freshRes = await fetch(`${API_BASE}/results`);
       if (!freshRes.ok) throw new Error('Failed to refresh results after evaluation');
@@ -276,18 +341,8 @@ export const ScreeningProvider = ({ children }) => {
             if (data.error) throw new Error(data.error);
             if (data.step !== undefined) setCurrentStep(data.step);
 
-            if (data.partial_results || data.results) {
-              const incoming = data.partial_results || data.results;
-              setResults(prev => {
-                if (!prev) return incoming;
-                // Merge: update evaluations, replace ranking
-                const mergedEvals = { ...(prev.evaluations || {}), ...(incoming.evaluations || {}) };
-                return {
-                  ranking: incoming.ranking || prev.ranking,
-                  evaluations: mergedEvals,
-                };
-              });
-            }
+            // Merge onto the Stage 1 results: the first snapshot replaces the ranking, deltas follow
+            setResults(prev => applyStreamFrame(prev, data));
           } catch (e) {
             console.error('Stage 2 stream parse error:', e);
           }
@@ -15,6 +15,7 @@ from langgraph.graph import StateGraph, START, END
 from config.logging_config import get_logger
 from core.llm_service import LLMService
 from core.github_verifier import GitHubVerifier
+from core.github_rate_governor import github_governor, RateLimitExhausted
 from core.stage1_flash_scorer import Stage1FlashScorer
 
 logger = get_logger(__name__)
@@ -47,6 +48,14 @@ class GraphState(TypedDict):
     # Control flags
     force_evaluation: bool
     target_candidate_id: Optional[str]
+    cancel_token: Optional[Any]  # core.cancellation.CancelToken of a background run
+
+
+def _check_cancelled(state: GraphState, kind: str):
+    """Per-candidate checkpoint: raises RunCancelled once the run's cancel token has fired."""
+    token = state.get("cancel_token")
+    if token is not None:
+        token.check(kind)
 
 
 # =============================================================================
@@ -109,6 +118,8 @@ def stage_1_extraction_node(state: GraphState):
             })
             continue
 
+        _check_cancelled(state, "llm")
+
         # Get the pre-extracted resume text
         resume_text = resume.get("raw_resume_text", "")
         if not resume_text:
@@ -220,8 +231,20 @@ def github_verification_node(state: GraphState):
             code_files_map[cand_id] = {"repos": []}
             continue
 
-        repos = github_verifier.fetch_repos(username)
-        raw, feat, code_data = github_verifier.analyze_repos(repos, username)
+        _check_cancelled(state, "github")
+        with github_governor.track(cand_id):
+            try:
+                repos = github_verifier.fetch_repos(username)
+                raw, feat, code_data = github_verifier.analyze_repos(repos, username)
+            except RateLimitExhausted as e:
+                # Deferred, not empty: Stage 3 skips the candidate and the Stage 1 score stands
+                logger.warning(f"[STAGE 2] {cand_id}: deferred — {e}")
+                raw = {"error": "rate_limited"}
+                feat = {"activity_score": 0, "ai_relevance_score": 0, "repo_count": 0, "github_status": "rate_limited"}
+                code_data = {"repos": []}
+        report = github_governor.candidate_report(cand_id)
+        if report["rate_limit_delay_s"]:
+            logger.info(f"[STAGE 2] {cand_id}: delayed {report['rate_limit_delay_s']}s by GitHub rate limits")
 
         raw_data_map[cand_id] = raw
         feature_map[cand_id] = feat
@@ -265,11 +288,16 @@ def unified_candidate_evaluation_node(state: GraphState):
         # Skip candidates that weren't scored in Stage 1
         if not rank_item.get("stage_1_scored", False):
             continue
+        if github_features.get(cand_id, {}).get("github_status") == "rate_limited":
+            logger.info(f"[STAGE 3] {cand_id}: GitHub deferred — keeping the Stage 1 score")
+            continue
 
         resume_obj = resume_lookup.get(cand_id)
         if not resume_obj:
             continue
 
+        _check_cancelled(state, "llm")
+
         # Build context from Stage 1 + Stage 2 data
         raw_text = resume_obj.get("raw_resume_text", "")
         resume_summary = f"Resume Content:\n{raw_text[:5000]}" if len(raw_text) > 5000 else f"Resume Content:\n{raw_text}"
@@ -336,6 +364,7 @@ def interview_readiness_node(state: GraphState):
         if evaluation.get("error") or evaluation.get("evaluation_blocked"):
             continue
 
+        _check_cancelled(state, "llm")
         logger.info(f"Running Readiness Evaluation for {cand_id}")
 
         # Build context strings from raw resume + GitHub
@@ -381,6 +410,7 @@ def skeptic_agent_node(state: GraphState):
     resume_lookup = {r["candidate_id"]: r for r in resumes_list}
 
     for cand_id, gatekeeper_output in interview_readiness.items():
+        _check_cancelled(state, "llm")
         logger.info(f"Running Adversarial Skeptic Audit for {cand_id}")
 
         # Build context strings